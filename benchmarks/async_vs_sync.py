@@ -0,0 +1,81 @@
+"""
+Compare sync and async Cosmos access paths under concurrent load.
+
+Runs offline against the in-process Cosmos stand-in with simulated network
+latency: the sync path calls the blocking client from the AnyIO threadpool
+(exactly what a sync `def` FastAPI route does), while the async path drives
+the real `src.api.main` app configured to use the stand-in.
+
+Usage:
+    python -m benchmarks.async_vs_sync --requests 500 --latency-ms 20
+"""
+
+import argparse
+import asyncio
+import os
+import time
+import httpx
+from fastapi import FastAPI
+
+from src.api.main import app as async_app
+from src.services.cosmos_async import create_async_db
+from src.services.cosmos_local import LocalCosmosDBClient
+
+SAMPLE_SESSION = {
+    "id": "p1:00000000-0000-4000-8000-000000000000",
+    "player_id": "p1",
+    "date": "2025-01-01",
+    "session_type": "Training",
+    "duration": 60,
+    "rpe": 5,
+    "batting_minutes": 30,
+    "bowling_overs": 4,
+    "fielding_time": 20,
+    "comment": None,
+}
+
+
+def build_sync_app(db: LocalCosmosDBClient) -> FastAPI:
+    """Mirror of the pre-async `/sessions` route: a sync def on the pool."""
+    app = FastAPI()
+
+    @app.get("/sessions")
+    def list_sessions():
+        return db.query_items("sessions", "SELECT * FROM c")
+
+    return app
+
+
+async def run_load(app: FastAPI, total: int) -> float:
+    """Fire `total` concurrent GET /sessions calls; return elapsed seconds."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+        start = time.perf_counter()
+        responses = await asyncio.gather(*(c.get("/sessions") for _ in range(total)))
+        elapsed = time.perf_counter() - start
+    assert all(r.status_code == 200 for r in responses)
+    return elapsed
+
+
+async def main(total: int, latency_ms: float) -> None:
+    sync_db = LocalCosmosDBClient(latency_ms=latency_ms)
+    sync_db.upsert_item("sessions", SAMPLE_SESSION)
+    sync_elapsed = await run_load(build_sync_app(sync_db), total)
+
+    # Select the stand-in through configuration, as for a local load test.
+    os.environ["CONFIGURATION__AZURECOSMOSDB__BACKEND"] = "local"
+    os.environ["CONFIGURATION__AZURECOSMOSDB__LOCALLATENCYMS"] = str(latency_ms)
+    await create_async_db().upsert_item("sessions", SAMPLE_SESSION)
+    async_elapsed = await run_load(async_app, total)
+
+    print(f"requests={total} simulated_latency={latency_ms}ms")
+    print(f"sync  : {sync_elapsed:.3f}s  {total / sync_elapsed:,.0f} req/s")
+    print(f"async : {async_elapsed:.3f}s  {total / async_elapsed:,.0f} req/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.latency_ms))
@@ -0,0 +1,72 @@
+"""
+Measure ingestion throughput: one POST per session vs POST /sessions/bulk.
+
+Runs the real API in-process on the local Cosmos stand-in, which simulates
+the round-trip latency and RU charge of each write (a single upsert or a
+whole transactional batch costs one round trip).
+
+Usage:
+    python -m benchmarks.bulk_ingest --rows 5000 --players 30 --latency-ms 10
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from typing import Any, List
+
+import httpx
+
+from src.api.main import app
+from src.services.cosmos_async import create_async_db
+
+
+def make_rows(rows: int, players: int) -> List[dict[str, Any]]:
+    return [
+        {
+            "player_id": f"player-{i % players}",
+            "date": f"2025-{1 + i % 12:02d}-{1 + i % 28:02d}",
+            "session_type": "Training",
+            "duration": 60,
+            "rpe": 1 + i % 10,
+            "batting_minutes": 30,
+            "bowling_overs": 4,
+            "fielding_time": 20,
+            "comment": None,
+        }
+        for i in range(rows)
+    ]
+
+
+async def main(rows: int, players: int, latency_ms: float) -> None:
+    payload = make_rows(rows, players)
+    os.environ["CONFIGURATION__AZURECOSMOSDB__BACKEND"] = "local"
+    os.environ["CONFIGURATION__AZURECOSMOSDB__LOCALLATENCYMS"] = str(latency_ms)
+    local = create_async_db().local
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://b") as c:
+        # Row by row, as an importer calling POST /sessions would.
+        start = time.perf_counter()
+        for row in payload:
+            (await c.post("/sessions", json=row)).raise_for_status()
+        single = time.perf_counter() - start
+        single_ru, local.total_request_charge = local.total_request_charge, 0.0
+
+        start = time.perf_counter()
+        response = await c.post("/sessions/bulk", json=payload, timeout=None)
+        bulk = time.perf_counter() - start
+        assert response.json()["succeeded"] == rows
+    bulk_ru = local.total_request_charge
+
+    print(f"rows={rows} players={players} simulated_latency={latency_ms}ms")
+    print(f"single : {single:.2f}s {rows / single:,.0f} rows/s RU={single_ru:,.0f}")
+    print(f"bulk   : {bulk:.2f}s {rows / bulk:,.0f} rows/s RU={bulk_ru:,.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--players", type=int, default=30)
+    parser.add_argument("--latency-ms", type=float, default=10.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.players, args.latency_ms))
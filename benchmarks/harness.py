@@ -0,0 +1,317 @@
+"""
+Scale benchmark: latency percentiles, throughput and memory per endpoint.
+
+Seeds the local Cosmos stand-in with a synthetic season data set (see
+`benchmarks.synthetic`), drives the real API in-process and times each
+scenario: every list/get/create route plus ACWR computation. Results are
+written as JSON; pass a previous run with `--compare` to fail on a p95
+regression, e.g. in CI.
+
+Usage:
+    python -m benchmarks.harness --teams 50 --players 30 --seasons 3 \\
+        --requests 500 --concurrency 16 --output bench.json \\
+        --compare baseline.json --tolerance 0.25
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+import pandas as pd
+
+from benchmarks.synthetic import Scale, seed
+from src.ml.features import LoadTracker, weekly_acwr
+
+# Requests traced with tracemalloc per scenario; tracing slows every
+# allocation, so memory is measured in a separate, shorter pass.
+MEMORY_SAMPLES = 20
+
+Scenario = Callable[[random.Random], Awaitable[None]]
+
+
+@dataclass
+class Result:
+    requests: int
+    errors: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    mean_ms: float
+    throughput_rps: float
+    peak_kib: float
+
+
+def acwr_reference(sessions: List[dict]) -> Dict[str, float]:
+    """
+    Daily acute:chronic workload ratio (7-day vs 28-day mean of
+    rpe x duration), computed in plain Python over each window.
+    """
+    loads: Dict[date, int] = defaultdict(int)
+    for session in sessions:
+        loads[date.fromisoformat(session["date"])] += (
+            session["rpe"] * session["duration"]
+        )
+    if not loads:
+        return {}
+    ratios: Dict[str, float] = {}
+    day, last = min(loads), max(loads)
+    while day <= last:
+        acute = sum(loads.get(day - timedelta(days=i), 0) for i in range(7)) / 7
+        chronic = sum(loads.get(day - timedelta(days=i), 0) for i in range(28)) / 28
+        ratios[day.isoformat()] = acute / chronic if chronic else 0.0
+        day += timedelta(days=1)
+    return ratios
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Result:
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    return Result(
+        requests=len(latencies),
+        errors=errors,
+        p50_ms=round(cuts[49] * 1000, 3),
+        p95_ms=round(cuts[94] * 1000, 3),
+        p99_ms=round(cuts[98] * 1000, 3),
+        mean_ms=round(statistics.fmean(latencies) * 1000, 3),
+        throughput_rps=round(len(latencies) / elapsed, 1),
+        peak_kib=0.0,
+    )
+
+
+async def measure(scenario: Scenario, requests: int, concurrency: int) -> Result:
+    """Run `scenario` `requests` times with `concurrency` workers."""
+    latencies: List[float] = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async def worker(worker_id: int) -> None:
+        nonlocal errors
+        rng = random.Random(worker_id)
+        for _ in remaining:
+            start = time.perf_counter()
+            try:
+                await scenario(rng)
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    result = summarize(latencies, errors, time.perf_counter() - start)
+
+    tracemalloc.start()
+    rng = random.Random(-1)
+    for _ in range(MEMORY_SAMPLES):
+        tracemalloc.reset_peak()
+        try:
+            await scenario(rng)
+        except Exception:
+            pass
+    result.peak_kib = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+    tracemalloc.stop()
+    return result
+
+
+def build_scenarios(
+    client: httpx.AsyncClient, local: Any, sample_players: int = 50
+) -> Dict[str, Scenario]:
+    """Map scenario names to callables, using ids sampled from the store."""
+    player_ids = [p["id"] for p in local.query_items("players", "SELECT c.id FROM c")]
+    players = player_ids[:sample_players]
+    sessions = {
+        player_id: local.query_items(
+            "sessions", "SELECT * FROM c", partition_key=player_id
+        )
+        for player_id in players
+    }
+    session_ids = [s["id"] for rows in sessions.values() for s in rows]
+    team_ids = [t["id"] for t in local.query_items("teams", "SELECT c.id FROM c")]
+
+    def get(path: Callable[[random.Random], str]) -> Scenario:
+        async def run(rng: random.Random) -> None:
+            (await client.get(path(rng))).raise_for_status()
+
+        return run
+
+    def player_path(resource: str, query: str = "") -> Scenario:
+        return get(lambda rng: f"/players/{rng.choice(players)}/{resource}{query}")
+
+    async def create_session(rng: random.Random) -> None:
+        row = {
+            "player_id": rng.choice(players),
+            "date": date.today().isoformat(),
+            "session_type": "Training",
+            "duration": 60,
+            "rpe": rng.randint(1, 10),
+            "batting_minutes": 30,
+            "bowling_overs": 4,
+            "fielding_time": 20,
+            "comment": None,
+        }
+        (await client.post("/sessions", json=row)).raise_for_status()
+
+    async def acwr(rng: random.Random) -> None:
+        acwr_reference(sessions[rng.choice(players)])
+
+    squad = pd.DataFrame([s for rows in sessions.values() for s in rows])
+
+    async def acwr_squad(rng: random.Random) -> None:
+        weekly_acwr(squad)
+
+    tracker = LoadTracker()
+
+    async def acwr_incremental(rng: random.Random) -> None:
+        tracker.observe(rng.choice(sessions[rng.choice(players)]))
+
+    return {
+        "GET /sessions?limit=100": get(lambda rng: "/sessions?limit=100"),
+        "GET /metrics?limit=100": get(lambda rng: "/metrics?limit=100"),
+        "GET /cyclelogs?limit=100": get(lambda rng: "/cyclelogs?limit=100"),
+        "GET /injuries?limit=100": get(lambda rng: "/injuries?limit=100"),
+        "GET /players?limit=100": get(lambda rng: "/players?limit=100"),
+        "GET /teams": get(lambda rng: "/teams"),
+        "GET /sessions/{id}": get(lambda rng: f"/sessions/{rng.choice(session_ids)}"),
+        "GET /players/{id}": get(lambda rng: f"/players/{rng.choice(player_ids)}"),
+        "GET /players/{id}/sessions": player_path("sessions"),
+        "GET /players/{id}/sessions?from&to": player_path(
+            "sessions", f"?from={date(2023, 5, 1)}&to={date(2023, 6, 30)}"
+        ),
+        "GET /players/{id}/sessions?fields": player_path(
+            "sessions", "?fields=date,duration,rpe"
+        ),
+        "GET /players/{id}/cyclelogs": player_path("cyclelogs"),
+        "GET /players/{id}/metrics": player_path("metrics"),
+        "GET /players/{id}/injuries": player_path("injuries"),
+        "GET /players/{id}/dashboard": player_path("dashboard"),
+        "GET /teams/{id}/summary": get(
+            lambda rng: f"/teams/{rng.choice(team_ids)}/summary"
+        ),
+        "POST /sessions": create_session,
+        "ACWR (per player)": acwr,
+        "ACWR (sampled squad, vectorized)": acwr_squad,
+        "ACWR (incremental, per session)": acwr_incremental,
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(
+    current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float
+) -> List[str]:
+    """Return the scenarios whose p95 regressed by more than `tolerance`."""
+    regressions = []
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if not before or not before["p95_ms"]:
+            continue
+        change = result["p95_ms"] / before["p95_ms"] - 1
+        print(
+            f"{name:<36}p95 {before['p95_ms']:>9.2f} -> {result['p95_ms']:>9.2f}ms "
+            f"({change:+.0%})"
+        )
+        if change > tolerance:
+            regressions.append(name)
+    return regressions
+
+
+async def main(
+    scale: Scale,
+    requests: int,
+    concurrency: int,
+    latency_ms: float,
+    only: Optional[str],
+) -> Dict[str, Any]:
+    os.environ["CONFIGURATION__AZURECOSMOSDB__BACKEND"] = "local"
+    os.environ["CONFIGURATION__AZURECOSMOSDB__LOCALLATENCYMS"] = str(latency_ms)
+    os.environ.pop("CONFIGURATION__AZURECOSMOSDB__LOCALPATH", None)
+    from src.api.main import app
+    from src.services.cosmos_async import create_async_db
+
+    local = create_async_db().local
+    start = time.perf_counter()
+    counts = seed(local, scale)
+    print(
+        f"seeded {sum(counts.values()):,} documents in "
+        f"{time.perf_counter() - start:.1f}s: {counts}"
+    )
+
+    results: Dict[str, Result] = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://b") as client:
+        for name, scenario in build_scenarios(client, local).items():
+            if only and only not in name:
+                continue
+            results[name] = result = await measure(scenario, requests, concurrency)
+            print(
+                f"{name:<36}p50 {result.p50_ms:>8.2f}  p95 {result.p95_ms:>8.2f}  "
+                f"p99 {result.p99_ms:>8.2f}ms  {result.throughput_rps:>8,.0f}/s  "
+                f"peak {result.peak_kib:>8,.0f}KiB  errors {result.errors}"
+            )
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "revision": git_revision(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "scale": asdict(scale),
+            "documents": counts,
+            "requests": requests,
+            "concurrency": concurrency,
+            "simulated_latency_ms": latency_ms,
+        },
+        "results": {name: asdict(result) for name, result in results.items()},
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--teams", type=int, default=5)
+    parser.add_argument("--players", type=int, default=30)
+    parser.add_argument("--seasons", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--only", help="run scenarios whose name contains this")
+    parser.add_argument("--output", default="bench.json")
+    parser.add_argument("--compare", help="previous results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    scale = Scale(args.teams, args.players, args.seasons, seed=args.seed)
+    report = asyncio.run(
+        main(scale, args.requests, args.concurrency, args.latency_ms, args.only)
+    )
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"wrote {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        if regressions:
+            print(f"p95 regressed more than {args.tolerance:.0%}: {regressions}")
+            sys.exit(1)
@@ -0,0 +1,144 @@
+"""
+Inference throughput benchmark: micro-batched model calls against one
+model call per request.
+
+Drives `MicroBatcher` directly with concurrent single-player requests for
+each `--max-batch-sizes` value (1 means no batching) and reports latency
+percentiles, throughput and the mean rows per model call. The model is
+the starter MLP (64-32-1) built with Keras when TensorFlow is installed;
+`--model numpy` runs the same network in NumPy, plus a fixed per-call
+overhead standing in for framework dispatch.
+
+Usage:
+    python -m benchmarks.inference --requests 2000 --concurrency 64 \\
+        --max-batch-sizes 1,16,64 --max-wait-ms 2 --output inference.json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from dataclasses import asdict
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+import numpy as np
+
+from benchmarks.harness import git_revision, measure
+from src.ml.features import RISK_FEATURES
+from src.ml.inference import LoadedModel, MicroBatcher, Predict
+
+
+def keras_model() -> Predict:
+    import tensorflow as tf
+
+    model = tf.keras.Sequential(
+        [
+            tf.keras.layers.Input((len(RISK_FEATURES),)),
+            tf.keras.layers.Dense(64, activation="relu"),
+            tf.keras.layers.Dense(32, activation="relu"),
+            tf.keras.layers.Dense(1, activation="sigmoid"),
+        ]
+    )
+    return lambda features: np.asarray(model(features, training=False)).reshape(-1)
+
+
+def numpy_model(call_overhead_ms: float) -> Predict:
+    rng = np.random.default_rng(0)
+    layers = [
+        (rng.normal(size=(n_in, n_out)).astype(np.float32), np.zeros(n_out, np.float32))
+        for n_in, n_out in ((len(RISK_FEATURES), 64), (64, 32), (32, 1))
+    ]
+
+    def predict(features: np.ndarray) -> np.ndarray:
+        time.sleep(call_overhead_ms / 1000)
+        x = features
+        for weights, bias in layers[:-1]:
+            x = np.maximum(x @ weights + bias, 0)
+        weights, bias = layers[-1]
+        return (1 / (1 + np.exp(-(x @ weights + bias)))).reshape(-1)
+
+    return predict
+
+
+async def run(
+    predict: Predict,
+    max_batch_size: int,
+    max_wait_ms: float,
+    requests: int,
+    concurrency: int,
+) -> Dict[str, Any]:
+    model = LoadedModel("bench", "bench", "0", "memory", predict)
+    batcher = MicroBatcher(max_batch_size, max_wait_ms / 1000)
+    task = asyncio.create_task(batcher.run(lambda: model))
+
+    async def scenario(rng: random.Random) -> None:
+        row = [rng.uniform(0, 3000), rng.uniform(0, 2500), rng.uniform(0, 2)]
+        await batcher.submit(np.array([row], dtype=np.float32))
+
+    result = await measure(scenario, requests, concurrency)
+    task.cancel()
+    return {
+        **asdict(result),
+        "model_calls": batcher.batches,
+        "mean_batch_rows": round(batcher.rows / max(batcher.batches, 1), 1),
+    }
+
+
+async def main(args: argparse.Namespace) -> Dict[str, Any]:
+    name = args.model
+    if name == "auto":
+        try:
+            import tensorflow  # noqa: F401
+
+            name = "keras"
+        except ImportError:
+            name = "numpy"
+    predict = keras_model() if name == "keras" else numpy_model(args.call_overhead_ms)
+    results: Dict[str, Any] = {}
+    for size in args.max_batch_sizes:
+        label = f"max_batch_size={size}"
+        results[label] = result = await run(
+            predict, size, args.max_wait_ms, args.requests, args.concurrency
+        )
+        print(
+            f"{label:<20}p50 {result['p50_ms']:>8.2f}  p95 {result['p95_ms']:>8.2f}  "
+            f"p99 {result['p99_ms']:>8.2f}ms  {result['throughput_rps']:>9,.0f}/s  "
+            f"rows/call {result['mean_batch_rows']:>6.1f}"
+        )
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "revision": git_revision(),
+            "python": sys.version.split()[0],
+            "model": name,
+            "call_overhead_ms": args.call_overhead_ms if name == "numpy" else None,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "max_wait_ms": args.max_wait_ms,
+        },
+        "results": results,
+    }
+
+
+def batch_sizes(value: str) -> List[int]:
+    return [int(size) for size in value.split(",")]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--model", choices=["auto", "keras", "numpy"], default="auto")
+    parser.add_argument("--call-overhead-ms", type=float, default=1.0)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--max-batch-sizes", type=batch_sizes, default=[1, 16, 64])
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    parser.add_argument("--output", default="inference.json")
+    args = parser.parse_args()
+
+    report = asyncio.run(main(args))
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"wrote {args.output}")
@@ -0,0 +1,99 @@
+"""
+Compare RU charge and latency of id lookups: cross-partition query vs point read.
+
+Seeds `--docs` sessions spread over `--players` partitions in the configured
+backend (Azure, the emulator, or the local stand-in with simulated RUs when
+CONFIGURATION__AZURECOSMOSDB__BACKEND=local), looks each one up both ways
+and removes the seeded documents afterwards.
+
+Usage:
+    CONFIGURATION__AZURECOSMOSDB__BACKEND=local \
+        python -m benchmarks.point_reads --docs 200 --players 20
+"""
+
+import argparse
+import statistics
+import time
+from typing import Callable, List, Tuple, Union
+
+from src.services.cosmos import CosmosDBClient, get_db
+from src.services.cosmos_local import LocalCosmosDBClient
+from src.services.routing import make_id, partition_for_id
+
+CONTAINER = "sessions"
+
+
+def last_request_charge(db: Union[CosmosDBClient, LocalCosmosDBClient]) -> float:
+    """Read the RU charge of the last response, as in cosmos_example.py."""
+    if isinstance(db, LocalCosmosDBClient):
+        return db.last_request_charge
+    container = db.get_container(CONTAINER)
+    headers = container.client_connection.last_response_headers
+    return float(headers.get("x-ms-request-charge", 0))
+
+
+def measure(
+    db: Union[CosmosDBClient, LocalCosmosDBClient],
+    ids: List[str],
+    lookup: Callable[[str], object],
+) -> Tuple[List[float], List[float]]:
+    """Run `lookup` for every id, collecting latency (ms) and RU charge."""
+    latencies, charges = [], []
+    for item_id in ids:
+        start = time.perf_counter()
+        lookup(item_id)
+        latencies.append((time.perf_counter() - start) * 1000)
+        charges.append(last_request_charge(db))
+    return latencies, charges
+
+
+def report(label: str, latencies: List[float], charges: List[float]) -> None:
+    p95 = statistics.quantiles(latencies, n=20)[-1]
+    print(
+        f"{label:<12} mean={statistics.mean(latencies):6.2f}ms "
+        f"p95={p95:6.2f}ms  RU/lookup={statistics.mean(charges):5.2f}"
+    )
+
+
+def main(docs: int, players: int) -> None:
+    db = get_db()
+    ids = []
+    for i in range(docs):
+        player_id = f"bench-player-{i % players}"
+        item_id = make_id(CONTAINER, player_id)
+        db.upsert_item(
+            CONTAINER,
+            {
+                "id": item_id,
+                "player_id": player_id,
+                "date": "2025-01-01",
+                "session_type": "Training",
+                "duration": 60,
+                "rpe": 5,
+                "batting_minutes": 0,
+                "bowling_overs": 0,
+                "fielding_time": 0,
+                "comment": None,
+            },
+        )
+        ids.append(item_id)
+
+    def by_query(item_id: str) -> object:
+        query = "SELECT * FROM c WHERE c.id = @id"
+        return db.query_items(CONTAINER, query, [{"name": "@id", "value": item_id}])
+
+    try:
+        report("query", *measure(db, ids, by_query))
+        report("point read", *measure(db, ids, lambda i: db.get_item(CONTAINER, i)))
+    finally:
+        for item_id in ids:
+            db.delete_item(CONTAINER, item_id, partition_for_id(CONTAINER, item_id))
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--docs", type=int, default=200)
+    parser.add_argument("--players", type=int, default=20)
+    args = parser.parse_args()
+    main(args.docs, args.players)
@@ -0,0 +1,93 @@
+"""
+Micro-benchmark per-document encode/decode cost for Session and CycleLog.
+
+Encode (write path):
+  legacy : model_dump() + deepcopy + recursive date walk + json.dumps
+  current: model_dump(mode="json") + orjson.dumps
+Decode (stored JSON bytes -> document):
+  legacy : json.loads + model_validate
+  current: orjson.loads
+Respond (stored document -> list response row):
+  legacy : model_validate(doc) + model_dump_json() per row (response_model)
+  current: strip Cosmos system fields + orjson.dumps
+
+Usage:
+    python -m benchmarks.serialization --number 20000
+"""
+
+import argparse
+import json
+import timeit
+from copy import deepcopy
+from datetime import date, datetime
+from typing import Any, Callable, Type
+
+from pydantic import BaseModel
+
+from src.models.models import CycleLog, Session
+from src.services.serialization import dumps, loads, strip_system_fields, to_document
+
+SESSION = Session(
+    id="player-1:00000000-0000-4000-8000-000000000000",
+    player_id="player-1",
+    date=date(2025, 3, 1),
+    session_type="Training",
+    duration=90,
+    rpe=6,
+    batting_minutes=40,
+    bowling_overs=6,
+    fielding_time=30,
+    comment="Nets then fielding drills",
+)
+CYCLELOG = CycleLog(
+    id="player-1:00000000-0000-4000-8000-000000000001",
+    player_id="player-1",
+    period_start=date(2025, 3, 1),
+    symptoms=["cramps", "fatigue"],
+    wellness=6,
+    sleep=7,
+    mood=6,
+    soreness=4,
+    comment=None,
+)
+SYSTEM = {"_rid": "abc==", "_self": "dbs/x/", "_etag": '"0"', "_ts": 1740787200}
+
+
+def _legacy_walk(obj: Any) -> Any:
+    """The recursive conversion upsert_item used to run on every write."""
+    if isinstance(obj, dict):
+        return {k: _legacy_walk(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_legacy_walk(v) for v in obj]
+    if isinstance(obj, (date, datetime)):
+        return obj.isoformat()
+    return obj
+
+
+def per_doc_us(fn: Callable[[], Any], number: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=3)) / number * 1e6
+
+
+def run(name: str, model: Type[BaseModel], instance: BaseModel, number: int):
+    stored = {**instance.model_dump(mode="json"), **SYSTEM}
+    raw = json.dumps(stored).encode()
+    results = {
+        "encode legacy": lambda: json.dumps(
+            _legacy_walk(deepcopy(instance.model_dump()))
+        ),
+        "encode current": lambda: dumps(to_document(instance)),
+        "decode legacy": lambda: model.model_validate(json.loads(raw)),
+        "decode current": lambda: loads(raw),
+        "respond legacy": lambda: model.model_validate(stored).model_dump_json(),
+        "respond current": lambda: dumps(strip_system_fields(stored)),
+    }
+    for label, fn in results.items():
+        print(f"{name:<9}{label:<16}{per_doc_us(fn, number):8.2f} us/doc")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+    run("Session", Session, SESSION, args.number)
+    run("CycleLog", CycleLog, CYCLELOG, args.number)
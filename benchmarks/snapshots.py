@@ -0,0 +1,96 @@
+"""
+Columnar snapshot benchmark: reading every session into a DataFrame from
+Cosmos, from NDJSON and from the Arrow snapshot store.
+
+Seeds the in-process Cosmos stand-in with a synthetic data set, writes
+the same data as NDJSON and exports it with `SnapshotExporter`, then
+times (best of `--repeat`):
+  cosmos : cross-partition query, pages of JSON -> DataFrame.from_records
+  ndjson : parse each line -> DataFrame.from_records
+  arrow  : memory-mapped Arrow files -> one table -> to_pandas
+  arrow (columns): the same, only the load columns the ACWR engine uses
+It also times a full export and an incremental one after a single edit.
+
+Usage:
+    python -m benchmarks.snapshots --teams 5 --players 30 --seasons 3
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Any, Callable
+
+import pandas as pd
+
+from benchmarks.synthetic import Scale, seed, write_ndjson
+from src.services.cosmos_local import LocalCosmosDBClient
+from src.services.serialization import loads
+from src.services.snapshots import SnapshotExporter, SnapshotStore
+
+LOAD_COLUMNS = ["player_id", "date", "rpe", "duration"]
+
+
+def best_seconds(fn: Callable[[], Any], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def from_ndjson(path: str) -> pd.DataFrame:
+    with open(path, "rb") as f:
+        return pd.DataFrame.from_records(loads(line) for line in f)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--teams", type=int, default=5)
+    parser.add_argument("--players", type=int, default=30)
+    parser.add_argument("--seasons", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    scale = Scale(args.teams, args.players, args.seasons)
+    db = LocalCosmosDBClient()
+    counts = seed(db, scale)
+    print(f"{counts['sessions']:,} sessions, {scale.players} players")
+
+    with tempfile.TemporaryDirectory() as directory:
+        ndjson = os.path.join(directory, "ndjson")
+        write_ndjson(scale, ndjson)
+        store = SnapshotStore(os.path.join(directory, "snapshots"))
+
+        start = time.perf_counter()
+        exporter = SnapshotExporter(db, store)
+        exporter.run_once()
+        print(
+            f"export full         {time.perf_counter() - start:8.3f} s"
+            f"  ({exporter.files_written} files)"
+        )
+        session = next(iter(db.iter_items("sessions", "SELECT * FROM c")))
+        db.upsert_item("sessions", {**session, "rpe": 10})
+        start = time.perf_counter()
+        exporter = SnapshotExporter(db, store)
+        exporter.run_once()
+        print(
+            f"export incremental  {time.perf_counter() - start:8.3f} s"
+            f"  ({exporter.files_written} files)"
+        )
+
+        readers = {
+            "cosmos": lambda: pd.DataFrame.from_records(
+                db.iter_items("sessions", "SELECT * FROM c")
+            ),
+            "ndjson": lambda: from_ndjson(os.path.join(ndjson, "sessions.ndjson")),
+            "arrow": lambda: store.read_frame("sessions"),
+            "arrow (columns)": lambda: store.read_frame(
+                "sessions", columns=LOAD_COLUMNS
+            ),
+        }
+        for name, read in readers.items():
+            seconds = best_seconds(read, args.repeat)
+            rate = counts["sessions"] / seconds
+            print(f"read {name:<15}{seconds:8.3f} s  {rate:12,.0f} rows/s")
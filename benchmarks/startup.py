@@ -0,0 +1,198 @@
+"""
+Startup-time benchmark: import profile and time to a healthy API.
+
+For each module in `--modules` a fresh interpreter imports it under
+`python -X importtime`. The report gives the total import time and the
+slowest top-level packages. It also lists any `--lazy` packages (by
+default TensorFlow, pandas, numpy, pyarrow and azure.storage.blob) that were
+imported at startup, although they should only load on the routes that
+use them.
+
+`--health` starts uvicorn on the API with the local Cosmos stand-in and
+times how long `/health` takes to answer, as the median of `--runs` cold
+starts.
+
+With `--budget-ms`, the exit status is 1 when the time to health exceeds
+the budget or a lazy package was imported at startup, so CI can catch
+regressions.
+
+Usage:
+    python -m benchmarks.startup --health --runs 5 --budget-ms 1000 \\
+        --output startup.json
+"""
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+from benchmarks.harness import git_revision
+
+DEFAULT_MODULES = ["src.api.main", "src.ui.dashboard"]
+DEFAULT_LAZY = ["tensorflow", "pandas", "numpy", "pyarrow", "azure.storage.blob"]
+
+
+def import_profile(module: str) -> List[Dict[str, Any]]:
+    """Per-module import times (microseconds) from `python -X importtime`."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": os.getcwd()},
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        if not self_us.strip().isdigit():
+            continue  # The header row.
+        rows.append(
+            {
+                "module": name.strip(),
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+            }
+        )
+    return rows
+
+
+def summarize(rows: List[Dict[str, Any]], module: str, top: int) -> Dict[str, Any]:
+    """Total import time, the slowest top-level packages and the modules seen."""
+    by_package: Dict[str, int] = defaultdict(int)
+    for row in rows:
+        by_package[row["module"].split(".")[0]] += row["self_us"]
+    total = next(
+        (row["cumulative_us"] for row in rows if row["module"] == module),
+        sum(by_package.values()),
+    )
+    slowest = sorted(by_package.items(), key=lambda item: item[1], reverse=True)
+    return {
+        "total_ms": round(total / 1000, 1),
+        "packages_ms": {name: round(us / 1000, 1) for name, us in slowest[:top]},
+        "modules": {row["module"] for row in rows},
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def time_to_health(timeout: float = 30.0) -> float:
+    """Seconds from launching uvicorn until `/health` answers 200."""
+    port = free_port()
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.getcwd(),
+        "CONFIGURATION__AZURECOSMOSDB__BACKEND": "local",
+        "CONFIGURATION__AZURECOSMOSDB__LOCALPATH": "",
+    }
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.api.main:app", "--port", str(port)],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            # http.client rather than httpx: a poll must cost next to no CPU,
+            # or it slows the server it is timing.
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1.0)
+            try:
+                conn.request("GET", "/health")
+                if conn.getresponse().status == 200:
+                    return time.perf_counter() - started
+            except OSError:
+                pass
+            finally:
+                conn.close()
+            if server.poll() is not None:
+                raise RuntimeError("uvicorn exited before /health answered")
+            time.sleep(0.01)
+        raise TimeoutError(f"/health did not answer within {timeout:.0f}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main(args: argparse.Namespace) -> Dict[str, Any]:
+    report: Dict[str, Any] = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "revision": git_revision(),
+            "python": sys.version.split()[0],
+            "budget_ms": args.budget_ms,
+        },
+        "imports": {},
+        "failures": [],
+    }
+    for module in args.modules:
+        try:
+            summary = summarize(import_profile(module), module, args.top)
+        except RuntimeError as exc:
+            print(f"{module}: not importable here ({exc})")
+            continue
+        eager = sorted(
+            lazy
+            for lazy in args.lazy
+            if any(m == lazy or m.startswith(f"{lazy}.") for m in summary["modules"])
+        )
+        report["imports"][module] = {
+            "total_ms": summary["total_ms"],
+            "packages_ms": summary["packages_ms"],
+            "eager_lazy_imports": eager,
+        }
+        print(f"{module}: {summary['total_ms']:.0f} ms")
+        for name, ms in summary["packages_ms"].items():
+            print(f"  {name:<24}{ms:>8.1f} ms")
+        if eager:
+            report["failures"].append(f"{module} imports {', '.join(eager)}")
+
+    if args.health:
+        runs = [time_to_health() * 1000 for _ in range(args.runs)]
+        report["health_ms"] = {
+            "median": round(statistics.median(runs), 1),
+            "max": round(max(runs), 1),
+            "runs": [round(ms, 1) for ms in runs],
+        }
+        print(f"time to /health: median {report['health_ms']['median']:.0f} ms")
+        if args.budget_ms and report["health_ms"]["median"] > args.budget_ms:
+            report["failures"].append(
+                f"time to /health {report['health_ms']['median']:.0f} ms"
+                f" exceeds {args.budget_ms:.0f} ms"
+            )
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--modules", nargs="+", default=DEFAULT_MODULES)
+    parser.add_argument("--lazy", nargs="+", default=DEFAULT_LAZY)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--health", action="store_true")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float)
+    parser.add_argument("--output", default="startup.json")
+    args = parser.parse_args()
+
+    report = main(args)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"wrote {args.output}")
+    if args.budget_ms and report["failures"]:
+        for failure in report["failures"]:
+            print(f"FAIL {failure}")
+        sys.exit(1)
@@ -0,0 +1,216 @@
+"""
+Synthetic season generator for Player, Team, Session, CycleLog, Metric and
+Injury documents at configurable scale.
+
+Documents are produced lazily, one player at a time, so even the largest
+scales (e.g. 50 teams x 30 players x 3 seasons) never sit in memory at once.
+They are JSON-ready dicts with partition-qualified ids, matching what the
+API writes.
+
+Usage:
+    python -m benchmarks.synthetic --teams 50 --players 30 --seasons 3 \\
+        --out ./synthetic
+writes one NDJSON file per container, ready for the `/bulk` endpoints.
+"""
+
+import argparse
+import os
+import random
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Dict, Iterator, List, Tuple
+
+from src.models.models import CycleLog, Injury, Metric, Player, Session, Team
+from src.services.routing import PARTITION_KEYS, make_id
+from src.services.serialization import dumps
+
+# Weeks in a cricket season and the first season's start date.
+WEEKS_PER_SEASON = 26
+FIRST_SEASON_START = date(2023, 3, 6)  # a Monday
+
+ROLES = ["Batter", "Bowler", "All-rounder", "Wicket-keeper"]
+SESSION_TYPES = ["Training", "Match", "Other sport"]
+SYMPTOMS = ["cramps", "fatigue", "headache", "bloating", "back pain"]
+INJURY_TYPES = ["hamstring strain", "side strain", "ankle sprain", "stress fracture"]
+
+
+@dataclass
+class Scale:
+    """Size of the generated data set."""
+
+    teams: int = 5
+    players_per_team: int = 30
+    seasons: int = 1
+    sessions_per_week: int = 4
+    seed: int = 0
+
+    @property
+    def players(self) -> int:
+        return self.teams * self.players_per_team
+
+
+Document = Tuple[str, Dict[str, Any]]
+
+
+def _dump(container_name: str, model: Any, partition_value: str) -> Document:
+    model.id = make_id(container_name, partition_value)
+    return container_name, model.model_dump(mode="json")
+
+
+def _player_documents(
+    rng: random.Random, scale: Scale, player_id: str
+) -> Iterator[Document]:
+    """Sessions, cycle logs, weekly metrics and injuries for one player."""
+    for season in range(scale.seasons):
+        start = FIRST_SEASON_START + timedelta(weeks=52 * season)
+        weekly_loads: List[int] = []
+        for week in range(WEEKS_PER_SEASON):
+            monday = start + timedelta(weeks=week)
+            days = rng.sample(range(7), k=min(scale.sessions_per_week, 7))
+            week_load = 0
+            for day in sorted(days):
+                duration = rng.choice([30, 60, 90, 120, 180])
+                rpe = rng.randint(3, 9)
+                week_load += duration * rpe
+                yield _dump(
+                    "sessions",
+                    Session(
+                        player_id=player_id,
+                        date=monday + timedelta(days=day),
+                        session_type=rng.choice(SESSION_TYPES),
+                        duration=duration,
+                        rpe=rpe,
+                        batting_minutes=rng.randint(0, duration),
+                        bowling_overs=rng.randint(0, 10),
+                        fielding_time=rng.randint(0, duration),
+                        comment=None,
+                    ),
+                    player_id,
+                )
+            weekly_loads.append(week_load)
+            chronic = sum(weekly_loads[-4:]) / len(weekly_loads[-4:])
+            yield _dump(
+                "metrics",
+                Metric(
+                    player_id=player_id,
+                    week=monday,
+                    acute=week_load,
+                    chronic=int(chronic),
+                    acwr=round(week_load / chronic, 2) if chronic else 0.0,
+                ),
+                player_id,
+            )
+            if week % 4 == 0:
+                yield _dump(
+                    "cycleLogs",
+                    CycleLog(
+                        player_id=player_id,
+                        period_start=monday + timedelta(days=rng.randint(0, 6)),
+                        symptoms=rng.sample(SYMPTOMS, k=rng.randint(0, 2)),
+                        wellness=rng.randint(1, 10),
+                        sleep=rng.randint(1, 10),
+                        mood=rng.randint(1, 10),
+                        soreness=rng.randint(1, 10),
+                        comment=None,
+                    ),
+                    player_id,
+                )
+        if rng.random() < 0.15:
+            yield _dump(
+                "injuries",
+                Injury(
+                    player_id=player_id,
+                    date=start + timedelta(days=rng.randint(0, 7 * WEEKS_PER_SEASON)),
+                    type=rng.choice(INJURY_TYPES),
+                    severity=rng.choice(["Low", "Medium", "High"]),
+                    description=None,
+                ),
+                player_id,
+            )
+
+
+def generate(scale: Scale) -> Iterator[Document]:
+    """Yield `(container, document)` pairs for the whole data set."""
+    rng = random.Random(scale.seed)
+    for t in range(scale.teams):
+        team = Team(name=f"Team {t + 1}", player_ids=[])
+        team.id = make_id("teams", None)
+        players = []
+        for p in range(scale.players_per_team):
+            player = Player(
+                name=f"Player {t + 1}-{p + 1}",
+                role=rng.choice(ROLES),
+                team_id=team.id,
+                email=None,
+            )
+            players.append(_dump("players", player, team.id))
+            team.player_ids.append(player.id)  # type: ignore[arg-type]
+        team_doc = team.model_dump(mode="json")
+        team_doc["team_id"] = team.id
+        yield "teams", team_doc
+        yield from players
+        for player_id in team.player_ids:
+            yield from _player_documents(rng, scale, player_id)
+
+
+def seed(db: Any, scale: Scale, batch_size: int = 100) -> Dict[str, int]:
+    """
+    Write a generated data set through `upsert_batch`, one partition at a
+    time, and return the number of documents per container.
+    """
+    counts: Dict[str, int] = defaultdict(int)
+    pending: Dict[Tuple[str, Any], List[dict]] = defaultdict(list)
+
+    def flush(key: Tuple[str, Any]) -> None:
+        container_name, partition_value = key
+        db.upsert_batch(container_name, pending.pop(key), partition_value)
+
+    current: Any = None
+    for container_name, document in generate(scale):
+        counts[container_name] += 1
+        partition_value = document.get(PARTITION_KEYS[container_name])
+        if partition_value != current:
+            # Documents arrive partition by partition (a team, then each of
+            # its players), so the previous partition is complete.
+            for key in list(pending):
+                flush(key)
+            current = partition_value
+        key = (container_name, partition_value)
+        pending[key].append(document)
+        if len(pending[key]) >= batch_size:
+            flush(key)
+    for key in list(pending):
+        flush(key)
+    return dict(counts)
+
+
+def write_ndjson(scale: Scale, out_dir: str) -> Dict[str, int]:
+    """Write one NDJSON file per container into `out_dir`."""
+    os.makedirs(out_dir, exist_ok=True)
+    counts: Dict[str, int] = defaultdict(int)
+    files: Dict[str, Any] = {}
+    try:
+        for container_name, document in generate(scale):
+            if container_name not in files:
+                path = os.path.join(out_dir, f"{container_name}.ndjson")
+                files[container_name] = open(path, "wb")
+            files[container_name].write(dumps(document) + b"\n")
+            counts[container_name] += 1
+    finally:
+        for handle in files.values():
+            handle.close()
+    return dict(counts)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--teams", type=int, default=5)
+    parser.add_argument("--players", type=int, default=30)
+    parser.add_argument("--seasons", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="./synthetic")
+    args = parser.parse_args()
+    scale = Scale(args.teams, args.players, args.seasons, seed=args.seed)
+    for name, count in write_ndjson(scale, args.out).items():
+        print(f"{name:<10}{count:>10,}")
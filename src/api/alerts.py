@@ -0,0 +1,74 @@
+"""
+Server-sent risk alerts for coach dashboards.
+
+`GET /teams/{team_id}/alerts` is an `text/event-stream`. It opens with a
+`snapshot` event holding every player's current status, then sends an
+`alert` event whenever a player's status changes (see
+`src.services.alerts`). Comment lines keep idle connections open through
+proxies. A client that reconnects gets a fresh snapshot, so it never
+needs to replay missed events.
+"""
+
+import asyncio
+from typing import AsyncIterator
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+from src.services.alerts import RiskAlertEngine
+from src.services.cosmos_async import AsyncCosmosDBClient, get_async_db
+from src.services.serialization import dumps
+
+router = APIRouter(prefix="/teams/{team_id}", tags=["alerts"])
+
+EVENT_STREAM_MEDIA_TYPE = "text/event-stream"
+
+# Seconds between keep-alive comments on an idle stream.
+HEARTBEAT_SECONDS = 15.0
+
+# Milliseconds a client waits before reconnecting after the stream drops.
+RETRY_MS = 3000
+
+
+async def get_alerts(request: Request) -> RiskAlertEngine:
+    """FastAPI dependency returning the alert engine started by the lifespan."""
+    engine = getattr(request.app.state, "alerts", None)
+    if engine is None:
+        raise HTTPException(status_code=503, detail="Alerts are not available")
+    return engine
+
+
+def server_event(event: str, data: dict, event_id: int) -> bytes:
+    """One event in the `text/event-stream` format."""
+    return b"id: %d\nevent: %s\ndata: %s\n\n" % (event_id, event.encode(), dumps(data))
+
+
+async def _events(engine: RiskAlertEngine, team: dict) -> AsyncIterator[bytes]:
+    yield b"retry: %d\n\n" % RETRY_MS
+    async with engine.watch(team) as queue:
+        event_id = 0
+        while True:
+            try:
+                message = await asyncio.wait_for(queue.get(), HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield b": keep-alive\n\n"
+                continue
+            event_id += 1
+            yield server_event(message["type"], message, event_id)
+
+
+@router.get("/alerts", response_class=StreamingResponse)
+async def stream_alerts(
+    team_id: str,
+    engine: RiskAlertEngine = Depends(get_alerts),
+    db: AsyncCosmosDBClient = Depends(get_async_db),
+):
+    """Risk statuses of the team's players, then an event per change."""
+    team = await db.get_item("teams", team_id)
+    if not team:
+        raise HTTPException(status_code=404, detail="Team not found")
+    return StreamingResponse(
+        _events(engine, team),
+        media_type=EVENT_STREAM_MEDIA_TYPE,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
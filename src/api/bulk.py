@@ -0,0 +1,218 @@
+"""
+Bulk ingestion endpoints for season imports (GPS/wearable exports,
+spreadsheets).
+
+Rows are validated in one pass with a pydantic `TypeAdapter`, grouped by
+their `player_id` partition and written as Cosmos transactional batches.
+Batches for different partitions run concurrently.
+"""
+
+import asyncio
+import json
+from collections import defaultdict
+from typing import Any, Dict, List, Literal, Optional, Tuple, Type
+
+from azure.core.exceptions import HttpResponseError
+from azure.cosmos.exceptions import CosmosBatchOperationError
+from fastapi import APIRouter, Depends, HTTPException, Request
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from src.models.models import CycleLog, Metric, Session
+from src.services.cosmos_async import AsyncCosmosDBClient, get_async_db
+from src.services.routing import PARTITION_KEYS, make_id, partition_for_id
+
+router = APIRouter(tags=["bulk"])
+
+# Cosmos DB limits a transactional batch to 100 operations.
+MAX_BATCH_SIZE = 100
+
+# Batches in flight at once; bounds load on the connection pool and RUs.
+MAX_CONCURRENT_BATCHES = 8
+
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/jsonl")
+
+
+class BulkRowResult(BaseModel):
+    index: int
+    status: Literal["upserted", "invalid", "failed"]
+    id: Optional[str] = None
+    error: Optional[str] = None
+
+
+class BulkResult(BaseModel):
+    total: int
+    succeeded: int
+    failed: int
+    results: List[BulkRowResult]
+
+
+async def read_rows(request: Request) -> List[Any]:
+    """
+    Parse the request body as a JSON array or as NDJSON (one row per line).
+
+    Unparseable NDJSON lines are kept as None so they are reported as
+    invalid rows at their original index rather than failing the request.
+    """
+    body = await request.body()
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith(NDJSON_MEDIA_TYPES):
+        rows: List[Any] = []
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            try:
+                rows.append(json.loads(line))
+            except json.JSONDecodeError:
+                rows.append(None)
+        return rows
+    try:
+        rows = json.loads(body)
+    except json.JSONDecodeError as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON: {exc}")
+    if not isinstance(rows, list):
+        raise HTTPException(status_code=400, detail="Expected a JSON array")
+    return rows
+
+
+def validate_rows(
+    model: Type[BaseModel], rows: List[Any]
+) -> Tuple[Dict[int, BaseModel], Dict[int, str]]:
+    """
+    Validate every row against `model`, returning valid and invalid rows.
+
+    The whole list is validated in one call into pydantic-core. Error
+    locations carry the row index, so invalid rows are collected from that
+    single pass and the remaining rows are validated once more as a list.
+    """
+    adapter = TypeAdapter(List[model])  # type: ignore[valid-type]
+    errors: Dict[int, str] = {}
+    try:
+        return dict(enumerate(adapter.validate_python(rows))), errors
+    except ValidationError as exc:
+        for error in exc.errors():
+            index = error["loc"][0]
+            field = ".".join(str(part) for part in error["loc"][1:])
+            message = f"{field}: {error['msg']}" if field else error["msg"]
+            errors.setdefault(index, message)  # type: ignore[arg-type]
+    remaining = [i for i in range(len(rows)) if i not in errors]
+    models = adapter.validate_python([rows[i] for i in remaining])
+    return dict(zip(remaining, models)), errors
+
+
+def assign_id(container_name: str, row: BaseModel, partition_value: str) -> str:
+    """
+    Keep a caller-supplied id that routes to the row's partition, so
+    re-running an import upserts instead of duplicating; otherwise mint one.
+    """
+    current = getattr(row, "id", None)
+    if current and partition_for_id(container_name, current) == partition_value:
+        return current
+    return make_id(container_name, partition_value)
+
+
+async def _write_batch(
+    db: AsyncCosmosDBClient,
+    container_name: str,
+    partition_value: str,
+    batch: List[Tuple[int, dict]],
+    semaphore: asyncio.Semaphore,
+) -> List[BulkRowResult]:
+    """Upsert one transactional batch and report a result for each row."""
+    async with semaphore:
+        try:
+            await db.upsert_batch(
+                container_name, [item for _, item in batch], partition_value
+            )
+        except CosmosBatchOperationError as exc:
+            # The batch is atomic: the failing operation aborts every row.
+            failed_at = (
+                batch[exc.error_index][0] if exc.error_index is not None else None
+            )
+            return [
+                BulkRowResult(
+                    index=index,
+                    status="failed",
+                    id=item["id"],
+                    error=(
+                        str(exc.message)
+                        if index == failed_at
+                        else "Rolled back with its transactional batch"
+                    ),
+                )
+                for index, item in batch
+            ]
+        except HttpResponseError as exc:
+            return [
+                BulkRowResult(
+                    index=index, status="failed", id=item["id"], error=str(exc.message)
+                )
+                for index, item in batch
+            ]
+    return [
+        BulkRowResult(index=index, status="upserted", id=item["id"])
+        for index, item in batch
+    ]
+
+
+async def bulk_upsert(
+    db: AsyncCosmosDBClient,
+    container_name: str,
+    model: Type[BaseModel],
+    rows: List[Any],
+) -> BulkResult:
+    """Validate, group by partition and concurrently batch-write `rows`."""
+    valid, errors = validate_rows(model, rows)
+    partition_field = PARTITION_KEYS[container_name]
+
+    groups: Dict[str, List[Tuple[int, dict]]] = defaultdict(list)
+    for index, row in valid.items():
+        partition_value = getattr(row, partition_field)
+        row.id = assign_id(container_name, row, partition_value)  # type: ignore[attr-defined]
+        groups[partition_value].append((index, row.model_dump(mode="json")))
+
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_BATCHES)
+    tasks = [
+        _write_batch(
+            db,
+            container_name,
+            partition_value,
+            items[i : i + MAX_BATCH_SIZE],
+            semaphore,
+        )
+        for partition_value, items in groups.items()
+        for i in range(0, len(items), MAX_BATCH_SIZE)
+    ]
+    results = [row for batch in await asyncio.gather(*tasks) for row in batch]
+    results.extend(
+        BulkRowResult(index=index, status="invalid", error=message)
+        for index, message in errors.items()
+    )
+    results.sort(key=lambda result: result.index)
+    succeeded = sum(result.status == "upserted" for result in results)
+    return BulkResult(
+        total=len(rows),
+        succeeded=succeeded,
+        failed=len(rows) - succeeded,
+        results=results,
+    )
+
+
+@router.post("/sessions/bulk", response_model=BulkResult)
+async def bulk_sessions(
+    request: Request, db: AsyncCosmosDBClient = Depends(get_async_db)
+):
+    return await bulk_upsert(db, "sessions", Session, await read_rows(request))
+
+
+@router.post("/cyclelogs/bulk", response_model=BulkResult)
+async def bulk_cyclelogs(
+    request: Request, db: AsyncCosmosDBClient = Depends(get_async_db)
+):
+    return await bulk_upsert(db, "cycleLogs", CycleLog, await read_rows(request))
+
+
+@router.post("/metrics/bulk", response_model=BulkResult)
+async def bulk_metrics(
+    request: Request, db: AsyncCosmosDBClient = Depends(get_async_db)
+):
+    return await bulk_upsert(db, "metrics", Metric, await read_rows(request))
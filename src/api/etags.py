@@ -0,0 +1,73 @@
+"""
+Strong ETags and conditional GETs for stored Cosmos documents.
+
+Cosmos gives every document a new `_etag` on each write. A detail route
+reuses the document's `_etag` as its ETag. A list route hashes the `_etag`
+of every row it returns, plus the continuation token, so adding, changing
+or removing any row changes the list's ETag. A request whose
+`If-None-Match` matches gets `304 Not Modified` with no body. Together with
+the read-through cache, an unchanged refresh needs no RUs and almost no
+bandwidth.
+"""
+
+import hashlib
+from typing import Iterable, Optional
+
+from fastapi import Response
+
+from src.services.serialization import dumps, strip_system_fields
+
+
+def _version(document: dict) -> bytes:
+    """A per-document version: `_etag`, or the content for projections."""
+    etag = document.get("_etag")
+    return etag.encode() if etag else dumps(document)
+
+
+def document_etag(document: dict) -> str:
+    etag = document.get("_etag")
+    if etag:
+        return etag if etag.startswith('"') else f'"{etag}"'
+    return f'"{hashlib.sha1(dumps(document)).hexdigest()}"'
+
+
+def list_etag(documents: Iterable[dict], continuation: Optional[str] = None) -> str:
+    digest = hashlib.sha1()
+    count = 0
+    for document in documents:
+        digest.update(document.get("id", "").encode())
+        digest.update(_version(document))
+        count += 1
+    digest.update(f"|{count}|{continuation or ''}".encode())
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison against an `If-None-Match` header (RFC 9110 13.1.2)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def not_modified(etag: str, headers: Optional[dict] = None) -> Response:
+    return Response(status_code=304, headers={**(headers or {}), "ETag": etag})
+
+
+class DocumentResponse(Response):
+    """JSON response for one stored document, without system properties."""
+
+    media_type = "application/json"
+
+    def render(self, content: dict) -> bytes:
+        return dumps(strip_system_fields(content))
+
+
+def document_response(document: dict, if_none_match: Optional[str]) -> Response:
+    """Return `document` with its ETag, or 304 if the client has it."""
+    etag = document_etag(document)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return DocumentResponse(document, headers={"ETag": etag})
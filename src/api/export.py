@@ -0,0 +1,135 @@
+"""
+Data exports for coaches: `GET /export/{entity}` as CSV, XLSX or Parquet.
+
+Rows are read from Cosmos one page at a time and handed to the format's
+writer in chunks (`src/services/export.py`). The response streams as the
+writer produces bytes, so memory stays flat for multi-season exports and
+a CSV or Parquet download starts with the first page.
+
+Filter by `team_id` (every player in the team), `player_id`, and
+`from`/`to`. A team or player export reads one player partition after
+another; without either it is a cross-partition query. `fields=` limits
+the columns, using the same whitelist as the list routes.
+"""
+
+import asyncio
+from datetime import date
+from typing import AsyncIterator, List, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from src.api.players import build_player_query
+from src.api.queries import (
+    CONTAINER_MODELS,
+    DateRange,
+    build_query,
+    date_range,
+    parse_fields,
+)
+from src.services.cosmos_async import AsyncCosmosDBClient, get_async_db
+from src.services.export import WRITERS, ExportWriter, column_types
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+# Exported entities and their containers.
+EXPORT_CONTAINERS = {
+    "sessions": "sessions",
+    "cyclelogs": "cycleLogs",
+    "metrics": "metrics",
+    "injuries": "injuries",
+}
+
+# Rows per Cosmos page, and so per chunk written.
+EXPORT_PAGE_SIZE = 1000
+
+
+async def _documents(
+    db: AsyncCosmosDBClient,
+    container_name: str,
+    columns: List[str],
+    dates: DateRange,
+    player_ids: Optional[List[str]],
+) -> AsyncIterator[dict]:
+    """The matching documents: one partition at a time, or cross-partition."""
+    if player_ids is None:
+        query, parameters = build_query(container_name, columns, dates)
+        async for document in db.iter_items(
+            container_name, query, parameters, page_size=EXPORT_PAGE_SIZE
+        ):
+            yield document
+        return
+    for player_id in player_ids:
+        query, parameters = build_player_query(
+            container_name, player_id, dates, columns
+        )
+        async for document in db.iter_items(
+            container_name,
+            query,
+            parameters,
+            page_size=EXPORT_PAGE_SIZE,
+            partition_key=player_id,
+        ):
+            yield document
+
+
+async def _encode(
+    writer: ExportWriter, documents: AsyncIterator[dict]
+) -> AsyncIterator[bytes]:
+    """
+    Feed documents to `writer` a chunk at a time, yielding its output.
+
+    Encoding runs in a worker thread: an XLSX chunk takes long enough to
+    hold up every other request on the event loop.
+    """
+    if head := writer.start():
+        yield head
+    chunk: List[dict] = []
+    async for document in documents:
+        chunk.append(document)
+        if len(chunk) == EXPORT_PAGE_SIZE:
+            if data := await asyncio.to_thread(writer.write, chunk):
+                yield data
+            chunk = []
+    if chunk and (data := await asyncio.to_thread(writer.write, chunk)):
+        yield data
+    rest = writer.finish()
+    while (data := await asyncio.to_thread(next, rest, None)) is not None:
+        yield data
+
+
+@router.get("/{entity}", response_class=StreamingResponse)
+async def export(
+    entity: Literal["sessions", "cyclelogs", "metrics", "injuries"],
+    format: Literal["csv", "xlsx", "parquet"] = Query("csv"),
+    team_id: Optional[str] = Query(None, description="Every player in the team."),
+    player_id: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None, description="Comma-separated columns."),
+    dates: DateRange = Depends(date_range),
+    db: AsyncCosmosDBClient = Depends(get_async_db),
+):
+    """Stream the entity's documents matching the filters as a file."""
+    container_name = EXPORT_CONTAINERS[entity]
+    model = CONTAINER_MODELS[container_name]
+    columns = parse_fields(fields) or list(model.model_fields)
+    # Checks the columns before the response starts, while a 400 is possible.
+    build_query(container_name, columns)
+    player_ids: Optional[List[str]] = None
+    if team_id is not None:
+        team = await db.get_item("teams", team_id)
+        if not team:
+            raise HTTPException(status_code=404, detail="Team not found")
+        player_ids = list(dict.fromkeys(team.get("player_ids", [])))
+        if player_id is not None:
+            player_ids = [pid for pid in player_ids if pid == player_id]
+    elif player_id is not None:
+        player_ids = [player_id]
+
+    writer = WRITERS[format](column_types(model, columns), title=entity)
+    documents = _documents(db, container_name, columns, dates, player_ids)
+    filename = f"{entity}-{date.today().isoformat()}.{writer.extension}"
+    return StreamingResponse(
+        _encode(writer, documents),
+        media_type=writer.media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
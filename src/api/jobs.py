@@ -0,0 +1,55 @@
+"""
+Background jobs: start model retraining and poll its progress.
+
+`POST /retrain` returns at once with a queued job; training runs in a
+worker process (see `src.services.jobs`). `GET /jobs/{job_id}` returns the
+job document with its ETag, so a client polling an unchanged job gets
+`304 Not Modified`.
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
+
+from src.api.etags import document_response
+from src.models.models import Job, RetrainRequest
+from src.services.cosmos_async import AsyncCosmosDBClient, get_async_db
+from src.services.jobs import JobManager, TooManyJobs
+from src.services.serialization import dumps
+
+router = APIRouter(tags=["jobs"])
+
+
+async def get_jobs(request: Request) -> JobManager:
+    """FastAPI dependency returning the job manager started by the lifespan."""
+    manager = getattr(request.app.state, "jobs", None)
+    if manager is None:
+        raise HTTPException(status_code=503, detail="Jobs are not available")
+    return manager
+
+
+@router.post("/retrain", response_model=Job, status_code=202)
+async def retrain(body: RetrainRequest, jobs: JobManager = Depends(get_jobs)):
+    """Queue retraining of the injury-risk model; poll the returned job."""
+    try:
+        job = await jobs.submit_retrain(body.model_dump(mode="json"))
+    except TooManyJobs as exc:
+        raise HTTPException(status_code=429, detail=str(exc))
+    return Response(
+        dumps(Job.model_validate(job).model_dump(mode="json")),
+        status_code=202,
+        media_type="application/json",
+        headers={"Location": f"/jobs/{job['id']}"},
+    )
+
+
+@router.get("/jobs/{job_id}", response_model=Job)
+async def get_job(
+    job_id: str,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncCosmosDBClient = Depends(get_async_db),
+):
+    item = await db.get_item("jobs", job_id)
+    if item:
+        return document_response(item, if_none_match)
+    raise HTTPException(status_code=404, detail="Job not found")
@@ -1,4 +1,11 @@
-from fastapi import FastAPI, HTTPException
+import asyncio
+import importlib
+import inspect
+import logging
+from contextlib import asynccontextmanager, suppress
+from typing import AsyncIterator, Iterable, Optional
+
+from fastapi import Depends, FastAPI, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from src.models.models import (
@@ -11,13 +18,94 @@ from src.models.models import (
     ModelRegistry,
 )
 
-from uuid import uuid4
 from datetime import datetime
-from src.services.cosmos import get_db
+from src.api.alerts import router as alerts_router
+from src.api.bulk import router as bulk_router
+from src.api.etags import document_response
+from src.api.export import router as export_router
+from src.api.jobs import router as jobs_router
+from src.api.pagination import ListParams, list_items, list_params
+from src.api.players import router as players_router
+from src.api.queries import DateRange, date_range
+from src.api.predict import router as predict_router
+from src.api.teams import router as teams_router
+from src.api.telemetry import RouteMetricsMiddleware
+from src.api.telemetry import router as telemetry_router
+from src.services.cosmos import CONTAINERS
+from src.ml.inference import create_inference_service
+from src.services.alerts import create_alert_engine
+from src.services.jobs import create_job_manager
+from src.services.materializer import create_materializer
+from src.services.routing import make_id
+from src.services.telemetry import telemetry_enabled
+from src.services.cosmos_async import (
+    AsyncCosmosDBClient,
+    create_async_db,
+    get_async_db,
+)
+
+logger = logging.getLogger(__name__)
+
+# Imported lazily by the routes that need them (see `src.ml.features`), and
+# in the background once the API is up, so neither startup nor the first
+# request pays for them.
+PREWARM_MODULES = ("pandas",)
+
 
+def prewarm(modules: Iterable[str] = PREWARM_MODULES) -> None:
+    for module in modules:
+        importlib.import_module(module)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Create the pooled Cosmos client once per process and warm its containers.
 
-app = FastAPI()
-db = get_db()
+    Routes receive the same client through `Depends(get_async_db)`, so no
+    request pays for credential setup or container metadata lookups. The
+    client is created here so its aiohttp session binds to the server loop.
+    """
+    # Honour dependency overrides so tests can swap the client out entirely.
+    provider = app.dependency_overrides.get(get_async_db, create_async_db)
+    db = provider()
+    if inspect.isawaitable(db):
+        db = await db
+    await db.warm(CONTAINERS)
+    # Keep weekly metrics in step with sessions in the background.
+    materializer = create_materializer(db)
+    # Serve the active injury-risk model; routes find it on `app.state`.
+    app.state.inference = create_inference_service(db)
+    # Retraining runs in worker processes, started on the first job.
+    app.state.jobs = create_job_manager(db)
+    try:
+        await app.state.jobs.recover()
+    except Exception:
+        # Only bookkeeping; the API must still start without it.
+        logger.exception("Recovering interrupted jobs failed")
+    # Re-rate watched players on each write and push alerts to their teams.
+    app.state.alerts = create_alert_engine(db)
+    tasks = [
+        asyncio.create_task(service.run())
+        for service in (materializer, app.state.inference, app.state.alerts)
+        if service is not None
+    ]
+    tasks.append(asyncio.create_task(asyncio.to_thread(prewarm)))
+    yield
+    for task in tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    await app.state.jobs.close()
+    await db.close()
+    create_async_db.cache_clear()
+
+
+app = FastAPI(lifespan=lifespan)
+
+# Registered before `/metrics/{metric_id}`, which would otherwise match
+# `/metrics/internal`.
+app.include_router(telemetry_router)
 
 # --- In-memory mock data for sessions ---
 
@@ -33,201 +121,246 @@ modelregistries: list[ModelRegistry] = []
 
 # --- Session Endpoints (Cosmos DB) ---
 @app.get("/sessions", response_model=list[Session])
-def list_sessions():
-    query = "SELECT * FROM c"
-    items = db.query_items("sessions", query)
-    return items
+async def list_sessions(
+    dates: DateRange = Depends(date_range),
+    params: ListParams = Depends(list_params),
+    db: AsyncCosmosDBClient = Depends(get_async_db),
+):
+    return await list_items(db, "sessions", params, dates=dates)
 
 
 @app.post("/sessions", response_model=Session)
-def create_session(session: Session):
+async def create_session(
+    session: Session, db: AsyncCosmosDBClient = Depends(get_async_db)
+):
     if isinstance(session.date, str):
         session.date = datetime.strptime(session.date, "%Y-%m-%d").date()
-    session.id = str(uuid4())
-    item = session.model_dump()
-    db.upsert_item("sessions", item)
+    session.id = make_id("sessions", session.player_id)
+    item = session.model_dump(mode="json")
+    await db.upsert_item("sessions", item)
     return session
 
 
 @app.get("/sessions/{session_id}", response_model=Session)
-def get_session(session_id: str):
-    # Partition key is player_id
-    query = "SELECT * FROM c WHERE c.id = @id"
-    params = [{"name": "@id", "value": session_id}]
-    items = db.query_items("sessions", query, params)
-    if items:
-        return items[0]
+async def get_session(
+    session_id: str,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncCosmosDBClient = Depends(get_async_db),
+):
+    item = await db.get_item("sessions", session_id)
+    if item:
+        return document_response(item, if_none_match)
     raise HTTPException(status_code=404, detail="Session not found")
 
 
 # --- Player Endpoints (Cosmos DB) ---
 @app.get("/players", response_model=list[Player])
-def list_players():
-    query = "SELECT * FROM c"
-    items = db.query_items("players", query)
-    return items
+async def list_players(
+    params: ListParams = Depends(list_params),
+    db: AsyncCosmosDBClient = Depends(get_async_db),
+):
+    return await list_items(db, "players", params)
 
 
 @app.post("/players", response_model=Player)
-def create_player(player: Player):
-    player.id = str(uuid4())
-    item = player.dict()
-    db.upsert_item("players", item)
+async def create_player(
+    player: Player, db: AsyncCosmosDBClient = Depends(get_async_db)
+):
+    player.id = make_id("players", player.team_id)
+    item = player.model_dump(mode="json")
+    await db.upsert_item("players", item)
     return player
 
 
 @app.get("/players/{player_id}", response_model=Player)
-def get_player(player_id: str):
-    query = "SELECT * FROM c WHERE c.id = @id"
-    params = [{"name": "@id", "value": player_id}]
-    items = db.query_items("players", query, params)
-    if items:
-        return items[0]
+async def get_player(
+    player_id: str,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncCosmosDBClient = Depends(get_async_db),
+):
+    item = await db.get_item("players", player_id)
+    if item:
+        return document_response(item, if_none_match)
     raise HTTPException(status_code=404, detail="Player not found")
 
 
 # --- CycleLog Endpoints (Cosmos DB) ---
 @app.get("/cyclelogs", response_model=list[CycleLog])
-def list_cyclelogs():
-    query = "SELECT * FROM c"
-    items = db.query_items("cycleLogs", query)
-    return items
+async def list_cyclelogs(
+    dates: DateRange = Depends(date_range),
+    params: ListParams = Depends(list_params),
+    db: AsyncCosmosDBClient = Depends(get_async_db),
+):
+    return await list_items(db, "cycleLogs", params, dates=dates)
 
 
 @app.post("/cyclelogs", response_model=CycleLog)
-def create_cyclelog(cyclelog: CycleLog):
+async def create_cyclelog(
+    cyclelog: CycleLog, db: AsyncCosmosDBClient = Depends(get_async_db)
+):
     if isinstance(cyclelog.period_start, str):
         cyclelog.period_start = datetime.strptime(
             cyclelog.period_start, "%Y-%m-%d"
         ).date()
-    cyclelog.id = str(uuid4())
-    item = cyclelog.model_dump()
-    db.upsert_item("cycleLogs", item)
+    cyclelog.id = make_id("cycleLogs", cyclelog.player_id)
+    item = cyclelog.model_dump(mode="json")
+    await db.upsert_item("cycleLogs", item)
     return cyclelog
 
 
 @app.get("/cyclelogs/{cyclelog_id}", response_model=CycleLog)
-def get_cyclelog(cyclelog_id: str):
-    query = "SELECT * FROM c WHERE c.id = @id"
-    params = [{"name": "@id", "value": cyclelog_id}]
-    items = db.query_items("cycleLogs", query, params)
-    if items:
-        return items[0]
+async def get_cyclelog(
+    cyclelog_id: str,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncCosmosDBClient = Depends(get_async_db),
+):
+    item = await db.get_item("cycleLogs", cyclelog_id)
+    if item:
+        return document_response(item, if_none_match)
     raise HTTPException(status_code=404, detail="CycleLog not found")
 
 
 # --- Team Endpoints (Cosmos DB) ---
 @app.get("/teams", response_model=list[Team])
-def list_teams():
-    query = "SELECT * FROM c"
-    items = db.query_items("teams", query)
-    return items
+async def list_teams(
+    params: ListParams = Depends(list_params),
+    db: AsyncCosmosDBClient = Depends(get_async_db),
+):
+    return await list_items(db, "teams", params)
 
 
 @app.post("/teams", response_model=Team)
-def create_team(team: Team):
-    team.id = str(uuid4())
-    item = team.dict()
-    db.upsert_item("teams", item)
+async def create_team(team: Team, db: AsyncCosmosDBClient = Depends(get_async_db)):
+    team.id = make_id("teams", None)
+    item = team.model_dump(mode="json")
+    # Teams are partitioned on /team_id, which is the team's own id.
+    item["team_id"] = team.id
+    await db.upsert_item("teams", item)
     return team
 
 
 @app.get("/teams/{team_id}", response_model=Team)
-def get_team(team_id: str):
-    query = "SELECT * FROM c WHERE c.id = @id"
-    params = [{"name": "@id", "value": team_id}]
-    items = db.query_items("teams", query, params)
-    if items:
-        return items[0]
+async def get_team(
+    team_id: str,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncCosmosDBClient = Depends(get_async_db),
+):
+    item = await db.get_item("teams", team_id)
+    if item:
+        return document_response(item, if_none_match)
     raise HTTPException(status_code=404, detail="Team not found")
 
 
 # --- Metric Endpoints (Cosmos DB) ---
 @app.get("/metrics", response_model=list[Metric])
-def list_metrics():
-    query = "SELECT * FROM c"
-    items = db.query_items("metrics", query)
-    return items
+async def list_metrics(
+    dates: DateRange = Depends(date_range),
+    params: ListParams = Depends(list_params),
+    db: AsyncCosmosDBClient = Depends(get_async_db),
+):
+    return await list_items(db, "metrics", params, dates=dates)
 
 
 @app.post("/metrics", response_model=Metric)
-def create_metric(metric: Metric):
+async def create_metric(
+    metric: Metric, db: AsyncCosmosDBClient = Depends(get_async_db)
+):
     if isinstance(metric.week, str):
         metric.week = datetime.strptime(metric.week, "%Y-%m-%d").date()
-    metric.id = str(uuid4())
-    item = metric.dict()
-    db.upsert_item("metrics", item)
+    metric.id = make_id("metrics", metric.player_id)
+    item = metric.model_dump(mode="json")
+    await db.upsert_item("metrics", item)
     return metric
 
 
 @app.get("/metrics/{metric_id}", response_model=Metric)
-def get_metric(metric_id: str):
-    query = "SELECT * FROM c WHERE c.id = @id"
-    params = [{"name": "@id", "value": metric_id}]
-    items = db.query_items("metrics", query, params)
-    if items:
-        return items[0]
+async def get_metric(
+    metric_id: str,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncCosmosDBClient = Depends(get_async_db),
+):
+    item = await db.get_item("metrics", metric_id)
+    if item:
+        return document_response(item, if_none_match)
     raise HTTPException(status_code=404, detail="Metric not found")
 
 
 # --- Injury Endpoints (Cosmos DB) ---
 @app.get("/injuries", response_model=list[Injury])
-def list_injuries():
-    query = "SELECT * FROM c"
-    items = db.query_items("injuries", query)
-    return items
+async def list_injuries(
+    dates: DateRange = Depends(date_range),
+    params: ListParams = Depends(list_params),
+    db: AsyncCosmosDBClient = Depends(get_async_db),
+):
+    return await list_items(db, "injuries", params, dates=dates)
 
 
 @app.post("/injuries", response_model=Injury)
-def create_injury(injury: Injury):
+async def create_injury(
+    injury: Injury, db: AsyncCosmosDBClient = Depends(get_async_db)
+):
     if isinstance(injury.date, str):
         injury.date = datetime.strptime(injury.date, "%Y-%m-%d").date()
-    injury.id = str(uuid4())
-    item = injury.dict()
-    db.upsert_item("injuries", item)
+    injury.id = make_id("injuries", injury.player_id)
+    item = injury.model_dump(mode="json")
+    await db.upsert_item("injuries", item)
     return injury
 
 
 @app.get("/injuries/{injury_id}", response_model=Injury)
-def get_injury(injury_id: str):
-    query = "SELECT * FROM c WHERE c.id = @id"
-    params = [{"name": "@id", "value": injury_id}]
-    items = db.query_items("injuries", query, params)
-    if items:
-        return items[0]
+async def get_injury(
+    injury_id: str,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncCosmosDBClient = Depends(get_async_db),
+):
+    item = await db.get_item("injuries", injury_id)
+    if item:
+        return document_response(item, if_none_match)
     raise HTTPException(status_code=404, detail="Injury not found")
 
 
 # --- ModelRegistry Endpoints (Cosmos DB) ---
 @app.get("/modelregistries", response_model=list[ModelRegistry])
-def list_modelregistries():
-    query = "SELECT * FROM c"
-    items = db.query_items("modelRegistry", query)
-    return items
+async def list_modelregistries(
+    dates: DateRange = Depends(date_range),
+    params: ListParams = Depends(list_params),
+    db: AsyncCosmosDBClient = Depends(get_async_db),
+):
+    return await list_items(db, "modelRegistry", params, dates=dates)
 
 
 @app.post("/modelregistries", response_model=ModelRegistry)
-def create_modelregistry(modelregistry: ModelRegistry):
+async def create_modelregistry(
+    modelregistry: ModelRegistry, db: AsyncCosmosDBClient = Depends(get_async_db)
+):
     if isinstance(modelregistry.trained_at, str):
         modelregistry.trained_at = datetime.strptime(
             modelregistry.trained_at, "%Y-%m-%d"
         ).date()
-    modelregistry.id = str(uuid4())
-    item = modelregistry.dict()
-    db.upsert_item("modelRegistry", item)
+    modelregistry.id = make_id("modelRegistry", modelregistry.model_name)
+    item = modelregistry.model_dump(mode="json")
+    # The registry is partitioned on /model_id: one partition per model.
+    item["model_id"] = modelregistry.model_name
+    await db.upsert_item("modelRegistry", item)
     return modelregistry
 
 
 @app.get("/modelregistries/{modelregistry_id}", response_model=ModelRegistry)
-def get_modelregistry(modelregistry_id: str):
-    query = "SELECT * FROM c WHERE c.id = @id"
-    params = [{"name": "@id", "value": modelregistry_id}]
-    items = db.query_items("modelRegistry", query, params)
-    if items:
-        return items[0]
+async def get_modelregistry(
+    modelregistry_id: str,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncCosmosDBClient = Depends(get_async_db),
+):
+    item = await db.get_item("modelRegistry", modelregistry_id)
+    if item:
+        return document_response(item, if_none_match)
     raise HTTPException(status_code=404, detail="ModelRegistry not found")
 
 
+# Per-route latency, and the route tag on Cosmos request charges.
+if telemetry_enabled():
+    app.add_middleware(RouteMetricsMiddleware)
+
 # CORS setup (for local dev)
 app.add_middleware(
     CORSMiddleware,
@@ -250,6 +383,18 @@ app.add_middleware(
 #     return decorator
 
 
+@app.get("/cache/stats", response_class=JSONResponse)
+async def cache_stats(db: AsyncCosmosDBClient = Depends(get_async_db)) -> dict:
+    """
+    Read-through cache counters: entries, hits, misses, evictions and
+    invalidations, in total and per container.
+    """
+    cache = getattr(db, "cache", None)
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.snapshot()}
+
+
 @app.get("/health", response_class=JSONResponse)
 def health_check() -> dict:
     """
@@ -260,4 +405,19 @@ def health_check() -> dict:
     return {"status": "ok"}
 
 
+# Player-scoped, single-partition reads used by the player view.
+app.include_router(players_router)
+# Team aggregates for the coach dashboard.
+app.include_router(teams_router)
+# Injury-risk predictions from the active model.
+app.include_router(predict_router)
+# Model retraining jobs and their progress.
+app.include_router(jobs_router)
+# Batched season imports for sessions, cycle logs and metrics.
+app.include_router(bulk_router)
+# Streaming CSV, XLSX and Parquet exports for coaches.
+app.include_router(export_router)
+# Server-sent risk alerts for coach dashboards.
+app.include_router(alerts_router)
+
 # Future: include routers for sessions, cycle logs, metrics, etc.
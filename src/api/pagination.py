@@ -0,0 +1,143 @@
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, List, Optional
+
+from azure.cosmos.exceptions import CosmosHttpResponseError
+from fastapi import Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+
+from src.api.etags import etag_matches, list_etag, not_modified
+from src.api.queries import DateRange, build_query, parse_fields
+from src.services.cosmos import DEFAULT_PAGE_SIZE
+from src.services.cosmos_async import AsyncCosmosDBClient
+from src.services.serialization import dumps, dumps_documents, strip_system_fields
+
+# Response header carrying the Cosmos continuation token for the next page.
+CONTINUATION_HEADER = "X-Continuation-Token"
+
+# Upper bound on `limit` so a single page cannot pull a whole container.
+MAX_PAGE_SIZE = 1000
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+@dataclass
+class ListParams:
+    """Paging and projection options shared by every list endpoint."""
+
+    limit: Optional[int]
+    continuation: Optional[str]
+    stream: bool
+    if_none_match: Optional[str] = None
+    fields: Optional[List[str]] = None
+
+
+async def list_params(
+    limit: Optional[int] = Query(
+        None, ge=1, le=MAX_PAGE_SIZE, description="Maximum items per page."
+    ),
+    continuation: Optional[str] = Query(
+        None, description=f"Token from the {CONTINUATION_HEADER} header."
+    ),
+    stream: bool = Query(False, description="Stream every item as NDJSON."),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated fields to return, e.g. `date,rpe`."
+    ),
+    if_none_match: Optional[str] = Header(None),
+) -> ListParams:
+    """FastAPI dependency parsing the paging and projection query parameters.
+
+    Async so FastAPI resolves it on the event loop instead of the threadpool.
+    """
+    return ListParams(
+        limit=limit,
+        continuation=continuation,
+        stream=stream,
+        if_none_match=if_none_match,
+        fields=parse_fields(fields),
+    )
+
+
+class DocumentListResponse(Response):
+    """
+    JSON array response for lists of stored Cosmos documents.
+
+    Documents were validated against their model when written, so they are
+    encoded directly with orjson (minus Cosmos system properties) instead of
+    being re-validated against the route's `response_model` row by row.
+    The route's `response_model` still documents the schema.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps_documents(content)
+
+
+async def _ndjson_lines(items: AsyncIterator[dict]) -> AsyncIterator[bytes]:
+    """Serialize items one per line as they arrive from Cosmos."""
+    async for item in items:
+        yield dumps(strip_system_fields(item)) + b"\n"
+
+
+async def list_items(
+    db: AsyncCosmosDBClient,
+    container_name: str,
+    params: ListParams,
+    query: Optional[str] = None,
+    parameters: list = [],
+    partition_key: Optional[str] = None,
+    dates: Optional[DateRange] = None,
+) -> Response:
+    """
+    Run a list query in one of three modes.
+
+    - `stream=true`: an NDJSON response fed by a generator that pulls one
+      Cosmos page at a time, so server memory stays flat for any size.
+    - `limit` and/or `continuation` set: a single page, with the next page's
+      token returned in the `X-Continuation-Token` header.
+    - neither: the full result set, as before.
+
+    Non-streamed responses carry an ETag over the rows returned and answer
+    a matching `If-None-Match` with `304 Not Modified`.
+
+    Without a `query`, one is built from the container, `params.fields`
+    and `dates`; a caller passing its own query applies those itself.
+    Passing `partition_key` confines the query to a single partition.
+    """
+    if query is None:
+        query, parameters = build_query(container_name, params.fields, dates)
+    if params.stream:
+        page_size = params.limit or DEFAULT_PAGE_SIZE
+        items = db.iter_items(
+            container_name,
+            query,
+            parameters,
+            page_size=page_size,
+            partition_key=partition_key,
+        )
+        return StreamingResponse(_ndjson_lines(items), media_type=NDJSON_MEDIA_TYPE)
+    if params.limit is None and params.continuation is None:
+        items = await db.query_items(
+            container_name, query, parameters, partition_key=partition_key
+        )
+        token = None
+    else:
+        try:
+            items, token = await db.query_page(
+                container_name,
+                query,
+                parameters,
+                max_item_count=params.limit or DEFAULT_PAGE_SIZE,
+                continuation=params.continuation,
+                partition_key=partition_key,
+            )
+        except CosmosHttpResponseError as exc:
+            # Cosmos rejects a malformed or foreign continuation token with 400.
+            if exc.status_code != 400:
+                raise
+            raise HTTPException(status_code=400, detail="Invalid continuation token")
+    headers = {CONTINUATION_HEADER: token} if token else {}
+    headers["ETag"] = etag = list_etag(items, token)
+    if etag_matches(params.if_none_match, etag):
+        return not_modified(etag, headers)
+    return DocumentListResponse(items, headers=headers)
@@ -0,0 +1,170 @@
+"""
+Player-scoped read endpoints.
+
+Sessions, cycle logs, metrics and injuries are partitioned on `player_id`,
+so every query here is served by a single partition instead of fanning out
+across the container. `/dashboard` runs all four concurrently and returns
+them in one response together with a load summary.
+"""
+
+import asyncio
+from datetime import date, timedelta
+from itertools import chain
+from typing import List, Literal, Optional, Sequence, Tuple
+
+from fastapi import APIRouter, Depends, Header, Query, Response
+
+from src.api.etags import etag_matches, list_etag, not_modified
+from src.api.pagination import ListParams, list_items, list_params
+from src.api.queries import DateRange, build_query
+from src.ml.features import CHRONIC_DAYS, load_summary, week_start
+from src.models.models import CycleLog, Injury, Metric, PlayerDashboard, Session
+from src.services.cosmos_async import AsyncCosmosDBClient, get_async_db
+from src.services.serialization import dumps, strip_system_fields
+
+router = APIRouter(prefix="/players/{player_id}", tags=["players"])
+
+# Dashboard payload keys and the containers they are read from.
+DASHBOARD_CONTAINERS = {
+    "sessions": "sessions",
+    "metrics": "metrics",
+    "injuries": "injuries",
+    "cyclelogs": "cycleLogs",
+}
+
+
+def dashboard_window(today: date) -> DateRange:
+    """
+    Dates the dashboard shows as of `today`, newest first: the current week
+    and the four before it. That covers the chronic window and the RPE
+    trend of the load summary. It starts on a Monday, so the queries, and
+    their cache entries, stay the same for the whole week.
+    """
+    start = week_start(today) - timedelta(days=CHRONIC_DAYS)
+    return DateRange(start=start, end=None, order="desc")
+
+
+async def player_date_range(
+    start: Optional[date] = Query(None, alias="from", description="Inclusive."),
+    end: Optional[date] = Query(None, alias="to", description="Inclusive."),
+    order: Literal["asc", "desc"] = Query("desc", description="Sort by date."),
+) -> DateRange:
+    """FastAPI dependency parsing `from`, `to` and `order`; newest first."""
+    return DateRange(start=start, end=end, order=order)
+
+
+def build_player_query(
+    container_name: str,
+    player_id: str,
+    dates: DateRange,
+    fields: Optional[Sequence[str]] = None,
+) -> Tuple[str, List[dict]]:
+    """Compile a parameterized, single-partition query for one player."""
+    return build_query(
+        container_name,
+        fields,
+        dates,
+        where=["c.player_id = @player_id"],
+        parameters=[{"name": "@player_id", "value": player_id}],
+    )
+
+
+async def _list_for_player(
+    db: AsyncCosmosDBClient,
+    container_name: str,
+    player_id: str,
+    dates: DateRange,
+    params: ListParams,
+) -> Response:
+    query, parameters = build_player_query(
+        container_name, player_id, dates, params.fields
+    )
+    return await list_items(
+        db,
+        container_name,
+        params,
+        query=query,
+        parameters=parameters,
+        partition_key=player_id,
+    )
+
+
+@router.get("/sessions", response_model=list[Session])
+async def list_player_sessions(
+    player_id: str,
+    dates: DateRange = Depends(player_date_range),
+    params: ListParams = Depends(list_params),
+    db: AsyncCosmosDBClient = Depends(get_async_db),
+):
+    return await _list_for_player(db, "sessions", player_id, dates, params)
+
+
+@router.get("/cyclelogs", response_model=list[CycleLog])
+async def list_player_cyclelogs(
+    player_id: str,
+    dates: DateRange = Depends(player_date_range),
+    params: ListParams = Depends(list_params),
+    db: AsyncCosmosDBClient = Depends(get_async_db),
+):
+    return await _list_for_player(db, "cycleLogs", player_id, dates, params)
+
+
+@router.get("/metrics", response_model=list[Metric])
+async def list_player_metrics(
+    player_id: str,
+    dates: DateRange = Depends(player_date_range),
+    params: ListParams = Depends(list_params),
+    db: AsyncCosmosDBClient = Depends(get_async_db),
+):
+    return await _list_for_player(db, "metrics", player_id, dates, params)
+
+
+@router.get("/injuries", response_model=list[Injury])
+async def list_player_injuries(
+    player_id: str,
+    dates: DateRange = Depends(player_date_range),
+    params: ListParams = Depends(list_params),
+    db: AsyncCosmosDBClient = Depends(get_async_db),
+):
+    return await _list_for_player(db, "injuries", player_id, dates, params)
+
+
+@router.get("/dashboard", response_model=PlayerDashboard)
+async def get_player_dashboard(
+    player_id: str,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncCosmosDBClient = Depends(get_async_db),
+):
+    """
+    Everything the player dashboard shows, in one round trip: sessions,
+    metrics, injuries and cycle logs in `dashboard_window` (newest first),
+    plus last-7-day load, current ACWR and the weekly RPE trend as of today.
+    The list routes serve older history.
+    """
+    today = date.today()
+    window = dashboard_window(today)
+
+    async def load(container_name: str) -> List[dict]:
+        query, parameters = build_player_query(container_name, player_id, window)
+        return await db.query_items(
+            container_name, query, parameters, partition_key=player_id
+        )
+
+    rows = await asyncio.gather(*map(load, DASHBOARD_CONTAINERS.values()))
+    data = dict(zip(DASHBOARD_CONTAINERS, rows))
+    # The summary also moves with the date, so it is part of the ETag.
+    etag = list_etag(chain.from_iterable(rows), today.isoformat())
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    payload = {
+        "player_id": player_id,
+        "as_of": today.isoformat(),
+        "summary": load_summary(data["sessions"], today),
+        **{
+            key: [strip_system_fields(document) for document in documents]
+            for key, documents in data.items()
+        },
+    }
+    return Response(
+        dumps(payload), media_type="application/json", headers={"ETag": etag}
+    )
@@ -0,0 +1,56 @@
+"""
+Injury-risk predictions from the active model.
+
+Features are each player's current loads (see `src.ml.features`), computed
+from their recent sessions as for the team summary. Rows from concurrent
+requests are batched into shared model calls by the inference service.
+"""
+
+from datetime import date
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+
+from src.api.teams import recent_sessions
+from src.ml.features import RISK_FEATURES, current_loads
+from src.ml.inference import InferenceService, ModelUnavailable
+from src.models.models import PredictRequest, PredictResponse
+from src.services.cosmos_async import AsyncCosmosDBClient, get_async_db
+
+router = APIRouter(tags=["inference"])
+
+
+async def get_inference(request: Request) -> InferenceService:
+    """FastAPI dependency returning the service started by the lifespan."""
+    service = getattr(request.app.state, "inference", None)
+    if service is None:
+        raise HTTPException(status_code=503, detail="Inference is disabled")
+    return service
+
+
+@router.post("/predict", response_model=PredictResponse)
+async def predict(
+    body: PredictRequest,
+    service: InferenceService = Depends(get_inference),
+    db: AsyncCosmosDBClient = Depends(get_async_db),
+):
+    """Current injury-risk probability for each player."""
+    player_ids: List[str] = list(dict.fromkeys(body.player_ids))
+    today = date.today()
+    loads = current_loads(
+        await recent_sessions(db, player_ids, today), player_ids, today
+    )
+    features = loads[RISK_FEATURES].to_numpy(dtype="float32")
+    try:
+        model, risks = await service.predict(features)
+    except ModelUnavailable as exc:
+        raise HTTPException(status_code=503, detail=str(exc))
+    return {
+        "model_name": model.model_name,
+        "version": model.version,
+        "as_of": today,
+        "predictions": [
+            {"player_id": player_id, "risk": round(float(risk), 4)}
+            for player_id, risk in zip(player_ids, risks)
+        ],
+    }
@@ -0,0 +1,142 @@
+"""
+Field projections and date filters for list queries.
+
+List routes accept `fields=` (comma-separated) and `from=`/`to=`, which
+compile into one parameterized Cosmos query such as
+
+    SELECT c.date, c.rpe, c._etag FROM c WHERE c.date BETWEEN @from AND @to
+
+Field names never reach the query from the request as-is: each must be a
+field of the container's model, so `fields=` cannot inject SQL. Dates are
+always passed as parameters. A projection returns smaller documents, so it
+costs fewer RUs and less bandwidth than `SELECT *`. `_etag` is always
+selected, so list ETags still track document versions; like every system
+property it is dropped from responses.
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, FrozenSet, List, Literal, Optional, Sequence, Tuple, Type
+
+from fastapi import HTTPException, Query
+from pydantic import BaseModel
+
+from src.models.models import (
+    CycleLog,
+    Injury,
+    Metric,
+    ModelRegistry,
+    Player,
+    Session,
+    Team,
+)
+
+# Model of the documents in each listable container.
+CONTAINER_MODELS: Dict[str, Type[BaseModel]] = {
+    "players": Player,
+    "teams": Team,
+    "sessions": Session,
+    "cycleLogs": CycleLog,
+    "metrics": Metric,
+    "injuries": Injury,
+    "modelRegistry": ModelRegistry,
+}
+
+# The only names `fields=` accepts, per container.
+FIELD_WHITELISTS: Dict[str, FrozenSet[str]] = {
+    name: frozenset(model.model_fields) for name, model in CONTAINER_MODELS.items()
+}
+
+# Date field used for range filters and ordering in each container.
+DATE_FIELDS = {
+    "sessions": "date",
+    "cycleLogs": "period_start",
+    "metrics": "week",
+    "injuries": "date",
+    "modelRegistry": "trained_at",
+}
+
+
+@dataclass
+class DateRange:
+    """Optional inclusive date range and sort order for a list query."""
+
+    start: Optional[date]
+    end: Optional[date]
+    order: Optional[Literal["asc", "desc"]] = None
+
+
+async def date_range(
+    start: Optional[date] = Query(None, alias="from", description="Inclusive."),
+    end: Optional[date] = Query(None, alias="to", description="Inclusive."),
+    order: Optional[Literal["asc", "desc"]] = Query(
+        None, description="Sort by date; unsorted by default."
+    ),
+) -> DateRange:
+    """FastAPI dependency parsing `from`, `to` and `order`."""
+    return DateRange(start=start, end=end, order=order)
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Split a `fields=` value; None when it names no field."""
+    if fields is None:
+        return None
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    return names or None
+
+
+def projection(container_name: str, fields: Optional[Sequence[str]]) -> str:
+    """
+    The SELECT list for `fields`, or `*` for whole documents.
+
+    Raises a 400 naming the allowed fields when a field is not in the
+    container's whitelist.
+    """
+    if not fields:
+        return "*"
+    allowed = FIELD_WHITELISTS[container_name]
+    unknown = [name for name in fields if name not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown field(s) for {container_name}: {', '.join(unknown)}."
+            f" Allowed: {', '.join(sorted(allowed))}",
+        )
+    return ", ".join(f"c.{name}" for name in dict.fromkeys([*fields, "_etag"]))
+
+
+def build_query(
+    container_name: str,
+    fields: Optional[Sequence[str]] = None,
+    dates: Optional[DateRange] = None,
+    where: Sequence[str] = (),
+    parameters: Sequence[dict] = (),
+) -> Tuple[str, List[dict]]:
+    """
+    Compile a parameterized list query.
+
+    `where` and `parameters` carry the caller's own conditions, e.g. a
+    partition filter; the date range is ANDed onto them. Dates are stored
+    as ISO strings, so string comparison orders them chronologically.
+    """
+    clauses = list(where)
+    params = list(parameters)
+    order = ""
+    if dates is not None:
+        field = DATE_FIELDS[container_name]
+        if dates.start is not None and dates.end is not None:
+            clauses.append(f"c.{field} BETWEEN @from AND @to")
+        elif dates.start is not None:
+            clauses.append(f"c.{field} >= @from")
+        elif dates.end is not None:
+            clauses.append(f"c.{field} <= @to")
+        if dates.start is not None:
+            params.append({"name": "@from", "value": dates.start.isoformat()})
+        if dates.end is not None:
+            params.append({"name": "@to", "value": dates.end.isoformat()})
+        if dates.order is not None:
+            order = f" ORDER BY c.{field} {dates.order.upper()}"
+    query = f"SELECT {projection(container_name, fields)} FROM c"
+    if clauses:
+        query += f" WHERE {' AND '.join(clauses)}"
+    return query + order, params
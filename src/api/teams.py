@@ -0,0 +1,117 @@
+"""
+Team-level aggregates for the coach dashboard.
+
+A team lists its players in `player_ids`; each player's sessions live in
+their own partition. `/summary` reads those partitions concurrently and
+computes every player's load, ACWR and risk status in one vectorized pass.
+"""
+
+import asyncio
+from datetime import date, timedelta
+from itertools import chain
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+
+from src.api.etags import etag_matches, list_etag, not_modified
+from src.api.players import build_player_query
+from src.api.queries import DateRange
+from src.ml.features import CHRONIC_DAYS, current_loads, week_start
+from src.models.models import TeamSummary
+from src.services.cache import query_window
+from src.services.cosmos_async import AsyncCosmosDBClient, get_async_db
+from src.services.serialization import dumps
+
+router = APIRouter(prefix="/teams/{team_id}", tags=["teams"])
+
+# Player partitions read at once; bounds load on the connection pool.
+MAX_CONCURRENT_PLAYERS = 16
+
+# The only session fields `current_loads` reads; comments and the like
+# are not worth the RUs.
+LOAD_FIELDS = ("player_id", "date", "duration", "rpe")
+
+
+def session_window(today: date) -> DateRange:
+    """
+    Sessions read for a summary as of `today`.
+
+    The window starts four weeks before the current Monday rather than 28
+    days before today, so the query stays the same for the whole week and
+    is cached with `query_window` until then; only a write to the player's
+    partition invalidates it. Older sessions are ignored by `current_loads`.
+    """
+    start = week_start(today) - timedelta(days=CHRONIC_DAYS)
+    return DateRange(start=start, end=None, order="asc")
+
+
+async def recent_sessions(
+    db: AsyncCosmosDBClient, player_ids: List[str], today: date
+) -> List[dict]:
+    """Sessions of `player_ids` in `session_window(today)`, read concurrently."""
+    window = session_window(today)
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_PLAYERS)
+
+    async def load(player_id: str) -> List[dict]:
+        query, parameters = build_player_query(
+            "sessions", player_id, window, LOAD_FIELDS
+        )
+        async with semaphore:
+            return await query_window(
+                db, "sessions", query, parameters, partition_key=player_id
+            )
+
+    loaded = await asyncio.gather(*map(load, player_ids))
+    return list(chain.from_iterable(loaded))
+
+
+@router.get("/summary", response_model=TeamSummary)
+async def get_team_summary(
+    team_id: str,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncCosmosDBClient = Depends(get_async_db),
+):
+    """
+    Last-7-day load, chronic load, ACWR and Red/Yellow/Green risk status
+    for every player in the team, as of today.
+    """
+    team = await db.get_item("teams", team_id)
+    if not team:
+        raise HTTPException(status_code=404, detail="Team not found")
+    player_ids: List[str] = list(dict.fromkeys(team.get("player_ids", [])))
+    today = date.today()
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_PLAYERS)
+
+    async def load_player(player_id: str) -> Optional[dict]:
+        async with semaphore:
+            return await db.get_item("players", player_id)
+
+    players, rows = await asyncio.gather(
+        asyncio.gather(*map(load_player, player_ids)),
+        recent_sessions(db, player_ids, today),
+    )
+    profiles = [player for player in players if player]
+    # The statuses also move with the date, so it is part of the ETag.
+    etag = list_etag([team, *profiles, *rows], today.isoformat())
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    loads = current_loads(rows, player_ids, today)
+    by_id = {player["id"]: player for player in profiles}
+    loads["name"] = [by_id.get(pid, {}).get("name") for pid in player_ids]
+    loads["role"] = [by_id.get(pid, {}).get("role") for pid in player_ids]
+    risk = loads["risk"].value_counts()
+    payload = {
+        "team_id": team_id,
+        "name": team["name"],
+        "as_of": today.isoformat(),
+        "average_load": (
+            round(float(loads["last_7_days_load"].mean()), 1) if player_ids else 0.0
+        ),
+        "red_flags": int(risk.get("Red", 0)),
+        "yellow_flags": int(risk.get("Yellow", 0)),
+        "players": loads.to_dict("records"),
+    }
+    return Response(
+        dumps(payload), media_type="application/json", headers={"ETag": etag}
+    )
@@ -0,0 +1,81 @@
+"""
+Internal metrics: per-route latency and Cosmos request charges.
+
+`RouteMetricsMiddleware` times every HTTP request by the route template it
+matched, so `/players/{player_id}` is one series however many players
+there are. It also makes the request's scope available to the Cosmos
+telemetry, which tags each call's RU charge with the route. It is a plain
+ASGI middleware: `BaseHTTPMiddleware` would add a task per request and
+hide the endpoint's context variables.
+
+`GET /metrics/internal` serves everything in the Prometheus text format;
+`GET /metrics/internal/slow` lists the most recent slow Cosmos calls.
+"""
+
+import time
+from typing import Any, Awaitable, Callable, Dict, MutableMapping, Optional
+
+from fastapi import APIRouter, Response
+
+from src.services.telemetry import (
+    Telemetry,
+    current_scope,
+    get_telemetry,
+    route_of,
+)
+
+Scope = MutableMapping[str, Any]
+Message = MutableMapping[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+router = APIRouter(prefix="/metrics/internal", tags=["telemetry"])
+
+
+class RouteMetricsMiddleware:
+    def __init__(self, app: Any, telemetry: Optional[Telemetry] = None):
+        self.app = app
+        self.telemetry = telemetry or get_telemetry()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+
+        async def send_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        token = current_scope.set(scope)  # type: ignore[arg-type]
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_status)
+        finally:
+            current_scope.reset(token)
+            self.telemetry.observe_request(
+                scope["method"],
+                route_of(scope),  # type: ignore[arg-type]
+                status,
+                time.perf_counter() - started,
+            )
+
+
+@router.get("", response_class=Response)
+async def metrics() -> Response:
+    """Route latency histograms and Cosmos call metrics for Prometheus."""
+    return Response(get_telemetry().exposition(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@router.get("/slow")
+async def slow_calls() -> Dict[str, Any]:
+    """The most recent Cosmos calls over the slow-query threshold, newest first."""
+    telemetry = get_telemetry()
+    return {
+        "threshold_ms": telemetry.slow_query_seconds * 1000,
+        "calls": list(reversed(telemetry.slow)),
+    }
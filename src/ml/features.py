@@ -1 +1,450 @@
-# Features engineering placeholder
+"""
+Acute:chronic workload ratio (ACWR) feature engine.
+
+Session load is `rpe x duration` (session-RPE). Acute load covers the last
+7 days and chronic load the last 28, either as rolling averages or as
+exponentially weighted moving averages (EWMA, decay `2 / (N + 1)`).
+
+Two modes share these definitions:
+
+- `weekly_acwr` / `weekly_metrics` compute whole squads at once. Sessions
+  are binned into a dense players x days matrix, and the windows come out
+  of cumulative sums (rolling) or a column-wise pandas EWMA.
+- `PlayerLoadState` keeps one player's windows up to date in O(1) as each
+  new session is written, and `LoadTracker` holds a state per player.
+
+`load_summary` uses the incremental state for one player's windows as of
+today, for the dashboard; `current_loads` computes the same windows for a
+whole squad in one vectorized pass and rates each player's injury risk.
+`wellness_status` rates a player's latest cycle log on the same
+Red/Yellow/Green scale.
+
+Both emit `Metric` documents for the week starting on each Monday: `acute`
+is the week's load, `chronic` the average weekly load over four weeks and
+`acwr` their ratio. Ids are derived from player and week, so recomputing a
+week upserts the same document.
+"""
+
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Dict, Iterable, List, Literal, Optional, Tuple, Union
+
+from src.services.routing import ID_SEPARATOR
+
+if TYPE_CHECKING:
+    # Imported where used: pandas costs about 0.4 s and numpy 0.2 s, which
+    # the API should not pay at startup.
+    import numpy as np
+    import pandas as pd
+
+ACUTE_DAYS = 7
+CHRONIC_DAYS = 28
+
+# EWMA decay for an N-day window, as used for ACWR by Williams et al. (2017).
+ACUTE_DECAY = 2 / (ACUTE_DAYS + 1)
+CHRONIC_DECAY = 2 / (CHRONIC_DAYS + 1)
+
+# Namespace for deterministic metric ids (one per player and week).
+METRIC_NAMESPACE = uuid.UUID("5c1f4e0a-8d3b-4a57-9a0e-6a2f3b7c9d10")
+
+# ACWR above which a player is flagged Red or Yellow; Green otherwise.
+RISK_RED_ACWR = 1.4
+RISK_YELLOW_ACWR = 1.2
+
+# Cycle-log scores (1-10, higher is better) at or below which a player is
+# flagged Red or Yellow. Soreness runs the other way and is inverted first.
+# Both sit below the form's default of 5, so an untouched log is Green.
+WELLNESS_SCORES = ("wellness", "sleep", "mood", "soreness")
+WELLNESS_RED_SCORE = 3
+WELLNESS_YELLOW_SCORE = 4
+
+# Ranks of the risk statuses, for taking the worst of several.
+RISK_LEVELS = {"Green": 0, "Yellow": 1, "Red": 2}
+
+# Injury-risk model inputs, in order: columns of `current_loads`.
+RISK_FEATURES = ["last_7_days_load", "chronic_load", "acwr"]
+
+# Weeks of average RPE in a dashboard summary's trend.
+RPE_TREND_WEEKS = 4
+
+Method = Literal["rolling", "ewma"]
+Sessions = Union["pd.DataFrame", Iterable[dict]]
+
+
+def metric_id(player_id: str, week: date) -> str:
+    """Partition-qualified id of a player's metric for `week`."""
+    suffix = uuid.uuid5(METRIC_NAMESPACE, f"{player_id}/{week.isoformat()}")
+    return f"{player_id}{ID_SEPARATOR}{suffix}"
+
+
+def week_start(day: date) -> date:
+    """Monday of the week containing `day`."""
+    return day - timedelta(days=day.weekday())
+
+
+def acwr_ratio(acute: float, chronic: float) -> float:
+    return round(acute / chronic, 3) if chronic else 0.0
+
+
+def session_loads(sessions: Sessions) -> "pd.DataFrame":
+    """Return `player_id`, `date` and `load` (rpe x duration) per session."""
+    import numpy as np
+    import pandas as pd
+
+    frame = (
+        sessions
+        if isinstance(sessions, pd.DataFrame)
+        else pd.DataFrame.from_records(
+            sessions, columns=["player_id", "date", "rpe", "duration"]
+        )
+    )
+    return pd.DataFrame(
+        {
+            "player_id": frame["player_id"].to_numpy(),
+            "date": pd.to_datetime(frame["date"]).to_numpy(dtype="datetime64[D]"),
+            "load": frame["rpe"].to_numpy(dtype=np.float64)
+            * frame["duration"].to_numpy(dtype=np.float64),
+        }
+    )
+
+
+def weekly_acwr(
+    sessions: Sessions, method: Method = "rolling", until: Optional[date] = None
+) -> "pd.DataFrame":
+    """
+    Compute weekly acute, chronic and ACWR for every player in `sessions`.
+
+    Returns one row per player and week, from each player's first to last
+    week with a session (or to the week containing `until`, if later), with
+    columns `player_id`, `week`, `acute`, `chronic` and `acwr`.
+    """
+    import numpy as np
+    import pandas as pd
+
+    loads = session_loads(sessions)
+    columns = ["player_id", "week", "acute", "chronic", "acwr"]
+    if loads.empty:
+        return pd.DataFrame(columns=columns)
+
+    codes, players = pd.factorize(loads["player_id"])
+    days = loads["date"].to_numpy().astype("datetime64[D]")
+    # Align the grid to a Monday so every 7th column closes a week.
+    first = days.min()
+    start = first - (first.astype(np.int64) + 3) % 7  # 1970-01-01 was a Thursday
+    day_index = (days - start).astype(np.int64)
+    last_day = int(day_index.max())
+    if until is not None:
+        last_day = max(last_day, int((np.datetime64(until, "D") - start).astype(int)))
+    n_days = (last_day // 7 + 1) * 7
+    daily = np.bincount(
+        codes * n_days + day_index,
+        weights=loads["load"].to_numpy(),
+        minlength=len(players) * n_days,
+    ).reshape(len(players), n_days)
+
+    sundays = np.arange(6, n_days, 7)
+    if method == "rolling":
+        totals = np.zeros((len(players), n_days + 1))
+        np.cumsum(daily, axis=1, out=totals[:, 1:])
+        ends = sundays + 1
+        acute = totals[:, ends] - totals[:, np.maximum(ends - ACUTE_DAYS, 0)]
+        chronic = (totals[:, ends] - totals[:, np.maximum(ends - CHRONIC_DAYS, 0)]) / (
+            CHRONIC_DAYS / ACUTE_DAYS
+        )
+    elif method == "ewma":
+        # A leading rest day starts every EWMA from zero, as the
+        # incremental state does.
+        by_day = pd.DataFrame(np.hstack([np.zeros((len(players), 1)), daily]).T)
+        acute = by_day.ewm(alpha=ACUTE_DECAY, adjust=False).mean().to_numpy().T
+        chronic = by_day.ewm(alpha=CHRONIC_DECAY, adjust=False).mean().to_numpy().T
+        acute = acute[:, sundays + 1] * ACUTE_DAYS
+        chronic = chronic[:, sundays + 1] * ACUTE_DAYS
+    else:
+        raise ValueError(f"Unknown ACWR method: {method}")
+
+    ratio = np.divide(acute, chronic, out=np.zeros_like(acute), where=chronic > 0)
+
+    # Keep each player's weeks between their first and last session.
+    week_of = pd.Series(day_index // 7).groupby(codes)
+    first_week = week_of.min().to_numpy()[:, None]
+    last_week = week_of.max().to_numpy()[:, None]
+    if until is not None:
+        last_week = np.maximum(last_week, last_day // 7)
+    weeks = np.arange(len(sundays))
+    mask = (weeks >= first_week) & (weeks <= last_week)
+    player_index, week_index = np.nonzero(mask)
+
+    return pd.DataFrame(
+        {
+            "player_id": players[player_index],
+            "week": start + (week_index * 7).astype("timedelta64[D]"),
+            "acute": np.rint(acute[mask]).astype(np.int64),
+            "chronic": np.rint(chronic[mask]).astype(np.int64),
+            "acwr": np.round(ratio[mask], 3),
+        },
+        columns=columns,
+    )
+
+
+def weekly_metrics(
+    sessions: Sessions, method: Method = "rolling", until: Optional[date] = None
+) -> List[dict]:
+    """Build JSON-ready `Metric` documents for every player and week."""
+    frame = weekly_acwr(sessions, method, until)
+    weeks = [week.isoformat() for week in frame["week"].dt.date]
+    return [
+        {
+            "id": metric_id(player_id, date.fromisoformat(week)),
+            "player_id": player_id,
+            "week": week,
+            "acute": acute,
+            "chronic": chronic,
+            "acwr": acwr,
+        }
+        for player_id, week, acute, chronic, acwr in zip(
+            frame["player_id"].tolist(),
+            weeks,
+            frame["acute"].tolist(),
+            frame["chronic"].tolist(),
+            frame["acwr"].tolist(),
+        )
+    ]
+
+
+@dataclass
+class PlayerLoadState:
+    """
+    Rolling and EWMA windows for one player, updated in O(1) per session.
+
+    Daily loads for the last 28 days live in a ring buffer indexed by day
+    ordinal, with running 7- and 28-day sums beside it. Moving forward in
+    time evicts at most 28 slots, and a late session only touches its own
+    slot and the sums, so each update does a bounded amount of work.
+    """
+
+    day: Optional[date] = None
+    buffer: List[float] = field(default_factory=lambda: [0.0] * CHRONIC_DAYS)
+    acute_sum: float = 0.0
+    chronic_sum: float = 0.0
+    # EWMAs as of the end of the previous day; today's load is in `buffer`.
+    acute_ewma: float = 0.0
+    chronic_ewma: float = 0.0
+
+    def _slot(self, day: date) -> int:
+        return day.toordinal() % CHRONIC_DAYS
+
+    def _advance(self, day: date) -> None:
+        """Move the current day forward to `day`, decaying the windows."""
+        assert self.day is not None
+        gap = (day - self.day).days
+        today = self.buffer[self._slot(self.day)]
+        self.acute_ewma = ACUTE_DECAY * today + (1 - ACUTE_DECAY) * self.acute_ewma
+        self.chronic_ewma = (
+            CHRONIC_DECAY * today + (1 - CHRONIC_DECAY) * self.chronic_ewma
+        )
+        self.acute_ewma *= (1 - ACUTE_DECAY) ** (gap - 1)
+        self.chronic_ewma *= (1 - CHRONIC_DECAY) ** (gap - 1)
+        if gap >= CHRONIC_DAYS:
+            self.buffer = [0.0] * CHRONIC_DAYS
+            self.acute_sum = self.chronic_sum = 0.0
+        else:
+            for step in range(1, gap + 1):
+                current = self.day + timedelta(days=step)
+                leaving_acute = self.buffer[self._slot(current - timedelta(ACUTE_DAYS))]
+                self.acute_sum -= leaving_acute
+                self.chronic_sum -= self.buffer[self._slot(current)]
+                self.buffer[self._slot(current)] = 0.0
+        self.day = day
+
+    def add(self, day: date, load: float) -> None:
+        """Record a session of `load` on `day`."""
+        if self.day is None:
+            self.day = day
+        elif day > self.day:
+            self._advance(day)
+        age = (self.day - day).days
+        if age > 0:
+            # A late session: its share has decayed through `age` days,
+            # the first of which is applied when today's load is folded in.
+            self.acute_ewma += ACUTE_DECAY * load * (1 - ACUTE_DECAY) ** (age - 1)
+            self.chronic_ewma += CHRONIC_DECAY * load * (1 - CHRONIC_DECAY) ** (age - 1)
+        if age < CHRONIC_DAYS:
+            self.buffer[self._slot(day)] += load
+            self.chronic_sum += load
+            if age < ACUTE_DAYS:
+                self.acute_sum += load
+
+    def windows(self, method: Method = "rolling") -> Tuple[float, float]:
+        """Acute weekly load and chronic average weekly load."""
+        if method == "rolling":
+            return self.acute_sum, self.chronic_sum / (CHRONIC_DAYS / ACUTE_DAYS)
+        if method == "ewma":
+            today = self.buffer[self._slot(self.day)] if self.day else 0.0
+            acute = ACUTE_DECAY * today + (1 - ACUTE_DECAY) * self.acute_ewma
+            chronic = CHRONIC_DECAY * today + (1 - CHRONIC_DECAY) * self.chronic_ewma
+            return acute * ACUTE_DAYS, chronic * ACUTE_DAYS
+        raise ValueError(f"Unknown ACWR method: {method}")
+
+    def acwr(self, method: Method = "rolling") -> float:
+        return acwr_ratio(*self.windows(method))
+
+    def metric(self, player_id: str, method: Method = "rolling") -> dict:
+        """
+        `Metric` document for the current week, with windows as of the most
+        recent session day.
+        """
+        if self.day is None:
+            raise ValueError("No sessions recorded")
+        week = week_start(self.day)
+        acute, chronic = self.windows(method)
+        return {
+            "id": metric_id(player_id, week),
+            "player_id": player_id,
+            "week": week.isoformat(),
+            "acute": round(acute),
+            "chronic": round(chronic),
+            "acwr": acwr_ratio(acute, chronic),
+        }
+
+
+class LoadTracker:
+    """Incremental ACWR state for every player seen so far."""
+
+    def __init__(self, method: Method = "rolling"):
+        self.method = method
+        self.states: Dict[str, PlayerLoadState] = {}
+
+    def observe(self, session: dict) -> dict:
+        """
+        Fold a written `Session` document into its player's state and
+        return the player's updated `Metric` document.
+        """
+        player_id = session["player_id"]
+        day = session["date"]
+        if isinstance(day, str):
+            day = date.fromisoformat(day)
+        state = self.states.setdefault(player_id, PlayerLoadState())
+        state.add(day, session["rpe"] * session["duration"])
+        return state.metric(player_id, self.method)
+
+
+def load_summary(
+    sessions: Iterable[dict], today: date, method: Method = "rolling"
+) -> dict:
+    """
+    Summarize one player's sessions as of `today`: load over the last 7
+    days, chronic weekly load, current ACWR and average RPE per week for
+    the last `RPE_TREND_WEEKS` weeks (None for weeks without sessions).
+    Sessions dated after `today` are ignored.
+    """
+    rows = sorted(
+        (
+            date.fromisoformat(s["date"]) if isinstance(s["date"], str) else s["date"],
+            s["rpe"],
+            s["rpe"] * s["duration"],
+        )
+        for s in sessions
+    )
+    state = PlayerLoadState()
+    first_week = week_start(today) - timedelta(weeks=RPE_TREND_WEEKS - 1)
+    rpe: Dict[date, List[int]] = {
+        first_week + timedelta(weeks=i): [] for i in range(RPE_TREND_WEEKS)
+    }
+    for day, session_rpe, load in rows:
+        if day > today:
+            break
+        state.add(day, load)
+        if day >= first_week:
+            rpe[week_start(day)].append(session_rpe)
+    if state.day is not None:
+        # Age the windows to today, so rest days since the last session count.
+        state.add(today, 0.0)
+    acute, chronic = state.windows(method)
+    return {
+        "last_7_days_load": round(acute),
+        "chronic_load": round(chronic),
+        "acwr": acwr_ratio(acute, chronic),
+        "rpe_trend": [
+            {
+                "week": week.isoformat(),
+                "rpe": round(sum(values) / len(values), 2) if values else None,
+            }
+            for week, values in rpe.items()
+        ],
+    }
+
+
+def risk_status(acwr: "np.ndarray") -> "np.ndarray":
+    """Red, Yellow or Green per ACWR value."""
+    import numpy as np
+
+    return np.select(
+        [acwr > RISK_RED_ACWR, acwr > RISK_YELLOW_ACWR], ["Red", "Yellow"], "Green"
+    )
+
+
+def wellness_scores(cycle_log: dict) -> Dict[str, int]:
+    """A cycle log's scores on one scale, where lower is worse."""
+    scores = {name: cycle_log[name] for name in WELLNESS_SCORES if name in cycle_log}
+    if "soreness" in scores:
+        scores["soreness"] = 11 - scores["soreness"]
+    return scores
+
+
+def wellness_status(cycle_log: Optional[dict]) -> str:
+    """Red, Yellow or Green for a cycle log's lowest score; Green without one."""
+    lowest = min(wellness_scores(cycle_log or {}).values(), default=10)
+    if lowest <= WELLNESS_RED_SCORE:
+        return "Red"
+    if lowest <= WELLNESS_YELLOW_SCORE:
+        return "Yellow"
+    return "Green"
+
+
+def worst_status(*statuses: str) -> str:
+    return max(statuses, key=RISK_LEVELS.__getitem__)
+
+
+def current_loads(
+    sessions: Iterable[dict], player_ids: List[str], today: date
+) -> "pd.DataFrame":
+    """
+    Rolling windows as of `today` for every player in `player_ids`.
+
+    Returns one row per player, in the order given and including players
+    without sessions, with columns `player_id`, `last_7_days_load`,
+    `chronic_load`, `acwr` and `risk`. Sessions of other players, or outside
+    the last 28 days, are ignored.
+    """
+    import numpy as np
+    import pandas as pd
+
+    players = list(dict.fromkeys(player_ids))
+    index = {player_id: i for i, player_id in enumerate(players)}
+    rows = [
+        (index.get(s["player_id"], -1), str(s["date"]), s["rpe"] * s["duration"])
+        for s in sessions
+    ]
+    codes = np.array([row[0] for row in rows], dtype=np.int64)
+    days = np.array([row[1] for row in rows], dtype="datetime64[D]")
+    load = np.array([row[2] for row in rows], dtype=np.float64)
+    age = (np.datetime64(today, "D") - days).astype(np.int64)
+    keep = (codes >= 0) & (age >= 0) & (age < CHRONIC_DAYS)
+    codes, age, load = codes[keep], age[keep], load[keep]
+    acute = np.bincount(
+        codes, weights=np.where(age < ACUTE_DAYS, load, 0.0), minlength=len(players)
+    )
+    chronic = np.bincount(codes, weights=load, minlength=len(players)) / (
+        CHRONIC_DAYS / ACUTE_DAYS
+    )
+    ratio = np.divide(acute, chronic, out=np.zeros(len(players)), where=chronic > 0)
+    return pd.DataFrame(
+        {
+            "player_id": players,
+            "last_7_days_load": np.rint(acute).astype(np.int64),
+            "chronic_load": np.rint(chronic).astype(np.int64),
+            "acwr": np.round(ratio, 3),
+            "risk": risk_status(ratio),
+        }
+    )
@@ -1 +1,302 @@
-# Inference placeholder
+"""
+Injury-risk inference: one model per process, micro-batched requests and
+hot reload from the model registry.
+
+`InferenceService` loads the active `ModelRegistry` entry's Keras model
+once, in a worker thread, and keeps a reference to it. Concurrent
+`predict` calls are queued and merged by `MicroBatcher` into one model
+call of up to `max_batch_size` rows, waiting at most `max_wait` seconds
+for a batch to fill. A single batched call costs little more than a
+one-row call, so throughput grows with load instead of queueing behind
+per-request model calls.
+
+A watcher polls the registry. When another entry becomes active, the new
+model is loaded beside the old one and the reference is swapped in a
+single assignment. Batches already running finish on the model they
+started with, so no request is dropped. Each loaded model owns a temporary
+directory for its downloaded artifact, removed once the model is
+replaced. TensorFlow is imported only when a model is loaded.
+
+Settings:
+- `CONFIGURATION__INFERENCE__ENABLED` (default true)
+- `CONFIGURATION__INFERENCE__MODELNAME` (default `injury_risk`)
+- `CONFIGURATION__INFERENCE__MAXBATCHSIZE`, `CONFIGURATION__INFERENCE__MAXWAITMS`
+- `CONFIGURATION__INFERENCE__RELOADSECONDS`
+"""
+
+import asyncio
+import logging
+import os
+import posixpath
+import tempfile
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from dotenv import load_dotenv
+
+if TYPE_CHECKING:
+    # Imported where used, like pandas in `src.ml.features`.
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_NAME = "injury_risk"
+DEFAULT_MAX_BATCH_SIZE = 64
+DEFAULT_MAX_WAIT_MS = 5.0
+DEFAULT_RELOAD_SECONDS = 30.0
+
+# Newest active entry first; `_ts` orders entries trained on the same day.
+ACTIVE_MODEL_QUERY = "SELECT * FROM c WHERE c.status = @status ORDER BY c._ts DESC"
+
+Predict = Callable[["np.ndarray"], "np.ndarray"]
+
+# Loads an artifact URI into a predict callable; the second argument is a
+# directory to download to, owned by the loaded model.
+Loader = Callable[[str, str], Predict]
+
+
+class ModelUnavailable(RuntimeError):
+    """No active model has been loaded yet."""
+
+
+@dataclass(frozen=True)
+class LoadedModel:
+    """A loaded model and the registry entry it came from."""
+
+    record_id: str
+    model_name: str
+    version: str
+    artifact: str
+    predict: Predict
+    workdir: Optional[tempfile.TemporaryDirectory] = field(
+        default=None, compare=False, repr=False
+    )
+
+    def close(self) -> None:
+        """Remove the downloaded artifact."""
+        if self.workdir is not None:
+            self.workdir.cleanup()
+
+
+def inference_enabled() -> bool:
+    load_dotenv()
+    return os.getenv("CONFIGURATION__INFERENCE__ENABLED", "true").lower() == "true"
+
+
+def fetch_artifact(uri: str, directory: str) -> str:
+    """
+    Return a local path for `uri`, downloading it from Blob Storage into
+    `directory` if needed.
+    """
+    parts = urlsplit(uri)
+    if parts.scheme not in ("http", "https"):
+        return uri
+    from azure.identity import DefaultAzureCredential
+    from azure.storage.blob import BlobClient
+
+    blob = BlobClient.from_blob_url(uri, credential=DefaultAzureCredential())
+    path = os.path.join(directory, posixpath.basename(parts.path))
+    with open(path, "wb") as f:
+        blob.download_blob().readinto(f)
+    return path
+
+
+def load_keras_model(uri: str, directory: str) -> Predict:
+    """Load a saved Keras model; the returned callable maps rows to risks."""
+    import numpy as np
+    import tensorflow as tf
+
+    model = tf.keras.models.load_model(fetch_artifact(uri, directory), compile=False)
+
+    def predict(features: "np.ndarray") -> "np.ndarray":
+        # A direct call avoids `Model.predict`'s per-call dataset setup.
+        return np.asarray(model(features, training=False)).reshape(-1)
+
+    return predict
+
+
+class MicroBatcher:
+    """
+    Merges concurrent requests into batched model calls.
+
+    Each request is a block of feature rows. The batch loop takes the first
+    waiting request, then keeps taking more until `max_batch_size` rows are
+    collected or `max_wait` seconds have passed, and runs the model once
+    on all of them in a worker thread. A request is never split, so one
+    larger than `max_batch_size` runs on its own.
+    """
+
+    def __init__(
+        self,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_wait: float = DEFAULT_MAX_WAIT_MS / 1000,
+    ):
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queue: "asyncio.Queue[Tuple[np.ndarray, asyncio.Future]]"
+        self._queue = asyncio.Queue()
+        self.batches = 0
+        self.rows = 0
+
+    async def submit(self, features: "np.ndarray") -> Tuple[LoadedModel, "np.ndarray"]:
+        """Queue `features` and wait for the model that served them and its output."""
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        await self._queue.put((features, future))
+        return await future
+
+    async def _collect(self) -> List[Tuple["np.ndarray", asyncio.Future]]:
+        batch = [await self._queue.get()]
+        rows = len(batch[0][0])
+        deadline = asyncio.get_running_loop().time() + self.max_wait
+        while rows < self.max_batch_size:
+            if self._queue.empty():
+                timeout = deadline - asyncio.get_running_loop().time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            else:
+                item = self._queue.get_nowait()
+            batch.append(item)
+            rows += len(item[0])
+        return batch
+
+    async def run(self, current: Callable[[], Optional[LoadedModel]]) -> None:
+        """Serve batches until cancelled, with whatever model `current` returns."""
+        import numpy as np
+
+        while True:
+            batch = await self._collect()
+            pending = [(rows, future) for rows, future in batch if not future.done()]
+            if not pending:
+                continue
+            # Taken once per batch, so a swap never splits a batch.
+            model = current()
+            if model is None:
+                for _, future in pending:
+                    future.set_exception(ModelUnavailable("No active model loaded"))
+                continue
+            try:
+                # Inside the try, so bad rows fail their requests, not the loop.
+                features = np.concatenate([rows for rows, _ in pending])
+                output = await asyncio.to_thread(model.predict, features)
+            except Exception as exc:
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            self.batches += 1
+            self.rows += len(features)
+            start = 0
+            for rows, future in pending:
+                if not future.done():
+                    future.set_result((model, output[start : start + len(rows)]))
+                start += len(rows)
+
+
+class InferenceService:
+    """Serves the active registry model and reloads it when that changes."""
+
+    def __init__(
+        self,
+        db: Any,
+        model_name: str = DEFAULT_MODEL_NAME,
+        loader: Loader = load_keras_model,
+        batcher: Optional[MicroBatcher] = None,
+        reload_interval: float = DEFAULT_RELOAD_SECONDS,
+    ):
+        self.db = db
+        self.model_name = model_name
+        self.loader = loader
+        self.batcher = batcher or MicroBatcher()
+        self.reload_interval = reload_interval
+        self.active: Optional[LoadedModel] = None
+
+    async def active_record(self) -> Optional[dict]:
+        """The model's newest registry entry with status `active`."""
+        records = await self.db.query_items(
+            "modelRegistry",
+            ACTIVE_MODEL_QUERY,
+            [{"name": "@status", "value": "active"}],
+            partition_key=self.model_name,
+        )
+        return records[0] if records else None
+
+    async def refresh(self) -> bool:
+        """Load the active model if it changed; return whether it was swapped."""
+        record = await self.active_record()
+        if record is None or not record.get("artifact"):
+            return False
+        active = self.active
+        if active and (active.record_id, active.artifact) == (
+            record["id"],
+            record["artifact"],
+        ):
+            return False
+        workdir = tempfile.TemporaryDirectory(prefix="model-")
+        try:
+            predict = await asyncio.to_thread(
+                self.loader, record["artifact"], workdir.name
+            )
+        except BaseException:
+            workdir.cleanup()
+            raise
+        self.active = LoadedModel(
+            record_id=record["id"],
+            model_name=self.model_name,
+            version=record["version"],
+            artifact=record["artifact"],
+            predict=predict,
+            workdir=workdir,
+        )
+        if active is not None:
+            # Running batches hold the model in memory, not its files.
+            active.close()
+        logger.info("Serving %s version %s", self.model_name, record["version"])
+        return True
+
+    async def predict(self, features: "np.ndarray") -> Tuple[LoadedModel, "np.ndarray"]:
+        """Risk per feature row, and the model that produced it."""
+        return await self.batcher.submit(features.astype("float32", copy=False))
+
+    async def watch(self) -> None:
+        """Poll the registry until cancelled."""
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Loading the active %s model failed", self.model_name)
+            await asyncio.sleep(self.reload_interval)
+
+    async def run(self) -> None:
+        await asyncio.gather(self.watch(), self.batcher.run(lambda: self.active))
+
+
+def create_inference_service(db: Any) -> Optional[InferenceService]:
+    """Build the inference service from configuration, or None if disabled."""
+    if not inference_enabled():
+        return None
+    batcher = MicroBatcher(
+        int(
+            os.getenv("CONFIGURATION__INFERENCE__MAXBATCHSIZE", DEFAULT_MAX_BATCH_SIZE)
+        ),
+        float(os.getenv("CONFIGURATION__INFERENCE__MAXWAITMS", DEFAULT_MAX_WAIT_MS))
+        / 1000,
+    )
+    from src.services.cache import uncached
+
+    return InferenceService(
+        # The registry is polled every RELOADSECONDS; a cached answer could
+        # hide a model activated by another process for the cache's TTL.
+        uncached(db),
+        os.getenv("CONFIGURATION__INFERENCE__MODELNAME", DEFAULT_MODEL_NAME),
+        batcher=batcher,
+        reload_interval=float(
+            os.getenv("CONFIGURATION__INFERENCE__RELOADSECONDS", DEFAULT_RELOAD_SECONDS)
+        ),
+    )
@@ -1 +1,471 @@
-# Trainer placeholder
+"""
+Streaming training for the injury-risk model.
+
+Examples are player-weeks. The features are the week's acute load,
+chronic load and ACWR, the inputs `RISK_FEATURES` the inference service
+also uses. The label is 1 when the player was injured in the following
+week.
+
+A source yields one player partition at a time. `CosmosSource` pages
+through Cosmos DB, `SnapshotSource` reads NDJSON files such as those
+written by `benchmarks.synthetic`, and `ArrowSource` reads the columnar
+snapshots of `src.services.snapshots` a team at a time. Features are computed with the
+vectorized ACWR engine for a group of partitions at a time. A generator
+feeds each group's arrays to `tf.data`, which unbatches them, shuffles
+them through a fixed-size buffer, batches them and prefetches. Memory
+therefore holds at most one group of partitions, the shuffle buffer and
+the prefetched batches, however many players or seasons there are. Set
+`cache_dir` to spill the examples to disk after the first epoch instead
+of reading the source again.
+
+`Throughput` records items and time per stage: documents read, examples
+built and batches trained.
+
+Usage:
+    python -m src.ml.trainer --snapshot ./synthetic --epochs 3 --output ./models
+    python -m src.ml.trainer --arrow ./snapshots --epochs 3 --output ./models
+"""
+
+import argparse
+import logging
+import os
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date
+from itertools import groupby
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.ml.features import ACUTE_DAYS, RISK_FEATURES, Sessions, weekly_acwr
+from src.services.cosmos import DEFAULT_PAGE_SIZE
+from src.services.materializer import SESSION_FIELDS_QUERY
+from src.services.serialization import loads
+
+logger = logging.getLogger(__name__)
+
+# Player id, their sessions (documents or a DataFrame) and their injury
+# dates (ISO strings).
+Partition = Tuple[str, Sessions, List[str]]
+
+EpochCallback = Callable[[int, Dict[str, float], Dict[str, Dict[str, Any]]], None]
+
+# Brings loads (hundreds to thousands) near the ACWR's scale of about 1.
+FEATURE_SCALE = [1 / 1000, 1 / 1000, 1.0]
+
+
+@dataclass
+class TrainConfig:
+    epochs: int = 5
+    batch_size: int = 256
+    # Examples held for shuffling; partitions arrive one player at a time,
+    # so this should span many players.
+    shuffle_buffer: int = 10_000
+    # Player partitions whose features are computed in one vectorized pass.
+    partitions_per_chunk: int = 64
+    # Weeks from this Monday on are held out for validation.
+    validation_from: Optional[date] = None
+    cache_dir: Optional[str] = None
+
+
+@dataclass
+class StageStats:
+    unit: str
+    items: int = 0
+    seconds: float = 0.0
+
+    @property
+    def per_second(self) -> float:
+        return self.items / self.seconds if self.seconds else 0.0
+
+
+class Throughput:
+    """Items processed and time spent per pipeline stage."""
+
+    units = {"read": "documents", "features": "examples", "train": "batches"}
+
+    def __init__(self) -> None:
+        self.stages: Dict[str, StageStats] = {
+            stage: StageStats(unit) for stage, unit in self.units.items()
+        }
+
+    def add(self, stage: str, items: int, seconds: float) -> None:
+        stats = self.stages[stage]
+        stats.items += items
+        stats.seconds += seconds
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            stage: {
+                "unit": stats.unit,
+                "items": stats.items,
+                "seconds": round(stats.seconds, 3),
+                "per_second": round(stats.per_second, 1),
+            }
+            for stage, stats in self.stages.items()
+        }
+
+
+class CosmosSource:
+    """
+    Streams player partitions from Cosmos DB, one player at a time.
+
+    Players are paged through. A player's sessions are read whole, since
+    their ACWR depends on the weeks before each one; the query projects
+    the four load fields, so a season of daily sessions is a few hundred
+    small dicts. Memory holds the sessions of one group of players
+    (`TrainConfig.partitions_per_chunk`), not the whole container.
+    """
+
+    def __init__(
+        self,
+        db: Any,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ):
+        self.db = db
+        self.start = start or date.min
+        self.end = end or date.max
+        self.page_size = page_size
+
+    def partitions(self) -> Iterator[Partition]:
+        params = [
+            {"name": "@from", "value": self.start.isoformat()},
+            {"name": "@to", "value": self.end.isoformat()},
+        ]
+        players = self.db.iter_items(
+            "players", "SELECT c.id FROM c", page_size=self.page_size
+        )
+        for player in players:
+            player_id = player["id"]
+            sessions = list(
+                self.db.iter_items(
+                    "sessions",
+                    SESSION_FIELDS_QUERY,
+                    params,
+                    page_size=self.page_size,
+                    partition_key=player_id,
+                )
+            )
+            injuries = self.db.query_items(
+                "injuries", "SELECT c.date FROM c", partition_key=player_id
+            )
+            yield player_id, sessions, [row["date"] for row in injuries]
+
+
+class SnapshotSource:
+    """
+    Streams player partitions from a directory of NDJSON files, one
+    `<container>.ndjson` per container.
+
+    Sessions must be grouped by player, as in exports written partition by
+    partition. Injury dates are indexed up front; there are few per player.
+    """
+
+    def __init__(
+        self, directory: str, start: Optional[date] = None, end: Optional[date] = None
+    ):
+        self.directory = directory
+        self.start = (start or date.min).isoformat()
+        self.end = (end or date.max).isoformat()
+
+    def _rows(self, container_name: str) -> Iterator[dict]:
+        path = os.path.join(self.directory, f"{container_name}.ndjson")
+        if not os.path.exists(path):
+            return
+        with open(path, "rb") as f:
+            for line in f:
+                if line.strip():
+                    yield loads(line)
+
+    def partitions(self) -> Iterator[Partition]:
+        injuries: Dict[str, List[str]] = defaultdict(list)
+        for injury in self._rows("injuries"):
+            injuries[injury["player_id"]].append(injury["date"])
+        for player_id, group in groupby(
+            self._rows("sessions"), key=itemgetter("player_id")
+        ):
+            sessions = [s for s in group if self.start <= s["date"] <= self.end]
+            yield player_id, sessions, injuries.get(player_id, [])
+
+
+class ArrowSource:
+    """
+    Streams player partitions from a columnar snapshot directory (see
+    `src.services.snapshots`).
+
+    Each team's sessions are read as one memory-mapped Arrow table. Only
+    the load columns are converted to a DataFrame, which is then split by
+    player. Memory therefore holds one team's session loads at a time.
+    """
+
+    def __init__(
+        self, directory: str, start: Optional[date] = None, end: Optional[date] = None
+    ):
+        from src.services.snapshots import SnapshotStore
+
+        self.store = SnapshotStore(directory)
+        self.start = start
+        self.end = end
+
+    def partitions(self) -> Iterator[Partition]:
+        for team_id in self.store.teams("sessions"):
+            sessions = self.store.read_frame(
+                "sessions",
+                team_ids=[team_id],
+                start=self.start,
+                end=self.end,
+                columns=["player_id", "date", "rpe", "duration"],
+            )
+            injuries = self.store.read_table(
+                "injuries", team_ids=[team_id], columns=["player_id", "date"]
+            ).to_pylist()
+            dates: Dict[str, List[str]] = defaultdict(list)
+            for injury in injuries:
+                dates[injury["player_id"]].append(injury["date"].isoformat())
+            for player_id, group in sessions.groupby("player_id", sort=False):
+                yield player_id, group, dates.get(player_id, [])
+
+
+def partition_examples(
+    partitions: List[Partition],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Features, labels and week (Monday) for every week of a group of player
+    partitions, in one vectorized ACWR pass.
+
+    A week is labelled 1 when the player was injured in the week after it.
+    """
+    groups = [sessions for _, sessions, _ in partitions]
+    frame = weekly_acwr(
+        pd.concat(groups)
+        if groups and isinstance(groups[0], pd.DataFrame)
+        else [s for sessions in groups for s in sessions]
+    )
+    if frame.empty:
+        empty = np.empty(0, dtype=np.float32)
+        weeks = np.empty(0, dtype="datetime64[D]")
+        return empty.reshape(0, len(RISK_FEATURES)), empty, weeks
+    weeks = frame["week"].to_numpy().astype("datetime64[D]")
+    features = np.column_stack(
+        [frame["acute"], frame["chronic"], frame["acwr"]]
+    ).astype(np.float32)
+    injured = pd.DataFrame(
+        [(player_id, day) for player_id, _, days in partitions for day in days],
+        columns=["player_id", "date"],
+    )
+    days = injured["date"].to_numpy().astype("datetime64[D]")
+    # Monday of each injury's week, minus a week: the week it labels.
+    offset = (days.astype(np.int64) + 3) % 7  # 1970-01-01 was a Thursday
+    labelled = pd.MultiIndex.from_arrays(
+        [injured["player_id"], days - offset - np.timedelta64(ACUTE_DAYS, "D")]
+    )
+    labels = pd.MultiIndex.from_arrays([frame["player_id"], weeks]).isin(labelled)
+    return features, labels.astype(np.float32), weeks
+
+
+def _chunks(
+    source: Any, size: int, throughput: Throughput
+) -> Iterator[List[Partition]]:
+    """Group the source's partitions `size` at a time, timing the reads."""
+    partitions = iter(source.partitions())
+    chunk: List[Partition] = []
+    while True:
+        start = time.perf_counter()
+        partition = next(partitions, None)
+        if partition is not None:
+            _, sessions, injuries = partition
+            throughput.add(
+                "read", len(sessions) + len(injuries), time.perf_counter() - start
+            )
+            chunk.append(partition)
+        if chunk and (partition is None or len(chunk) == size):
+            yield chunk
+            chunk = []
+        if partition is None:
+            return
+
+
+def partition_arrays(
+    source: Any, throughput: Throughput, validation: bool, config: TrainConfig
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Yield features and labels for one split, a group of partitions at a time."""
+    cutoff = (
+        np.datetime64(config.validation_from, "D") if config.validation_from else None
+    )
+    for chunk in _chunks(source, config.partitions_per_chunk, throughput):
+        start = time.perf_counter()
+        features, labels, weeks = partition_examples(chunk)
+        if cutoff is not None:
+            keep = weeks >= cutoff if validation else weeks < cutoff
+            features, labels = features[keep], labels[keep]
+        throughput.add("features", len(labels), time.perf_counter() - start)
+        if len(labels):
+            yield features, labels
+
+
+def make_dataset(
+    source: Any, throughput: Throughput, config: TrainConfig, validation: bool
+) -> Any:
+    """Build the `tf.data` pipeline for the training or validation split."""
+    import tensorflow as tf
+
+    dataset = tf.data.Dataset.from_generator(
+        lambda: partition_arrays(source, throughput, validation, config),
+        output_signature=(
+            tf.TensorSpec((None, len(RISK_FEATURES)), tf.float32),
+            tf.TensorSpec((None,), tf.float32),
+        ),
+    ).unbatch()
+    if config.cache_dir:
+        split = "validation" if validation else "train"
+        dataset = dataset.cache(os.path.join(config.cache_dir, split))
+    if not validation:
+        dataset = dataset.shuffle(config.shuffle_buffer, reshuffle_each_iteration=True)
+    return dataset.batch(config.batch_size).prefetch(tf.data.AUTOTUNE)
+
+
+def make_model(n_in: int) -> Any:
+    """The starter MLP: risk probability from the feature row."""
+    import tensorflow as tf
+
+    model = tf.keras.Sequential(
+        [
+            tf.keras.layers.Input((n_in,)),
+            tf.keras.layers.Rescaling(FEATURE_SCALE),
+            tf.keras.layers.Dense(64, activation="relu"),
+            tf.keras.layers.Dropout(0.2),
+            tf.keras.layers.Dense(32, activation="relu"),
+            tf.keras.layers.Dense(1, activation="sigmoid"),
+        ]
+    )
+    model.compile(
+        optimizer="adam",
+        loss="binary_crossentropy",
+        metrics=[tf.keras.metrics.AUC(name="auc")],
+    )
+    return model
+
+
+@dataclass
+class TrainResult:
+    model: Any
+    metrics: Dict[str, float]
+    throughput: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+
+def train(
+    source: Any,
+    config: Optional[TrainConfig] = None,
+    on_epoch: Optional[EpochCallback] = None,
+) -> TrainResult:
+    """
+    Train a new model on `source`, logging stage throughput every epoch.
+
+    `on_epoch`, if given, is called after each epoch with the epoch number
+    (from 1), that epoch's metrics and the throughput so far.
+    """
+    import tensorflow as tf
+
+    config = config or TrainConfig()
+    throughput = Throughput()
+
+    class StageLogger(tf.keras.callbacks.Callback):
+        def on_epoch_begin(self, epoch: int, logs: Optional[dict] = None) -> None:
+            self.started = time.perf_counter()
+            self.batches = 0
+
+        def on_train_batch_end(self, batch: int, logs: Optional[dict] = None) -> None:
+            self.batches += 1
+
+        def on_epoch_end(self, epoch: int, logs: Optional[dict] = None) -> None:
+            throughput.add("train", self.batches, time.perf_counter() - self.started)
+            report = throughput.report()
+            logger.info("Epoch %d throughput: %s", epoch + 1, report)
+            if on_epoch is not None:
+                metrics = {name: float(value) for name, value in (logs or {}).items()}
+                on_epoch(epoch + 1, metrics, report)
+
+    model = make_model(len(RISK_FEATURES))
+    validation = (
+        make_dataset(source, throughput, config, validation=True)
+        if config.validation_from
+        else None
+    )
+    history = model.fit(
+        make_dataset(source, throughput, config, validation=False),
+        validation_data=validation,
+        epochs=config.epochs,
+        callbacks=[StageLogger()],
+        verbose=0,
+    )
+    metrics = {name: float(values[-1]) for name, values in history.history.items()}
+    return TrainResult(model, metrics, throughput.report())
+
+
+def save_model(model: Any, directory: str, version: str) -> str:
+    """Save `model` in Keras format under `directory`; return its path."""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"injury_risk_{version}.keras")
+    model.save(path)
+    return path
+
+
+def upload_artifact(path: str, container_url: str) -> str:
+    """Upload a saved model to a Blob Storage container; return its URL."""
+    from azure.identity import DefaultAzureCredential
+    from azure.storage.blob import ContainerClient
+
+    container = ContainerClient.from_container_url(
+        container_url, credential=DefaultAzureCredential()
+    )
+    with open(path, "rb") as f:
+        blob = container.upload_blob(os.path.basename(path), f, overwrite=True)
+    return blob.url
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--snapshot", help="NDJSON directory; default: Cosmos DB")
+    parser.add_argument("--arrow", help="columnar snapshot directory")
+    parser.add_argument("--epochs", type=int, default=TrainConfig.epochs)
+    parser.add_argument("--batch-size", type=int, default=TrainConfig.batch_size)
+    parser.add_argument(
+        "--shuffle-buffer", type=int, default=TrainConfig.shuffle_buffer
+    )
+    parser.add_argument(
+        "--validation-from",
+        type=date.fromisoformat,
+        help="hold out weeks from this Monday on",
+    )
+    parser.add_argument("--cache-dir")
+    parser.add_argument("--output", default="./models")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    if args.snapshot:
+        source: Any = SnapshotSource(args.snapshot)
+    elif args.arrow:
+        source = ArrowSource(args.arrow)
+    else:
+        from src.services.cosmos import get_db
+
+        source = CosmosSource(get_db())
+    result = train(
+        source,
+        TrainConfig(
+            epochs=args.epochs,
+            batch_size=args.batch_size,
+            shuffle_buffer=args.shuffle_buffer,
+            validation_from=args.validation_from,
+            cache_dir=args.cache_dir,
+        ),
+    )
+    version = time.strftime("%Y%m%d%H%M%S")
+    print(save_model(result.model, args.output, version))
+    print(result.metrics)
+    print(result.throughput)
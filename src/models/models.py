@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
 from datetime import date
 
 
@@ -67,3 +67,97 @@ class ModelRegistry(BaseModel):
     trained_at: date
     accuracy: Optional[float]
     notes: Optional[str]
+    # "active", "candidate" or "archived"; inference serves the active one.
+    status: Optional[str] = None
+    # Saved Keras model: a local path or a Blob Storage URL.
+    artifact: Optional[str] = None
+
+
+class WeeklyRpe(BaseModel):
+    week: date
+    rpe: Optional[float]
+
+
+class LoadSummary(BaseModel):
+    last_7_days_load: int
+    chronic_load: int
+    acwr: float
+    rpe_trend: List[WeeklyRpe]
+
+
+class PlayerDashboard(BaseModel):
+    player_id: str
+    as_of: date
+    summary: LoadSummary
+    sessions: List[Session]
+    metrics: List[Metric]
+    injuries: List[Injury]
+    cyclelogs: List[CycleLog]
+
+
+class PlayerLoad(BaseModel):
+    player_id: str
+    name: Optional[str]
+    role: Optional[str]
+    last_7_days_load: int
+    chronic_load: int
+    acwr: float
+    risk: str
+
+
+class TeamSummary(BaseModel):
+    team_id: str
+    name: str
+    as_of: date
+    average_load: float
+    red_flags: int
+    yellow_flags: int
+    players: List[PlayerLoad]
+
+
+class PredictRequest(BaseModel):
+    player_ids: List[str] = Field(min_length=1)
+
+
+class RiskPrediction(BaseModel):
+    player_id: str
+    risk: float
+
+
+class PredictResponse(BaseModel):
+    model_name: str
+    version: str
+    as_of: date
+    predictions: List[RiskPrediction]
+
+
+class RetrainRequest(BaseModel):
+    # Session dates to train on; both ends optional.
+    start: Optional[date] = None
+    end: Optional[date] = None
+    epochs: int = Field(5, ge=1, le=100)
+    # Weeks from this Monday on are held out for validation metrics.
+    validation_from: Optional[date] = None
+    # Make the new model the active one once it is trained.
+    activate: bool = False
+
+
+class Job(BaseModel):
+    id: str
+    type: str
+    # "queued", "running", "succeeded" or "failed".
+    status: str
+    params: Dict[str, Any]
+    created_at: str
+    updated_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    epoch: int = 0
+    epochs: int
+    progress: float = 0.0
+    metrics: Optional[Dict[str, float]] = None
+    history: List[Dict[str, float]] = []
+    throughput: Optional[Dict[str, Dict[str, Any]]] = None
+    artifact: Optional[str] = None
+    model_registry_id: Optional[str] = None
+    error: Optional[str] = None
@@ -0,0 +1,309 @@
+"""
+Incremental injury-risk alerts, pushed to the teams watching them.
+
+`RiskAlertEngine` follows the `sessions` and `cycleLogs` change feeds
+(the same sources as the metrics materializer). Each
+change re-evaluates only the player it belongs to: ACWR from the last 28
+days of sessions, with the Red/Yellow/Green thresholds behind the coach
+dashboard's Risk column, and wellness from the latest cycle log. A player's
+status is the worse of the two. When it changes, an alert is published to
+every team the player is in.
+
+Only players of teams someone is watching are evaluated. `watch(team)`
+evaluates the team's players once, as the baseline the subscriber
+receives first, and from then on each write updates them. An
+`AlertBroker` fans alerts out to one bounded queue per subscriber; a
+subscriber that falls behind loses its oldest alerts, never the engine's
+time. Every API process follows the feeds itself, so each one can serve
+its own subscribers. A process reads the changes made since it started
+and keeps its position in memory: subscribers get a fresh snapshot when
+they connect, so earlier changes need no replay.
+
+Settings:
+- `CONFIGURATION__ALERTS__MODE`: `feed` (default), `poll` or `off`
+- `CONFIGURATION__ALERTS__INTERVALSECONDS` (default 2)
+"""
+
+import asyncio
+import logging
+import os
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from dotenv import load_dotenv
+
+from src.ml.features import (
+    ACUTE_DAYS,
+    CHRONIC_DAYS,
+    WELLNESS_YELLOW_SCORE,
+    current_loads,
+    wellness_scores,
+    wellness_status,
+    week_start,
+    worst_status,
+)
+from src.services.materializer import (
+    SESSION_FIELDS_QUERY,
+    ChangeFeedSource,
+    PollingSource,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL_SECONDS = 2.0
+
+# Changes are followed in these containers; both are partitioned on player.
+WATCHED_CONTAINERS = ("sessions", "cycleLogs")
+
+# Players evaluated concurrently; bounds load on the connection pool.
+MAX_CONCURRENT_PLAYERS = 8
+
+# Alerts held for a subscriber that is not keeping up.
+SUBSCRIBER_QUEUE_SIZE = 100
+
+CYCLE_LOG_QUERY = (
+    "SELECT c.period_start, c.wellness, c.sleep, c.mood, c.soreness FROM c"
+    " WHERE c.period_start >= @from ORDER BY c.period_start DESC"
+)
+
+MESSAGES = {
+    "Red": "{name} is in the high-risk zone this week",
+    "Yellow": "{name} is approaching the high-risk zone",
+    "Green": "{name} is back in the safe zone",
+}
+
+
+def alerts_mode() -> str:
+    load_dotenv()
+    return os.getenv("CONFIGURATION__ALERTS__MODE", "feed").lower()
+
+
+def _reasons(load: dict, cycle_log: Optional[dict]) -> List[str]:
+    """Why a player is not Green, in words a coach reads."""
+    reasons = []
+    if load["risk"] != "Green":
+        reasons.append(f"ACWR {load['acwr']:.2f}")
+    for name, score in wellness_scores(cycle_log or {}).items():
+        if score <= WELLNESS_YELLOW_SCORE:
+            reasons.append(f"{name.capitalize()} {(cycle_log or {})[name]}/10")
+    return reasons
+
+
+class AlertBroker:
+    """Team-scoped fan-out of alerts to subscriber queues."""
+
+    def __init__(self, queue_size: int = SUBSCRIBER_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._queues: Dict[str, Set["asyncio.Queue[dict]"]] = defaultdict(set)
+
+    @asynccontextmanager
+    async def subscribe(self, team_id: str) -> AsyncIterator["asyncio.Queue[dict]"]:
+        queue: "asyncio.Queue[dict]" = asyncio.Queue(self.queue_size)
+        self._queues[team_id].add(queue)
+        try:
+            yield queue
+        finally:
+            self._queues[team_id].discard(queue)
+            if not self._queues[team_id]:
+                del self._queues[team_id]
+
+    def subscribers(self, team_id: str) -> int:
+        return len(self._queues.get(team_id, ()))
+
+    def publish(self, team_id: str, alert: dict) -> None:
+        for queue in self._queues.get(team_id, ()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(alert)
+
+
+class RiskAlertEngine:
+    """Keeps the risk status of watched players current, one write at a time."""
+
+    def __init__(
+        self,
+        db: Any,
+        sources: Dict[str, Any],
+        broker: Optional[AlertBroker] = None,
+        interval: float = DEFAULT_INTERVAL_SECONDS,
+    ):
+        self.db = db
+        self.sources = sources
+        self.broker = broker or AlertBroker()
+        self.interval = interval
+        self.cursors: Dict[str, Optional[str]] = {}
+        # Watched teams' players, each player's teams and their statuses.
+        self.players_of: Dict[str, List[str]] = {}
+        self.teams_of: Dict[str, Set[str]] = defaultdict(set)
+        self.status: Dict[str, dict] = {}
+        self.alerts_published = 0
+        self._lock = asyncio.Lock()
+
+    async def _load(self, player_id: str, today: date) -> Tuple[List[dict], dict]:
+        """A player's sessions in the chronic window and their latest scores."""
+        since = week_start(today) - timedelta(days=CHRONIC_DAYS)
+        sessions, cycle_logs, profile = await asyncio.gather(
+            self.db.query_items(
+                "sessions",
+                SESSION_FIELDS_QUERY,
+                [
+                    {"name": "@from", "value": since.isoformat()},
+                    {"name": "@to", "value": today.isoformat()},
+                ],
+                partition_key=player_id,
+            ),
+            self.db.query_items(
+                "cycleLogs",
+                CYCLE_LOG_QUERY,
+                [
+                    {
+                        "name": "@from",
+                        "value": (today - timedelta(days=ACUTE_DAYS)).isoformat(),
+                    }
+                ],
+                partition_key=player_id,
+            ),
+            self.db.get_item("players", player_id),
+        )
+        latest = cycle_logs[0] if cycle_logs else None
+        return sessions, {"cycle_log": latest, "name": (profile or {}).get("name")}
+
+    async def evaluate(self, player_ids: List[str]) -> Dict[str, dict]:
+        """Current status of each player, from their sessions and cycle logs."""
+        if not player_ids:
+            return {}
+        today = date.today()
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_PLAYERS)
+
+        async def load(player_id: str) -> Tuple[List[dict], dict]:
+            async with semaphore:
+                return await self._load(player_id, today)
+
+        loaded = await asyncio.gather(*map(load, player_ids))
+        sessions = [row for rows, _ in loaded for row in rows]
+        loads = current_loads(sessions, player_ids, today).to_dict("records")
+        evaluated_at = datetime.now(timezone.utc).isoformat()
+        statuses = {}
+        for load, (_, extra) in zip(loads, loaded):
+            cycle_log = extra["cycle_log"]
+            wellness = wellness_status(cycle_log)
+            statuses[load["player_id"]] = {
+                "player_id": load["player_id"],
+                "name": extra["name"],
+                "status": worst_status(load["risk"], wellness),
+                "load_status": load["risk"],
+                "wellness_status": wellness,
+                "acwr": load["acwr"],
+                "last_7_days_load": load["last_7_days_load"],
+                "chronic_load": load["chronic_load"],
+                "reasons": _reasons(load, cycle_log),
+                "evaluated_at": evaluated_at,
+            }
+        return statuses
+
+    def snapshot(self, team_id: str) -> List[dict]:
+        return [
+            self.status[player_id]
+            for player_id in self.players_of.get(team_id, [])
+            if player_id in self.status
+        ]
+
+    @asynccontextmanager
+    async def watch(self, team: dict) -> AsyncIterator["asyncio.Queue[dict]"]:
+        """
+        Subscribe to a team's alerts. The first item on the queue is a
+        snapshot of every player's current status.
+        """
+        team_id = team["id"]
+        try:
+            async with self.broker.subscribe(team_id) as queue:
+                async with self._lock:
+                    player_ids = list(dict.fromkeys(team.get("player_ids", [])))
+                    self.players_of[team_id] = player_ids
+                    for player_id in player_ids:
+                        self.teams_of[player_id].add(team_id)
+                    new = [pid for pid in player_ids if pid not in self.status]
+                    self.status.update(await self.evaluate(new))
+                queue.put_nowait(
+                    {
+                        "type": "snapshot",
+                        "team_id": team_id,
+                        "players": self.snapshot(team_id),
+                    }
+                )
+                yield queue
+        finally:
+            # Only once this subscriber is gone can the count reach zero.
+            async with self._lock:
+                if not self.broker.subscribers(team_id):
+                    self._unwatch(team_id)
+
+    def _unwatch(self, team_id: str) -> None:
+        for player_id in self.players_of.pop(team_id, []):
+            self.teams_of[player_id].discard(team_id)
+            if not self.teams_of[player_id]:
+                del self.teams_of[player_id]
+                self.status.pop(player_id, None)
+
+    async def refresh(self, player_ids: Set[str]) -> int:
+        """Re-evaluate watched players and publish changes; return alerts sent."""
+        async with self._lock:
+            watched = [pid for pid in player_ids if pid in self.teams_of]
+            statuses = await self.evaluate(watched)
+            sent = 0
+            for player_id, current in statuses.items():
+                previous = self.status.get(player_id)
+                self.status[player_id] = current
+                if previous is None or previous["status"] == current["status"]:
+                    continue
+                name = current["name"] or player_id
+                alert = {
+                    "type": "alert",
+                    **current,
+                    "previous_status": previous["status"],
+                    "message": MESSAGES[current["status"]].format(name=name),
+                }
+                for team_id in self.teams_of.get(player_id, ()):
+                    self.broker.publish(team_id, {**alert, "team_id": team_id})
+                    sent += 1
+            self.alerts_published += sent
+            return sent
+
+    async def poll_once(self) -> int:
+        """Process one page of changes per container; return changes read."""
+        read = 0
+        for container_name, source in self.sources.items():
+            changes, cursor = await source.read(self.cursors.get(container_name))
+            await self.refresh({change["player_id"] for change in changes})
+            self.cursors[container_name] = cursor
+            read += len(changes)
+        return read
+
+    async def run(self) -> None:
+        """Poll until cancelled, sleeping whenever the feeds are drained."""
+        while True:
+            try:
+                if await self.poll_once():
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Risk alert evaluation failed; retrying")
+            await asyncio.sleep(self.interval)
+
+
+def create_alert_engine(db: Any) -> Optional[RiskAlertEngine]:
+    """Build the alert engine selected by configuration, or None if off."""
+    mode = alerts_mode()
+    if mode == "off":
+        return None
+    if mode not in ("feed", "poll"):
+        raise ValueError(f"Unknown alerts mode: {mode}")
+    source = ChangeFeedSource if mode == "feed" else PollingSource
+    sources = {name: source(db, name, "Now") for name in WATCHED_CONTAINERS}
+    interval = float(
+        os.getenv("CONFIGURATION__ALERTS__INTERVALSECONDS", DEFAULT_INTERVAL_SECONDS)
+    )
+    return RiskAlertEngine(db, sources, interval=interval)
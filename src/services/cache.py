@@ -0,0 +1,427 @@
+"""
+Read-through cache in front of the async Cosmos client.
+
+`CachedCosmosClient` wraps `AsyncCosmosDBClient` (or the local stand-in)
+and keeps point reads and query results in an in-process LRU with a TTL
+per container. Every write through the wrapper invalidates the partition
+it touched. Partition-scoped results depend only on their own partition,
+and cross-partition results depend on the whole container.
+
+Invalidation uses generation counters, one per partition and one per
+container. A cached entry records the counters it was read under and is
+discarded once any of them moves on. By default the counters live in
+process. Set `CONFIGURATION__CACHE__REDISURL` to keep them in Redis, so a
+write on one uvicorn worker invalidates the caches of all of them (needs
+the `redis` package).
+
+Queries over a date window that only moves once a week, such as the team
+summary's, go through `query_window` and keep the window TTL instead of
+the container's; writes through the API still invalidate them at once.
+
+Settings:
+- `CONFIGURATION__CACHE__ENABLED` (default true)
+- `CONFIGURATION__CACHE__MAXENTRIES`
+- `CONFIGURATION__CACHE__TTL__<CONTAINER>`, e.g.
+  `CONFIGURATION__CACHE__TTL__SESSIONS=30`
+- `CONFIGURATION__CACHE__WINDOWTTL` (seconds, default one week)
+"""
+
+import asyncio
+import os
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from src.services.cosmos import CONTAINERS, DEFAULT_PAGE_SIZE
+from src.services.routing import PARTITION_KEYS, partition_for_id
+
+# Seconds an entry stays valid per container, even without writes. Writes
+# through another path (a different service, the portal) show up after at
+# most this long. Zero disables caching for the container.
+DEFAULT_TTLS: Dict[str, float] = {
+    "players": 300,
+    "teams": 300,
+    "sessions": 30,
+    "cycleLogs": 60,
+    "metrics": 60,
+    "injuries": 60,
+    "modelRegistry": 600,
+    "leases": 0,
+    # Polled for progress; conditional GETs keep polling cheap instead.
+    "jobs": 0,
+}
+
+DEFAULT_MAX_ENTRIES = 2048
+
+# Seconds a `query_window` result stays valid without writes.
+DEFAULT_WINDOW_TTL = 7 * 24 * 3600
+
+# Results longer than this are not cached; they would crowd out the LRU.
+MAX_CACHED_ITEMS = 1000
+
+# Counter scopes besides one per partition: cross-partition reads depend
+# on ALL_PARTITIONS, which every write bumps; partition reads also depend on
+# CONTAINER_EPOCH, bumped only by writes whose partition is unknown.
+ALL_PARTITIONS = "*"
+CONTAINER_EPOCH = "#epoch"
+
+
+def cache_enabled() -> bool:
+    load_dotenv()
+    return os.getenv("CONFIGURATION__CACHE__ENABLED", "true").lower() == "true"
+
+
+def configured_ttls() -> Dict[str, float]:
+    """Per-container TTLs, with environment overrides applied."""
+    ttls = dict(DEFAULT_TTLS)
+    for name in CONTAINERS:
+        value = os.getenv(f"CONFIGURATION__CACHE__TTL__{name.upper()}")
+        if value is not None:
+            ttls[name] = float(value)
+    return ttls
+
+
+def _read_scopes(container_name: str, partition: Optional[str]) -> List[str]:
+    """Counters a read of `partition` (None: every partition) depends on."""
+    if partition is None:
+        return [f"{container_name}/{ALL_PARTITIONS}"]
+    return [f"{container_name}/{partition}", f"{container_name}/{CONTAINER_EPOCH}"]
+
+
+def _write_scopes(container_name: str, partition: Optional[str]) -> List[str]:
+    """Counters a write to `partition` (None: unknown) moves on."""
+    scope = CONTAINER_EPOCH if partition is None else partition
+    return [f"{container_name}/{ALL_PARTITIONS}", f"{container_name}/{scope}"]
+
+
+class LocalGenerations:
+    """Generation counters held in this process."""
+
+    def __init__(self) -> None:
+        self._counters: Dict[str, int] = defaultdict(int)
+
+    async def get(self, scopes: List[str]) -> Tuple[int, ...]:
+        return tuple(self._counters[scope] for scope in scopes)
+
+    async def bump(self, scopes: List[str]) -> None:
+        for scope in scopes:
+            self._counters[scope] += 1
+
+    async def close(self) -> None:
+        pass
+
+
+class RedisGenerations:
+    """Generation counters shared by every worker through Redis."""
+
+    prefix = "cricket:cache:gen:"
+
+    def __init__(self, url: str):
+        try:
+            import redis.asyncio as redis
+        except ImportError as exc:
+            raise ImportError(
+                "CONFIGURATION__CACHE__REDISURL requires the redis package"
+            ) from exc
+        self._redis = redis.from_url(url)
+
+    async def get(self, scopes: List[str]) -> Tuple[int, ...]:
+        values = await self._redis.mget([self.prefix + scope for scope in scopes])
+        return tuple(int(value or 0) for value in values)
+
+    async def bump(self, scopes: List[str]) -> None:
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for scope in scopes:
+                pipe.incr(self.prefix + scope)
+            await pipe.execute()
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    by_container: Dict[str, Dict[str, int]] = field(
+        default_factory=lambda: defaultdict(lambda: {"hits": 0, "misses": 0})
+    )
+
+    def record(self, container_name: str, hit: bool) -> None:
+        outcome = "hits" if hit else "misses"
+        setattr(self, outcome, getattr(self, outcome) + 1)
+        self.by_container[container_name][outcome] += 1
+
+
+class ResponseCache:
+    """LRU of read results, validated by TTL and generation counters."""
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttls: Optional[Dict[str, float]] = None,
+        generations: Any = None,
+        window_ttl: float = DEFAULT_WINDOW_TTL,
+    ):
+        self.max_entries = max_entries
+        self.ttls = DEFAULT_TTLS if ttls is None else ttls
+        self.window_ttl = window_ttl
+        self.generations = generations or LocalGenerations()
+        self.stats = CacheStats()
+        # key -> (expiry, generations read under, value)
+        self._entries: "OrderedDict[Hashable, Tuple[float, Tuple[int, ...], Any]]"
+        self._entries = OrderedDict()
+        # Loads in progress, shared by concurrent misses on the same key.
+        self._loading: Dict[Hashable, "asyncio.Future[Any]"] = {}
+
+    async def get_or_load(
+        self,
+        container_name: str,
+        partition: Optional[str],
+        key: Hashable,
+        load: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None,
+    ) -> Any:
+        """
+        Return the cached result for `key`, or load and cache it. `ttl`
+        overrides the container's TTL, unless caching is off for it.
+        """
+        container_ttl = self.ttls.get(container_name, 0)
+        if container_ttl <= 0:
+            return await load()
+        ttl = container_ttl if ttl is None else ttl
+        generations = await self.generations.get(
+            _read_scopes(container_name, partition)
+        )
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires, seen, value = entry
+            if seen == generations and expires > time.monotonic():
+                self._entries.move_to_end(key)
+                self.stats.record(container_name, hit=True)
+                return value
+            del self._entries[key]
+        self.stats.record(container_name, hit=False)
+
+        pending = self._loading.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        future: "asyncio.Future[Any]" = asyncio.get_running_loop().create_future()
+        self._loading[key] = future
+        try:
+            value = await load()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # Mark retrieved so a failure nobody else awaited is not logged.
+            future.exception()
+            raise
+        finally:
+            del self._loading[key]
+        future.set_result(value)
+        if not isinstance(value, list) or len(value) <= MAX_CACHED_ITEMS:
+            self._put(key, (time.monotonic() + ttl, generations, value))
+        return value
+
+    def _put(self, key: Hashable, entry: Tuple[float, Tuple[int, ...], Any]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    async def invalidate(self, container_name: str, partition: Optional[str]) -> None:
+        """
+        Invalidate reads of one partition and every cross-partition read of
+        its container (`partition=None` invalidates the whole container).
+        """
+        await self.generations.bump(_write_scopes(container_name, partition))
+        self.stats.invalidations += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Counters for the stats endpoint."""
+        lookups = self.stats.hits + self.stats.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.stats.hits,
+            "misses": self.stats.misses,
+            "hit_ratio": round(self.stats.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.stats.evictions,
+            "invalidations": self.stats.invalidations,
+            "by_container": dict(self.stats.by_container),
+        }
+
+    async def close(self) -> None:
+        self._entries.clear()
+        await self.generations.close()
+
+
+def _params_key(parameters: list) -> Tuple[Tuple[str, Any], ...]:
+    return tuple(
+        (p["name"], tuple(v) if isinstance(v := p["value"], list) else v)
+        for p in parameters
+    )
+
+
+class CachedCosmosClient:
+    """
+    Async Cosmos client with a read-through cache.
+
+    Point reads, `query_items` and `query_page` are cached; streaming
+    (`iter_items`) and the change feed always go to Cosmos. Cached results
+    are shared between callers and must not be mutated. Attributes not
+    defined here (such as the stand-in's `local`) come from the wrapped
+    client.
+    """
+
+    def __init__(self, inner: Any, cache: Optional[ResponseCache] = None):
+        self.inner = inner
+        self.cache = cache or ResponseCache()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.inner, name)
+
+    async def warm(self, container_names: List[str] = CONTAINERS) -> None:
+        await self.inner.warm(container_names)
+
+    async def close(self) -> None:
+        await self.cache.close()
+        await self.inner.close()
+
+    # --- writes: invalidate the partition they touch ---
+
+    async def upsert_item(
+        self, container_name: str, item: Any, etag: Optional[str] = None
+    ) -> dict:
+        result = await self.inner.upsert_item(container_name, item, etag)
+        partition = result.get(PARTITION_KEYS.get(container_name, "id"))
+        await self.cache.invalidate(container_name, partition)
+        return result
+
+    async def upsert_batch(
+        self, container_name: str, items: list, partition_key: str
+    ) -> list:
+        try:
+            return await self.inner.upsert_batch(container_name, items, partition_key)
+        finally:
+            # A failed batch is rolled back, but invalidating is harmless.
+            await self.cache.invalidate(container_name, partition_key)
+
+    async def delete_item(
+        self, container_name: str, item_id: str, partition_key: str
+    ) -> None:
+        await self.inner.delete_item(container_name, item_id, partition_key)
+        await self.cache.invalidate(container_name, partition_key)
+
+    # --- cached reads ---
+
+    async def read_item(
+        self, container_name: str, item_id: str, partition_key: str
+    ) -> dict:
+        return await self.cache.get_or_load(
+            container_name,
+            partition_key,
+            ("read", container_name, partition_key, item_id),
+            lambda: self.inner.read_item(container_name, item_id, partition_key),
+        )
+
+    async def get_item(self, container_name: str, item_id: str) -> Optional[dict]:
+        return await self.cache.get_or_load(
+            container_name,
+            partition_for_id(container_name, item_id),
+            ("get", container_name, item_id),
+            lambda: self.inner.get_item(container_name, item_id),
+        )
+
+    async def query_items(
+        self,
+        container_name: str,
+        query: str,
+        parameters: list = [],
+        partition_key: Optional[str] = None,
+        ttl: Optional[float] = None,
+    ) -> list:
+        return await self.cache.get_or_load(
+            container_name,
+            partition_key,
+            ("query", container_name, partition_key, query, _params_key(parameters)),
+            lambda: self.inner.query_items(
+                container_name, query, parameters, partition_key
+            ),
+            ttl,
+        )
+
+    async def query_page(
+        self,
+        container_name: str,
+        query: str,
+        parameters: list = [],
+        max_item_count: int = DEFAULT_PAGE_SIZE,
+        continuation: Optional[str] = None,
+        partition_key: Optional[str] = None,
+    ) -> Tuple[List[dict], Optional[str]]:
+        key = (
+            "page",
+            container_name,
+            partition_key,
+            query,
+            _params_key(parameters),
+            max_item_count,
+            continuation,
+        )
+        return await self.cache.get_or_load(
+            container_name,
+            partition_key,
+            key,
+            lambda: self.inner.query_page(
+                container_name,
+                query,
+                parameters,
+                max_item_count=max_item_count,
+                continuation=continuation,
+                partition_key=partition_key,
+            ),
+        )
+
+
+def uncached(db: Any) -> Any:
+    """The client under a `CachedCosmosClient`, for reads that must be current."""
+    return db.inner if isinstance(db, CachedCosmosClient) else db
+
+
+async def query_window(
+    db: Any,
+    container_name: str,
+    query: str,
+    parameters: list,
+    partition_key: Optional[str] = None,
+) -> list:
+    """
+    `db.query_items` for a query whose parameters change at most weekly,
+    cached for the window TTL rather than the container's.
+    """
+    if isinstance(db, CachedCosmosClient):
+        return await db.query_items(
+            container_name, query, parameters, partition_key, db.cache.window_ttl
+        )
+    return await db.query_items(container_name, query, parameters, partition_key)
+
+
+def create_cache() -> ResponseCache:
+    """Build the response cache from configuration."""
+    load_dotenv()
+    url = os.getenv("CONFIGURATION__CACHE__REDISURL")
+    generations = RedisGenerations(url) if url else LocalGenerations()
+    max_entries = int(
+        os.getenv("CONFIGURATION__CACHE__MAXENTRIES", DEFAULT_MAX_ENTRIES)
+    )
+    window_ttl = float(os.getenv("CONFIGURATION__CACHE__WINDOWTTL", DEFAULT_WINDOW_TTL))
+    return ResponseCache(max_entries, configured_ttls(), generations, window_ttl)
@@ -1,10 +1,75 @@
 import os
-from typing import Any, Optional
-from azure.cosmos import CosmosClient
-from azure.identity import DefaultAzureCredential
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+from azure.cosmos.exceptions import CosmosResourceNotFoundError
 from dotenv import load_dotenv
-from datetime import date, datetime
-from copy import deepcopy
+from pydantic import BaseModel
+from src.services.routing import SELF_PARTITIONED, partition_for_id
+from src.services.serialization import to_document
+
+if TYPE_CHECKING:
+    from azure.core.pipeline.transport import RequestsTransport
+    from azure.identity import DefaultAzureCredential
+    from src.services.cosmos_local import LocalCosmosDBClient
+
+# The sync SDK client, azure.identity and requests are imported when a
+# client is built: the API process only uses the async client, and these
+# imports would add to every cold start.
+
+# Containers provisioned in infra/main.bicep. Used to warm handles on startup.
+CONTAINERS = [
+    "players",
+    "teams",
+    "sessions",
+    "cycleLogs",
+    "metrics",
+    "injuries",
+    "modelRegistry",
+    "leases",
+    "jobs",
+]
+
+# Default number of pooled HTTP connections kept open to the Cosmos endpoint.
+DEFAULT_POOL_SIZE = 10
+
+# Default number of items fetched per Cosmos page when paging or streaming.
+DEFAULT_PAGE_SIZE = 100
+
+
+@lru_cache(maxsize=1)
+def get_credential() -> "DefaultAzureCredential":
+    """
+    Return the process-wide managed identity credential.
+
+    DefaultAzureCredential caches tokens internally, so sharing one instance
+    avoids repeating the credential chain discovery and token requests.
+    """
+    from azure.identity import DefaultAzureCredential
+
+    return DefaultAzureCredential()
+
+
+def _build_transport(pool_size: int) -> "RequestsTransport":
+    """Build a requests transport whose connection pool holds `pool_size`."""
+    import requests  # type: ignore
+    from azure.core.pipeline.transport import RequestsTransport
+    from requests.adapters import HTTPAdapter  # type: ignore
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return RequestsTransport(session=session, session_owner=False)
 
 
 class CosmosDBClient:
@@ -12,6 +77,7 @@ class CosmosDBClient:
         self,
         endpoint: Optional[str] = None,
         database: Optional[str] = None,
+        pool_size: Optional[int] = None,
     ):
         load_dotenv()
         self.endpoint = endpoint or os.getenv("CONFIGURATION__AZURECOSMOSDB__ENDPOINT")
@@ -20,49 +86,218 @@ class CosmosDBClient:
         )
         if not self.endpoint:
             raise EnvironmentError("Cosmos DB endpoint not set.")
-        # Use managed identity (DefaultAzureCredential)
-        credential = DefaultAzureCredential()
-        self.client = CosmosClient(url=self.endpoint, credential=credential)
+        self.pool_size = pool_size or int(
+            os.getenv("CONFIGURATION__AZURECOSMOSDB__POOLSIZE", DEFAULT_POOL_SIZE)
+        )
+        from azure.cosmos import CosmosClient
+
+        # Use managed identity (DefaultAzureCredential), shared per process
+        self._transport = _build_transport(self.pool_size)
+        self.client = CosmosClient(
+            url=self.endpoint,
+            credential=get_credential(),
+            transport=self._transport,
+        )
         self.database = self.client.get_database_client(self.database_name)
+        self._containers: Dict[str, Any] = {}
 
     def get_container(self, container_name: str) -> Any:
-        return self.database.get_container_client(container_name)
+        """Return a cached container client, creating it on first use."""
+        container = self._containers.get(container_name)
+        if container is None:
+            container = self.database.get_container_client(container_name)
+            self._containers[container_name] = container
+        return container
+
+    def warm(self, container_names: Iterable[str] = CONTAINERS) -> None:
+        """
+        Create container clients and load their metadata up front.
+
+        Reading the container properties once fills the SDK's container and
+        partition key caches, so the first real request does not pay for it.
+        """
+        for name in container_names:
+            self.get_container(name).read()
+
+    def close(self) -> None:
+        """Release pooled connections held by the transport."""
+        self._containers.clear()
+        self._transport.session.close()
+
+    def upsert_item(
+        self,
+        container_name: str,
+        item: Union[dict, BaseModel],
+        etag: Optional[str] = None,
+    ) -> dict:
+        """
+        Insert or replace a document. With `etag`, only the version with
+        that ETag is replaced; anything else raises a 412 error.
+        """
+        from azure.core import MatchConditions
 
-    def upsert_item(self, container_name: str, item: dict) -> dict:
         container = self.get_container(container_name)
-        # Cosmos SDK expects JSON-serializable objects. Convert date/datetime
-        # objects to ISO-format strings before upserting.
-        serializable = self._make_json_serializable(deepcopy(item))
-        return container.upsert_item(serializable)
+        condition: Dict[str, Any] = (
+            {"etag": etag, "match_condition": MatchConditions.IfNotModified}
+            if etag is not None
+            else {}
+        )
+        # Cosmos SDK expects JSON-serializable objects. Models are dumped once
+        # in JSON mode; dicts must already be JSON-ready.
+        return container.upsert_item(to_document(item), **condition)
 
-    def _make_json_serializable(self, obj: Any) -> Any:
-        """Recursively convert date/datetime objects to ISO strings so
-        the Cosmos SDK can serialize the payload.
+    def upsert_batch(
+        self,
+        container_name: str,
+        items: List[Union[dict, BaseModel]],
+        partition_key: str,
+    ) -> list:
+        """
+        Upsert items sharing one partition key as a transactional batch.
 
-        Leaves other types unchanged. Works for dicts, lists, and primitives.
+        Cosmos applies the whole batch atomically in a single round trip and
+        accepts at most 100 operations per batch; callers chunk accordingly.
+        Raises CosmosBatchOperationError if any operation fails.
         """
-        if isinstance(obj, dict):
-            return {k: self._make_json_serializable(v) for k, v in obj.items()}
-        if isinstance(obj, list):
-            return [self._make_json_serializable(v) for v in obj]
-        if isinstance(obj, (date, datetime)):
-            return obj.isoformat()
-        return obj
+        container = self.get_container(container_name)
+        operations = [("upsert", (to_document(item),)) for item in items]
+        return container.execute_item_batch(
+            batch_operations=operations, partition_key=partition_key
+        )
 
     def read_item(self, container_name: str, item_id: str, partition_key: str) -> dict:
         container = self.get_container(container_name)
         return container.read_item(item=item_id, partition_key=partition_key)
 
+    def get_item(self, container_name: str, item_id: str) -> Optional[dict]:
+        """
+        Fetch one document by id, or None if it does not exist.
+
+        When the partition key can be derived from the id this is a ~1 RU
+        point read; legacy ids fall back to a cross-partition query.
+        """
+        partition_key = partition_for_id(container_name, item_id)
+        if partition_key is not None:
+            try:
+                return self.read_item(container_name, item_id, partition_key)
+            except CosmosResourceNotFoundError:
+                # Self-partitioned documents written before the partition
+                # field was stored live in the empty partition; query them.
+                if container_name not in SELF_PARTITIONED:
+                    return None
+        query = "SELECT * FROM c WHERE c.id = @id"
+        params = [{"name": "@id", "value": item_id}]
+        items = self.query_items(container_name, query, params)
+        return items[0] if items else None
+
+    @staticmethod
+    def _scope(partition_key: Optional[str]) -> Dict[str, Any]:
+        """
+        Build the query options that target one partition or all of them.
+
+        A query with a partition key is served by a single physical
+        partition; without one it fans out across the container.
+        """
+        if partition_key is not None:
+            return {"partition_key": partition_key}
+        return {"enable_cross_partition_query": True}
+
     def query_items(
-        self, container_name: str, query: str, parameters: list = []
+        self,
+        container_name: str,
+        query: str,
+        parameters: list = [],
+        partition_key: Optional[str] = None,
     ) -> list:
         container = self.get_container(container_name)
         return list(
             container.query_items(
-                query=query, parameters=parameters, enable_cross_partition_query=True
+                query=query, parameters=parameters, **self._scope(partition_key)
             )
         )
 
+    def query_page(
+        self,
+        container_name: str,
+        query: str,
+        parameters: list = [],
+        max_item_count: int = DEFAULT_PAGE_SIZE,
+        continuation: Optional[str] = None,
+        partition_key: Optional[str] = None,
+    ) -> Tuple[List[dict], Optional[str]]:
+        """
+        Fetch a single page of query results.
+
+        Returns the page items and the continuation token for the next page,
+        which is None once the query is exhausted.
+        """
+        container = self.get_container(container_name)
+        pager = container.query_items(
+            query=query,
+            parameters=parameters,
+            max_item_count=max_item_count,
+            **self._scope(partition_key),
+        ).by_page(continuation)
+        try:
+            items = list(next(pager))
+        except StopIteration:
+            return [], None
+        return items, pager.continuation_token
+
+    def iter_items(
+        self,
+        container_name: str,
+        query: str,
+        parameters: list = [],
+        page_size: int = DEFAULT_PAGE_SIZE,
+        partition_key: Optional[str] = None,
+    ) -> Iterator[dict]:
+        """
+        Lazily yield query results, fetching one Cosmos page at a time.
+
+        Only the current page is held in memory, so callers can walk an
+        arbitrarily large result set with flat memory use.
+        """
+        container = self.get_container(container_name)
+        yield from container.query_items(
+            query=query,
+            parameters=parameters,
+            max_item_count=page_size,
+            **self._scope(partition_key),
+        )
+
+    def read_changes(
+        self,
+        container_name: str,
+        continuation: Optional[str] = None,
+        max_item_count: int = DEFAULT_PAGE_SIZE,
+        start_time: str = "Beginning",
+    ) -> Tuple[List[dict], Optional[str]]:
+        """
+        Read the next page of the container's change feed (latest version).
+
+        Without a continuation token the feed is read from `start_time`:
+        `"Beginning"`, or `"Now"` for only the changes made from now on.
+        Returns the changed documents and the token to resume from, which
+        callers checkpoint after processing the page.
+        """
+        container = self.get_container(container_name)
+        start: Dict[str, Any] = (
+            {"continuation": continuation}
+            if continuation
+            else {"start_time": start_time}
+        )
+        pager = container.query_items_change_feed(
+            max_item_count=max_item_count, **start
+        ).by_page()
+        try:
+            items = list(next(pager))
+        except StopIteration:
+            items = []
+        # The pager's own token: the client's last response headers are shared
+        # with every other call made on this client.
+        return items, pager.continuation_token or continuation
+
     def delete_item(
         self, container_name: str, item_id: str, partition_key: str
     ) -> None:
@@ -70,6 +305,14 @@ class CosmosDBClient:
         container.delete_item(item=item_id, partition_key=partition_key)
 
 
-# Dependency injection for FastAPI
-def get_db():
+# Dependency injection for FastAPI. Cached so every request shares one client,
+# one credential and one connection pool per process. Tests can swap it out
+# with `app.dependency_overrides[get_db]`. CONFIGURATION__AZURECOSMOSDB__BACKEND
+# set to "local" selects the in-process stand-in instead of Azure.
+@lru_cache(maxsize=1)
+def get_db() -> Union[CosmosDBClient, "LocalCosmosDBClient"]:
+    from src.services.cosmos_local import LocalCosmosDBClient, use_local_backend
+
+    if use_local_backend():
+        return LocalCosmosDBClient()
     return CosmosDBClient()
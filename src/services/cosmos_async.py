@@ -0,0 +1,315 @@
+import os
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from azure.core import MatchConditions
+from azure.cosmos.exceptions import CosmosResourceNotFoundError
+from dotenv import load_dotenv
+from pydantic import BaseModel
+
+from src.services.cosmos import CONTAINERS, DEFAULT_PAGE_SIZE, DEFAULT_POOL_SIZE
+from src.services.routing import SELF_PARTITIONED, partition_for_id
+from src.services.serialization import to_document
+from src.services.telemetry import (
+    InstrumentedCosmosClient,
+    record_response,
+    telemetry_enabled,
+)
+
+if TYPE_CHECKING:
+    from src.services.cache import CachedCosmosClient
+    from src.services.cosmos_local import AsyncLocalCosmosDBClient
+
+
+class AsyncCosmosDBClient:
+    """
+    Async variant of `CosmosDBClient` built on `azure.cosmos.aio`.
+
+    Exposes the same method surface (`upsert_item`, `query_items`,
+    `read_item`, `delete_item`) as coroutines, so a single event loop can
+    keep hundreds of Cosmos calls in flight instead of one per threadpool
+    worker. Must be constructed inside a running event loop (for example the
+    FastAPI lifespan) because the aiohttp session binds to it.
+    """
+
+    def __init__(
+        self,
+        endpoint: Optional[str] = None,
+        database: Optional[str] = None,
+        pool_size: Optional[int] = None,
+    ):
+        load_dotenv()
+        self.endpoint = endpoint or os.getenv("CONFIGURATION__AZURECOSMOSDB__ENDPOINT")
+        self.database_name = database or os.getenv(
+            "CONFIGURATION__AZURECOSMOSDB__DATABASENAME", "cricketdb"
+        )
+        if not self.endpoint:
+            raise EnvironmentError("Cosmos DB endpoint not set.")
+        self.pool_size = pool_size or int(
+            os.getenv("CONFIGURATION__AZURECOSMOSDB__POOLSIZE", DEFAULT_POOL_SIZE)
+        )
+        # Imported here, not at module level: the local backend never needs
+        # them, and the import cost lands in the lifespan that builds this.
+        import aiohttp
+        from azure.core.pipeline.transport import AioHttpTransport
+        from azure.cosmos.aio import CosmosClient
+        from azure.identity.aio import DefaultAzureCredential
+
+        # One credential and one aiohttp connection pool per client.
+        self._credential = DefaultAzureCredential()
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.pool_size)
+        )
+        self.client = CosmosClient(
+            url=self.endpoint,
+            credential=self._credential,
+            transport=AioHttpTransport(session=self._session, session_owner=False),
+            # Reports each response's RU charge to `src.services.telemetry`.
+            raw_response_hook=record_response,
+        )
+        self.database = self.client.get_database_client(self.database_name)
+        self._containers: Dict[str, Any] = {}
+
+    def get_container(self, container_name: str) -> Any:
+        """Return a cached container client, creating it on first use."""
+        container = self._containers.get(container_name)
+        if container is None:
+            container = self.database.get_container_client(container_name)
+            self._containers[container_name] = container
+        return container
+
+    async def warm(self, container_names: Iterable[str] = CONTAINERS) -> None:
+        """Create container clients and load their metadata up front."""
+        for name in container_names:
+            await self.get_container(name).read()
+
+    async def close(self) -> None:
+        """Close the Cosmos client, credential and pooled connections."""
+        self._containers.clear()
+        await self.client.close()
+        await self._credential.close()
+        await self._session.close()
+
+    async def upsert_item(
+        self,
+        container_name: str,
+        item: Union[dict, BaseModel],
+        etag: Optional[str] = None,
+    ) -> dict:
+        """
+        Insert or replace a document. With `etag`, only the version with
+        that ETag is replaced; anything else raises a 412 error.
+        """
+        container = self.get_container(container_name)
+        condition: Dict[str, Any] = (
+            {"etag": etag, "match_condition": MatchConditions.IfNotModified}
+            if etag is not None
+            else {}
+        )
+        # Models are dumped once in JSON mode; dicts must already be JSON-ready.
+        return await container.upsert_item(to_document(item), **condition)
+
+    async def upsert_batch(
+        self,
+        container_name: str,
+        items: List[Union[dict, BaseModel]],
+        partition_key: str,
+    ) -> list:
+        """
+        Upsert items sharing one partition key as a transactional batch.
+
+        Cosmos applies the whole batch atomically in a single round trip and
+        accepts at most 100 operations per batch; callers chunk accordingly.
+        Raises CosmosBatchOperationError if any operation fails.
+        """
+        container = self.get_container(container_name)
+        operations = [("upsert", (to_document(item),)) for item in items]
+        return await container.execute_item_batch(
+            batch_operations=operations, partition_key=partition_key
+        )
+
+    async def read_item(
+        self, container_name: str, item_id: str, partition_key: str
+    ) -> dict:
+        container = self.get_container(container_name)
+        return await container.read_item(item=item_id, partition_key=partition_key)
+
+    async def get_item(self, container_name: str, item_id: str) -> Optional[dict]:
+        """
+        Fetch one document by id, or None if it does not exist.
+
+        When the partition key can be derived from the id this is a ~1 RU
+        point read; legacy ids fall back to a cross-partition query.
+        """
+        partition_key = partition_for_id(container_name, item_id)
+        if partition_key is not None:
+            try:
+                return await self.read_item(container_name, item_id, partition_key)
+            except CosmosResourceNotFoundError:
+                # Self-partitioned documents written before the partition
+                # field was stored live in the empty partition; query them.
+                if container_name not in SELF_PARTITIONED:
+                    return None
+        query = "SELECT * FROM c WHERE c.id = @id"
+        params = [{"name": "@id", "value": item_id}]
+        items = await self.query_items(container_name, query, params)
+        return items[0] if items else None
+
+    async def query_items(
+        self,
+        container_name: str,
+        query: str,
+        parameters: list = [],
+        partition_key: Optional[str] = None,
+    ) -> list:
+        container = self.get_container(container_name)
+        # The aio SDK runs cross-partition unless a partition key is given.
+        return [
+            item
+            async for item in container.query_items(
+                query=query, parameters=parameters, partition_key=partition_key
+            )
+        ]
+
+    async def query_page(
+        self,
+        container_name: str,
+        query: str,
+        parameters: list = [],
+        max_item_count: int = DEFAULT_PAGE_SIZE,
+        continuation: Optional[str] = None,
+        partition_key: Optional[str] = None,
+    ) -> Tuple[List[dict], Optional[str]]:
+        """
+        Fetch a single page of query results.
+
+        Returns the page items and the continuation token for the next page,
+        which is None once the query is exhausted.
+        """
+        container = self.get_container(container_name)
+        pager = container.query_items(
+            query=query,
+            parameters=parameters,
+            max_item_count=max_item_count,
+            partition_key=partition_key,
+        ).by_page(continuation)
+        try:
+            page = await pager.__anext__()
+        except StopAsyncIteration:
+            return [], None
+        items = [item async for item in page]
+        return items, pager.continuation_token
+
+    async def iter_items(
+        self,
+        container_name: str,
+        query: str,
+        parameters: list = [],
+        page_size: int = DEFAULT_PAGE_SIZE,
+        partition_key: Optional[str] = None,
+    ) -> AsyncIterator[dict]:
+        """Lazily yield query results, fetching one Cosmos page at a time."""
+        container = self.get_container(container_name)
+        async for item in container.query_items(
+            query=query,
+            parameters=parameters,
+            max_item_count=page_size,
+            partition_key=partition_key,
+        ):
+            yield item
+
+    async def read_changes(
+        self,
+        container_name: str,
+        continuation: Optional[str] = None,
+        max_item_count: int = DEFAULT_PAGE_SIZE,
+        start_time: str = "Beginning",
+    ) -> Tuple[List[dict], Optional[str]]:
+        """
+        Read the next page of the container's change feed (latest version).
+
+        Without a continuation token the feed is read from `start_time`:
+        `"Beginning"`, or `"Now"` for only the changes made from now on.
+        Returns the changed documents and the token to resume from.
+        """
+        container = self.get_container(container_name)
+        start: Dict[str, Any] = (
+            {"continuation": continuation}
+            if continuation
+            else {"start_time": start_time}
+        )
+        pager = container.query_items_change_feed(
+            max_item_count=max_item_count, **start
+        ).by_page()
+        try:
+            page = await pager.__anext__()
+            items = [item async for item in page]
+        except StopAsyncIteration:
+            items = []
+        # The pager's own token: the client's last response headers are shared
+        # with every other call in flight on this client.
+        return items, pager.continuation_token or continuation
+
+    async def delete_item(
+        self, container_name: str, item_id: str, partition_key: str
+    ) -> None:
+        container = self.get_container(container_name)
+        await container.delete_item(item=item_id, partition_key=partition_key)
+
+
+@lru_cache(maxsize=1)
+def create_async_db() -> Union[
+    AsyncCosmosDBClient,
+    "AsyncLocalCosmosDBClient",
+    InstrumentedCosmosClient,
+    "CachedCosmosClient",
+]:
+    """
+    Return the process-wide async client, creating it on first call.
+
+    First called from the FastAPI lifespan so the aiohttp session binds to
+    the server's event loop. With the local backend the async facade shares
+    the process-wide in-memory store with `get_db()`. Unless disabled, the
+    client is wrapped in the read-through cache from `src.services.cache`,
+    and calls that reach Cosmos are recorded by `src.services.telemetry`.
+    """
+    from src.services.cache import CachedCosmosClient, cache_enabled, create_cache
+    from src.services.cosmos import get_db
+    from src.services.cosmos_local import AsyncLocalCosmosDBClient, use_local_backend
+
+    client: Union[
+        AsyncCosmosDBClient, "AsyncLocalCosmosDBClient", InstrumentedCosmosClient
+    ]
+    if use_local_backend():
+        client = AsyncLocalCosmosDBClient(get_db())  # type: ignore[arg-type]
+    else:
+        client = AsyncCosmosDBClient()
+    if telemetry_enabled():
+        # Inside the cache: only calls that reach Cosmos are recorded.
+        client = InstrumentedCosmosClient(client)
+    if cache_enabled():
+        return CachedCosmosClient(client, create_cache())
+    return client
+
+
+# Dependency injection for FastAPI async routes. A coroutine so FastAPI
+# resolves it on the event loop; sync dependencies are run in the AnyIO
+# threadpool, which would cap concurrency at the pool size again. Tests can
+# swap the client with `app.dependency_overrides[get_async_db]`.
+async def get_async_db() -> Union[
+    AsyncCosmosDBClient,
+    "AsyncLocalCosmosDBClient",
+    InstrumentedCosmosClient,
+    "CachedCosmosClient",
+]:
+    return create_async_db()
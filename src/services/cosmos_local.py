@@ -0,0 +1,697 @@
+"""
+In-process stand-in for Azure Cosmos DB, for offline development,
+profiling and load testing.
+
+`LocalCosmosDBClient` implements the `CosmosDBClient` interface with
+partition-key semantics (documents are stored per partition, point reads
+need the right partition key), evaluates the parameterized `SELECT ...
+WHERE ... ORDER BY` queries the app issues, and simulates request-unit (RU)
+charges. Data lives in memory and can optionally be persisted to SQLite.
+
+Select it with `CONFIGURATION__AZURECOSMOSDB__BACKEND=local`; set
+`CONFIGURATION__AZURECOSMOSDB__LOCALPATH` to a file path to persist data
+between runs.
+"""
+
+import asyncio
+import bisect
+import json
+import operator
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+from uuid import uuid4
+
+from azure.cosmos.exceptions import (
+    CosmosAccessConditionFailedError,
+    CosmosBatchOperationError,
+    CosmosHttpResponseError,
+    CosmosResourceNotFoundError,
+)
+from dotenv import load_dotenv
+from pydantic import BaseModel
+
+from src.services.cosmos import CONTAINERS, DEFAULT_PAGE_SIZE
+from src.services.routing import PARTITION_KEYS, SELF_PARTITIONED, partition_for_id
+from src.services.serialization import dumps, loads, to_document
+from src.services.telemetry import add_request_charge
+
+# --- Simulated request-unit charges ---
+# Rough figures from the Cosmos DB capacity planner for ~1 KB documents.
+POINT_READ_RU = 1.0
+WRITE_RU_PER_KB = 5.5
+QUERY_BASE_RU = 2.3
+# Every physical partition a cross-partition query visits adds a round trip.
+QUERY_PARTITION_RU = 1.0
+QUERY_RU_PER_DOC_SCANNED = 0.02
+QUERY_RU_PER_DOC_RETURNED = 0.1
+# The stand-in models a container as this many physical partitions.
+PHYSICAL_PARTITIONS = 4
+
+
+def use_local_backend() -> bool:
+    """True when configuration selects the in-process backend."""
+    load_dotenv()
+    backend = os.getenv("CONFIGURATION__AZURECOSMOSDB__BACKEND", "azure")
+    return backend.lower() == "local"
+
+
+# --- Query parsing ---
+# Supports the subset of Cosmos SQL the app issues:
+#   SELECT * | SELECT c.a, c.b  FROM c
+#   WHERE <cond> [AND <cond> ...]  with conditions
+#       c.f <op> value          (op: =, !=, <>, <, <=, >, >=)
+#       c.f BETWEEN value AND value
+#       ARRAY_CONTAINS(value, c.f)
+#   ORDER BY c.f [ASC|DESC] [, ...]
+# where value is an @parameter or a string/number/boolean/null literal.
+
+_QUERY_RE = re.compile(
+    r"^\s*SELECT\s+(?P<select>.+?)\s+FROM\s+(?P<alias>\w+)"
+    r"(?:\s+WHERE\s+(?P<where>.+?))?"
+    r"(?:\s+ORDER\s+BY\s+(?P<order>.+?))?\s*$",
+    re.IGNORECASE | re.DOTALL,
+)
+_VALUE = r"(@\w+|'[^']*'|\"[^\"]*\"|-?\d+(?:\.\d+)?|true|false|null)"
+_FIELD = r"(\w+)\.(\w+)"
+_COMPARE_RE = re.compile(rf"^{_FIELD}\s*(=|!=|<>|<=|>=|<|>)\s*{_VALUE}", re.IGNORECASE)
+_BETWEEN_RE = re.compile(
+    rf"^{_FIELD}\s+BETWEEN\s+{_VALUE}\s+AND\s+{_VALUE}", re.IGNORECASE
+)
+_ARRAY_CONTAINS_RE = re.compile(
+    rf"^ARRAY_CONTAINS\s*\(\s*{_VALUE}\s*,\s*{_FIELD}\s*\)", re.IGNORECASE
+)
+_AND_RE = re.compile(r"^\s+AND\s+", re.IGNORECASE)
+
+_OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "=": operator.eq,
+    "!=": operator.ne,
+    "<>": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+_MISSING = object()
+
+Predicate = Callable[[dict], bool]
+
+
+def _resolve(token: str, params: Dict[str, Any]) -> Any:
+    """Turn a parameter reference or literal into a Python value."""
+    if token.startswith("@"):
+        if token not in params:
+            raise ValueError(f"Query parameter {token} not supplied")
+        return params[token]
+    if token[0] in "'\"":
+        return token[1:-1]
+    lowered = token.lower()
+    if lowered in ("true", "false"):
+        return lowered == "true"
+    if lowered == "null":
+        return None
+    return float(token) if "." in token else int(token)
+
+
+def _compare(op: Callable[[Any, Any], bool], left: Any, right: Any) -> bool:
+    """Compare like Cosmos: undefined or mismatched types never match."""
+    if left is _MISSING:
+        return False
+    try:
+        return bool(op(left, right))
+    except TypeError:
+        return False
+
+
+def _parse_where(where: str, alias: str, params: Dict[str, Any]) -> List[Predicate]:
+    """Parse AND-joined conditions into predicates over a document."""
+    predicates: List[Predicate] = []
+    rest = where.strip()
+    while rest:
+        if match := _BETWEEN_RE.match(rest):
+            _check_alias(match.group(1), alias)
+            field = match.group(2)
+            low = _resolve(match.group(3), params)
+            high = _resolve(match.group(4), params)
+            predicates.append(
+                lambda d, f=field, lo=low, hi=high: _compare(
+                    operator.ge, d.get(f, _MISSING), lo
+                )
+                and _compare(operator.le, d.get(f, _MISSING), hi)
+            )
+        elif match := _COMPARE_RE.match(rest):
+            _check_alias(match.group(1), alias)
+            field, op = match.group(2), _OPERATORS[match.group(3)]
+            value = _resolve(match.group(4), params)
+            predicates.append(
+                lambda d, f=field, o=op, v=value: _compare(o, d.get(f, _MISSING), v)
+            )
+        elif match := _ARRAY_CONTAINS_RE.match(rest):
+            _check_alias(match.group(2), alias)
+            values = _resolve(match.group(1), params)
+            field = match.group(3)
+            predicates.append(lambda d, f=field, vs=values: d.get(f, _MISSING) in vs)
+        else:
+            raise ValueError(f"Unsupported query condition: {rest!r}")
+        rest = rest[match.end() :]
+        if rest.strip():
+            and_match = _AND_RE.match(rest)
+            if not and_match:
+                raise ValueError(f"Expected AND in query near: {rest!r}")
+            rest = rest[and_match.end() :]
+    return predicates
+
+
+def _check_alias(name: str, alias: str) -> None:
+    if name != alias:
+        raise ValueError(f"Unknown collection alias {name!r}")
+
+
+class LocalQuery:
+    """A parsed query: projection, filter predicates and sort order."""
+
+    def __init__(self, query: str, parameters: Iterable[dict] = ()):
+        match = _QUERY_RE.match(query)
+        if not match:
+            raise ValueError(f"Unsupported query: {query!r}")
+        alias = match.group("alias")
+        params = {p["name"]: p["value"] for p in parameters}
+        select = match.group("select").strip()
+        self.fields: Optional[List[str]] = None
+        if select != "*":
+            self.fields = []
+            for part in select.split(","):
+                name, _, field = part.strip().partition(".")
+                _check_alias(name, alias)
+                self.fields.append(field)
+        where = match.group("where")
+        self.predicates = _parse_where(where, alias, params) if where else []
+        self.order: List[Tuple[str, bool]] = []
+        if match.group("order"):
+            for part in match.group("order").split(","):
+                tokens = part.split()
+                name, _, field = tokens[0].partition(".")
+                _check_alias(name, alias)
+                descending = len(tokens) > 1 and tokens[1].upper() == "DESC"
+                self.order.append((field, descending))
+
+    def matches(self, document: dict) -> bool:
+        return all(predicate(document) for predicate in self.predicates)
+
+    def run(self, documents: Iterable[dict]) -> List[dict]:
+        """Filter, sort and project `documents`."""
+        rows = [doc for doc in documents if self.matches(doc)]
+        # Like Cosmos, ORDER BY drops documents lacking the sort field.
+        for field, _ in self.order:
+            rows = [doc for doc in rows if field in doc]
+        for field, descending in reversed(self.order):
+            rows.sort(key=lambda doc, f=field: doc[f], reverse=descending)
+        if self.fields is not None:
+            rows = [{f: doc[f] for f in self.fields if f in doc} for doc in rows]
+        return rows
+
+
+def _detached(documents: Any) -> Any:
+    """
+    Deep copies of stored documents, as a client gets them off the wire,
+    so callers cannot change the store by mutating a result.
+    """
+    return loads(dumps(documents))
+
+
+def _continuation_offset(continuation: Optional[str]) -> int:
+    """A continuation token's integer position; 400 when it is not one."""
+    try:
+        start = int(continuation or 0)
+    except ValueError:
+        start = -1
+    if start < 0:
+        raise CosmosHttpResponseError(
+            status_code=400, message="Invalid continuation token"
+        )
+    return start
+
+
+class LocalCosmosDBClient:
+    """
+    Drop-in, in-process replacement for `CosmosDBClient`.
+
+    Thread-safe; every method charges simulated RUs, exposed through
+    `last_request_charge` and `total_request_charge`. `latency_ms` adds a
+    simulated network round trip to every call for load testing.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        latency_ms: float = 0.0,
+    ):
+        load_dotenv()
+        self.path = path or os.getenv("CONFIGURATION__AZURECOSMOSDB__LOCALPATH")
+        self.latency = latency_ms / 1000
+        self.last_request_charge = 0.0
+        self.total_request_charge = 0.0
+        self._lock = threading.RLock()
+        # container -> partition key value -> id -> document
+        self._data: Dict[str, Dict[Any, Dict[str, dict]]] = {
+            name: {} for name in CONTAINERS
+        }
+        # Change feed: container -> [(lsn, partition key, id)] in write order.
+        self._lsn = 0
+        self._feed: Dict[str, List[Tuple[int, Any, str]]] = {}
+        self._db: Optional[sqlite3.Connection] = None
+        if self.path:
+            self._open_sqlite(self.path)
+
+    # --- persistence ---
+
+    def _open_sqlite(self, path: str) -> None:
+        """Open (or create) the SQLite file and load its documents."""
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS documents ("
+            " container TEXT, pk TEXT, id TEXT, body TEXT,"
+            " PRIMARY KEY (container, pk, id))"
+        )
+        loaded: List[Tuple[int, str, Any, dict]] = []
+        for container, pk, item_id, body in self._db.execute(
+            "SELECT container, pk, id, body FROM documents"
+        ):
+            document = json.loads(body)
+            partition_value = json.loads(pk)
+            partition = self._data.setdefault(container, {}).setdefault(
+                partition_value, {}
+            )
+            partition[item_id] = document
+            loaded.append(
+                (document.get("_lsn", 0), container, partition_value, document)
+            )
+        # Rebuild the change feed in write order so checkpointed continuation
+        # tokens stay valid across restarts; documents saved without an LSN
+        # are numbered after the rest.
+        self._lsn = max((entry[0] for entry in loaded), default=0)
+        for lsn, container, partition_value, document in sorted(
+            loaded, key=lambda entry: entry[0] or float("inf")
+        ):
+            self._log(container, partition_value, document, lsn or None)
+
+    def _persist(self, container_name: str, pk: Any, document: dict) -> None:
+        if self._db is not None:
+            self._db.execute(
+                "INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?)",
+                (container_name, json.dumps(pk), document["id"], json.dumps(document)),
+            )
+            self._db.commit()
+
+    def _unpersist(self, container_name: str, pk: Any, item_id: str) -> None:
+        if self._db is not None:
+            self._db.execute(
+                "DELETE FROM documents WHERE container = ? AND pk = ? AND id = ?",
+                (container_name, json.dumps(pk), item_id),
+            )
+            self._db.commit()
+
+    # --- helpers ---
+
+    def _charge(self, request_units: float) -> None:
+        self.last_request_charge = round(request_units, 2)
+        self.total_request_charge += request_units
+        add_request_charge(request_units)
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _container(self, container_name: str) -> Dict[Any, Dict[str, dict]]:
+        if container_name not in self._data:
+            raise CosmosResourceNotFoundError(
+                status_code=404, message=f"Container {container_name} not found"
+            )
+        return self._data[container_name]
+
+    @staticmethod
+    def _partition_value(container_name: str, document: dict) -> Any:
+        return document.get(PARTITION_KEYS.get(container_name, "id"))
+
+    def _log(
+        self, container_name: str, pk: Any, document: dict, lsn: Optional[int] = None
+    ) -> dict:
+        """Append a write to the container's change feed, stamping `_lsn`."""
+        if lsn is None:
+            self._lsn += 1
+            lsn = self._lsn
+        document["_lsn"] = lsn
+        self._feed.setdefault(container_name, []).append((lsn, pk, document["id"]))
+        return document
+
+    def _store(self, container_name: str, document: dict) -> dict:
+        """Insert or replace a document, stamping Cosmos system fields."""
+        if "id" not in document:
+            raise CosmosHttpResponseError(status_code=400, message="Missing id")
+        stored = {
+            **document,
+            "_etag": f'"{uuid4()}"',
+            "_ts": int(time.time()),
+        }
+        pk = self._partition_value(container_name, stored)
+        self._log(container_name, pk, stored)
+        self._container(container_name).setdefault(pk, {})[stored["id"]] = stored
+        self._persist(container_name, pk, stored)
+        return stored
+
+    def _run_query(
+        self,
+        container_name: str,
+        query: str,
+        parameters: list,
+        partition_key: Optional[Any],
+    ) -> List[dict]:
+        """Evaluate a query and charge RUs for the partitions it scanned."""
+        parsed = LocalQuery(query, parameters)
+        container = self._container(container_name)
+        with self._lock:
+            if partition_key is not None:
+                documents = list(container.get(partition_key, {}).values())
+                partitions = 1
+            else:
+                documents = [d for p in container.values() for d in p.values()]
+                partitions = PHYSICAL_PARTITIONS
+        rows = _detached(parsed.run(documents))
+        self._charge(
+            QUERY_BASE_RU
+            + QUERY_PARTITION_RU * (partitions - 1)
+            + QUERY_RU_PER_DOC_SCANNED * len(documents)
+            + QUERY_RU_PER_DOC_RETURNED * len(rows)
+        )
+        return rows
+
+    # --- CosmosDBClient interface ---
+
+    def get_container(self, container_name: str) -> Dict[Any, Dict[str, dict]]:
+        return self._container(container_name)
+
+    def warm(self, container_names: Iterable[str] = CONTAINERS) -> None:
+        for name in container_names:
+            self._data.setdefault(name, {})
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def upsert_item(
+        self,
+        container_name: str,
+        item: Union[dict, BaseModel],
+        etag: Optional[str] = None,
+    ) -> dict:
+        """Insert or replace; with `etag`, only replace that version (else 412)."""
+        document = to_document(item)
+        with self._lock:
+            if etag is not None:
+                pk = self._partition_value(container_name, document)
+                current = (
+                    self._container(container_name).get(pk, {}).get(document.get("id"))
+                )
+                if current is None or current["_etag"] != etag:
+                    raise CosmosAccessConditionFailedError(
+                        status_code=412, message="Precondition failed"
+                    )
+            stored = self._store(container_name, document)
+        size_kb = len(json.dumps(document)) / 1024
+        self._charge(WRITE_RU_PER_KB * max(size_kb, 1.0))
+        return _detached(stored)
+
+    def upsert_batch(
+        self,
+        container_name: str,
+        items: List[Union[dict, BaseModel]],
+        partition_key: str,
+    ) -> list:
+        """Apply all upserts atomically, or none if any targets another partition."""
+        documents = [to_document(item) for item in items]
+        for index, document in enumerate(documents):
+            if self._partition_value(container_name, document) != partition_key:
+                raise CosmosBatchOperationError(
+                    error_index=index,
+                    headers={},
+                    status_code=400,
+                    message="Partition key of the item does not match the batch",
+                    operation_responses=[],
+                )
+        with self._lock:
+            results = [self._store(container_name, doc) for doc in documents]
+        size_kb = sum(len(json.dumps(doc)) for doc in documents) / 1024
+        self._charge(WRITE_RU_PER_KB * max(size_kb, len(documents)))
+        return _detached(results)
+
+    def read_item(self, container_name: str, item_id: str, partition_key: str) -> dict:
+        with self._lock:
+            document = (
+                self._container(container_name).get(partition_key, {}).get(item_id)
+            )
+        self._charge(POINT_READ_RU)
+        if document is None:
+            raise CosmosResourceNotFoundError(
+                status_code=404, message=f"Item {item_id} not found"
+            )
+        return _detached(document)
+
+    def get_item(self, container_name: str, item_id: str) -> Optional[dict]:
+        """Same routing as `CosmosDBClient.get_item`: point read if possible."""
+        partition_key = partition_for_id(container_name, item_id)
+        if partition_key is not None:
+            try:
+                return self.read_item(container_name, item_id, partition_key)
+            except CosmosResourceNotFoundError:
+                if container_name not in SELF_PARTITIONED:
+                    return None
+        query = "SELECT * FROM c WHERE c.id = @id"
+        params = [{"name": "@id", "value": item_id}]
+        items = self.query_items(container_name, query, params)
+        return items[0] if items else None
+
+    def query_items(
+        self,
+        container_name: str,
+        query: str,
+        parameters: list = [],
+        partition_key: Optional[str] = None,
+    ) -> list:
+        return self._run_query(container_name, query, parameters, partition_key)
+
+    def query_page(
+        self,
+        container_name: str,
+        query: str,
+        parameters: list = [],
+        max_item_count: int = DEFAULT_PAGE_SIZE,
+        continuation: Optional[str] = None,
+        partition_key: Optional[str] = None,
+    ) -> Tuple[List[dict], Optional[str]]:
+        """Return one page; the continuation token is the next row offset."""
+        start = _continuation_offset(continuation)
+        rows = self._run_query(container_name, query, parameters, partition_key)
+        end = start + max_item_count
+        return rows[start:end], (str(end) if end < len(rows) else None)
+
+    def iter_items(
+        self,
+        container_name: str,
+        query: str,
+        parameters: list = [],
+        page_size: int = DEFAULT_PAGE_SIZE,
+        partition_key: Optional[str] = None,
+    ) -> Iterator[dict]:
+        """Yield the results, running the query once rather than per page."""
+        yield from self._run_query(container_name, query, parameters, partition_key)
+
+    def read_changes(
+        self,
+        container_name: str,
+        continuation: Optional[str] = None,
+        max_item_count: int = DEFAULT_PAGE_SIZE,
+        start_time: str = "Beginning",
+    ) -> Tuple[List[dict], str]:
+        """
+        Read the next page of the container's change feed.
+
+        Mirrors Cosmos "latest version" mode: each changed document appears
+        once, at its most recent write, and deletes are not reported. The
+        continuation token is the last log sequence number (LSN) read.
+        Without one, reading starts at the beginning or, with `start_time`
+        `"Now"`, after the latest write.
+        """
+        start = _continuation_offset(continuation)
+        items: List[dict] = []
+        with self._lock:
+            if continuation is None and start_time == "Now":
+                start = self._lsn
+            container = self._container(container_name)
+            log = self._feed.get(container_name, [])
+            position = bisect.bisect_right(log, start, key=lambda entry: entry[0])
+            for lsn, pk, item_id in log[position:]:
+                if len(items) == max_item_count:
+                    break
+                start = lsn
+                document = container.get(pk, {}).get(item_id)
+                # Skip entries superseded by a later write or a delete.
+                if document is not None and document["_lsn"] == lsn:
+                    items.append(document)
+        self._charge(QUERY_BASE_RU + QUERY_RU_PER_DOC_RETURNED * len(items))
+        return _detached(items), str(start)
+
+    def delete_item(
+        self, container_name: str, item_id: str, partition_key: str
+    ) -> None:
+        with self._lock:
+            partition = self._container(container_name).get(partition_key, {})
+            removed = partition.pop(item_id, None)
+            if removed is not None:
+                self._unpersist(container_name, partition_key, item_id)
+        self._charge(WRITE_RU_PER_KB)
+        if removed is None:
+            raise CosmosResourceNotFoundError(
+                status_code=404, message=f"Item {item_id} not found"
+            )
+
+
+class AsyncLocalCosmosDBClient:
+    """
+    Async facade over `LocalCosmosDBClient`, matching `AsyncCosmosDBClient`.
+
+    Operations are in-memory, so they run inline on the event loop; the
+    simulated latency is awaited instead of slept so concurrent requests
+    overlap the way they would against real Cosmos. It defaults to
+    `CONFIGURATION__AZURECOSMOSDB__LOCALLATENCYMS` for API load tests.
+    """
+
+    def __init__(
+        self,
+        local: Optional[LocalCosmosDBClient] = None,
+        latency_ms: Optional[float] = None,
+    ):
+        self.local = local or LocalCosmosDBClient()
+        if latency_ms is None:
+            latency_ms = float(
+                os.getenv("CONFIGURATION__AZURECOSMOSDB__LOCALLATENCYMS", 0)
+            )
+        self.latency = latency_ms / 1000
+
+    async def _round_trip(self) -> None:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    def get_container(self, container_name: str) -> Any:
+        return self.local.get_container(container_name)
+
+    async def warm(self, container_names: Iterable[str] = CONTAINERS) -> None:
+        self.local.warm(container_names)
+
+    async def close(self) -> None:
+        self.local.close()
+
+    async def upsert_item(
+        self,
+        container_name: str,
+        item: Union[dict, BaseModel],
+        etag: Optional[str] = None,
+    ) -> dict:
+        await self._round_trip()
+        return self.local.upsert_item(container_name, item, etag)
+
+    async def upsert_batch(
+        self,
+        container_name: str,
+        items: List[Union[dict, BaseModel]],
+        partition_key: str,
+    ) -> list:
+        await self._round_trip()
+        return self.local.upsert_batch(container_name, items, partition_key)
+
+    async def read_item(
+        self, container_name: str, item_id: str, partition_key: str
+    ) -> dict:
+        await self._round_trip()
+        return self.local.read_item(container_name, item_id, partition_key)
+
+    async def get_item(self, container_name: str, item_id: str) -> Optional[dict]:
+        await self._round_trip()
+        return self.local.get_item(container_name, item_id)
+
+    async def query_items(
+        self,
+        container_name: str,
+        query: str,
+        parameters: list = [],
+        partition_key: Optional[str] = None,
+    ) -> list:
+        await self._round_trip()
+        return self.local.query_items(container_name, query, parameters, partition_key)
+
+    async def query_page(
+        self,
+        container_name: str,
+        query: str,
+        parameters: list = [],
+        max_item_count: int = DEFAULT_PAGE_SIZE,
+        continuation: Optional[str] = None,
+        partition_key: Optional[str] = None,
+    ) -> Tuple[List[dict], Optional[str]]:
+        await self._round_trip()
+        return self.local.query_page(
+            container_name,
+            query,
+            parameters,
+            max_item_count=max_item_count,
+            continuation=continuation,
+            partition_key=partition_key,
+        )
+
+    async def iter_items(
+        self,
+        container_name: str,
+        query: str,
+        parameters: list = [],
+        page_size: int = DEFAULT_PAGE_SIZE,
+        partition_key: Optional[str] = None,
+    ) -> AsyncIterator[dict]:
+        # One query, with a simulated round trip per page it is served in.
+        await self._round_trip()
+        rows = self.local.query_items(container_name, query, parameters, partition_key)
+        for start in range(0, len(rows), page_size):
+            if start:
+                await self._round_trip()
+            for item in rows[start : start + page_size]:
+                yield item
+
+    async def read_changes(
+        self,
+        container_name: str,
+        continuation: Optional[str] = None,
+        max_item_count: int = DEFAULT_PAGE_SIZE,
+        start_time: str = "Beginning",
+    ) -> Tuple[List[dict], str]:
+        await self._round_trip()
+        return self.local.read_changes(
+            container_name, continuation, max_item_count, start_time
+        )
+
+    async def delete_item(
+        self, container_name: str, item_id: str, partition_key: str
+    ) -> None:
+        await self._round_trip()
+        self.local.delete_item(container_name, item_id, partition_key)
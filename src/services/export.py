@@ -0,0 +1,254 @@
+"""
+Chunked table writers for data exports.
+
+A writer is fed rows one chunk at a time and returns the encoded bytes
+as it goes, so an export holds a single chunk in memory however many
+rows it has.
+
+- CSV: the header, then each chunk's lines.
+- Parquet: one row group per chunk, then the footer. Typed from the
+  document model, with ISO dates stored as dates.
+- XLSX: a zip archive cannot be written front to back, so xlsxwriter's
+  constant-memory mode spools the rows to a temporary file, which is sent
+  once the last row is in. Sheets roll over at Excel's row limit.
+
+pyarrow and xlsxwriter are imported only when their format is requested.
+"""
+
+import csv
+import io
+import tempfile
+from abc import ABC, abstractmethod
+from datetime import date
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Type,
+    Union,
+    get_args,
+    get_origin,
+)
+
+from pydantic import BaseModel
+
+# Bytes per chunk when sending a finished XLSX file.
+FILE_CHUNK_SIZE = 64 * 1024
+
+# Rows per Excel worksheet, the header included.
+XLSX_MAX_ROWS = 1_048_576
+
+# Separator for list fields, such as symptoms, in CSV and XLSX cells.
+LIST_SEPARATOR = "; "
+
+
+def _base_type(annotation: Any) -> Any:
+    """`Optional[X]` -> `X`; other annotations are returned as they are."""
+    if get_origin(annotation) is Union:
+        return next(arg for arg in get_args(annotation) if arg is not type(None))
+    return annotation
+
+
+def column_types(model: Type[BaseModel], columns: Sequence[str]) -> Dict[str, Any]:
+    """The model's type for each column, without `Optional`."""
+    return {name: _base_type(model.model_fields[name].annotation) for name in columns}
+
+
+def _cell(value: Any) -> Any:
+    """A CSV or XLSX cell: lists are joined, everything else is kept."""
+    if isinstance(value, list):
+        return LIST_SEPARATOR.join(map(str, value))
+    return value
+
+
+def _arrow_type(kind: Any) -> Any:
+    import pyarrow as pa
+
+    if get_origin(kind) in (list, List):
+        return pa.list_(_arrow_type(_base_type(get_args(kind)[0])))
+    types = {
+        bool: pa.bool_(),
+        int: pa.int64(),
+        float: pa.float64(),
+        date: pa.date32(),
+    }
+    return types.get(kind, pa.string())
+
+
+def arrow_schema(columns: Dict[str, Any]) -> Any:
+    """Arrow schema for `column_types` output; ISO dates become `date32`."""
+    import pyarrow as pa
+
+    return pa.schema([(name, _arrow_type(kind)) for name, kind in columns.items()])
+
+
+def arrow_table(schema: Any, rows: List[dict]) -> Any:
+    """Rows (JSON documents) as an Arrow table with `schema`'s columns."""
+    import pyarrow as pa
+
+    arrays = []
+    for field in schema:
+        values = [row.get(field.name) for row in rows]
+        if field.type == pa.date32():
+            values = [date.fromisoformat(v) if v else None for v in values]
+        arrays.append(pa.array(values, type=field.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+class ExportWriter(ABC):
+    """Encodes chunks of documents as one file in a single format."""
+
+    media_type = "application/octet-stream"
+    extension = ""
+
+    def __init__(self, columns: Dict[str, Any], title: str = "export"):
+        self.columns = columns
+        self.title = title
+
+    def start(self) -> bytes:
+        """Bytes to send before any row, such as a header."""
+        return b""
+
+    @abstractmethod
+    def write(self, rows: List[dict]) -> bytes:
+        """Encode a chunk of rows; return the bytes ready to send."""
+
+    def finish(self) -> Iterator[bytes]:
+        """The bytes left once every chunk is written."""
+        return iter(())
+
+
+class CsvWriter(ExportWriter):
+    media_type = "text/csv"
+    extension = "csv"
+
+    def __init__(self, columns: Dict[str, Any], title: str = "export"):
+        super().__init__(columns, title)
+        self._buffer = io.StringIO()
+        self._csv = csv.writer(self._buffer)
+
+    def _drain(self) -> bytes:
+        data = self._buffer.getvalue().encode()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return data
+
+    def start(self) -> bytes:
+        self._csv.writerow(self.columns)
+        return self._drain()
+
+    def write(self, rows: List[dict]) -> bytes:
+        self._csv.writerows(
+            [_cell(row.get(name)) for name in self.columns] for row in rows
+        )
+        return self._drain()
+
+
+class _ChunkSink(io.RawIOBase):
+    """A write-only stream whose contents are collected and emptied on demand."""
+
+    def __init__(self) -> None:
+        self._parts: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        self._parts.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+class ParquetWriter(ExportWriter):
+    media_type = "application/vnd.apache.parquet"
+    extension = "parquet"
+
+    def __init__(self, columns: Dict[str, Any], title: str = "export"):
+        import pyarrow.parquet as pq
+
+        super().__init__(columns, title)
+        self.schema = arrow_schema(columns)
+        self._sink = _ChunkSink()
+        self._writer = pq.ParquetWriter(self._sink, self.schema)
+
+    def write(self, rows: List[dict]) -> bytes:
+        self._writer.write_table(arrow_table(self.schema, rows))
+        return self._sink.drain()
+
+    def finish(self) -> Iterator[bytes]:
+        self._writer.close()
+        yield self._sink.drain()
+
+
+class XlsxWriter(ExportWriter):
+    media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    extension = "xlsx"
+
+    def __init__(self, columns: Dict[str, Any], title: str = "export"):
+        import xlsxwriter
+
+        super().__init__(columns, title)
+        self._file = tempfile.TemporaryFile()
+        self._workbook = xlsxwriter.Workbook(self._file, {"constant_memory": True})
+        self._date_format = self._workbook.add_format({"num_format": "yyyy-mm-dd"})
+        self._dates = [kind is date for kind in columns.values()]
+        self._sheets = 0
+        self._sheet: Optional[Any] = None
+        self._row = XLSX_MAX_ROWS
+
+    def _new_sheet(self) -> None:
+        self._sheets += 1
+        suffix = f" ({self._sheets})" if self._sheets > 1 else ""
+        self._sheet = self._workbook.add_worksheet(f"{self.title}{suffix}")
+        for col, is_date in enumerate(self._dates):
+            if is_date:
+                self._sheet.set_column(col, col, None, self._date_format)
+        self._sheet.write_row(0, 0, list(self.columns))
+        self._row = 1
+
+    def write(self, rows: List[dict]) -> bytes:
+        for row in rows:
+            if self._row >= XLSX_MAX_ROWS:
+                self._new_sheet()
+            assert self._sheet is not None
+            values = [row.get(name) for name in self.columns]
+            self._sheet.write_row(
+                self._row,
+                0,
+                [
+                    date.fromisoformat(v) if is_date and v else _cell(v)
+                    for v, is_date in zip(values, self._dates)
+                ],
+            )
+            self._row += 1
+        return b""
+
+    def finish(self) -> Iterator[bytes]:
+        if self._sheet is None:
+            self._new_sheet()
+        self._workbook.close()
+        self._file.seek(0)
+        try:
+            while data := self._file.read(FILE_CHUNK_SIZE):
+                yield data
+        finally:
+            self._file.close()
+
+
+WRITERS: Dict[str, Type[ExportWriter]] = {
+    "csv": CsvWriter,
+    "parquet": ParquetWriter,
+    "xlsx": XlsxWriter,
+}
@@ -0,0 +1,288 @@
+"""
+Background jobs run in a process pool, with their state in the `jobs`
+container.
+
+`JobManager.submit_retrain` stores a queued job document and runs
+`retrain` in a worker process. Training therefore neither blocks the
+event loop nor competes with it for the GIL. The worker reports each
+epoch over a queue, and the API process writes progress and metrics into
+the job document. `GET /jobs/{id}` serves that document with an ETag, so
+a poller mostly gets `304 Not Modified`. At most `max_jobs` jobs are
+queued or running at once; further submissions are refused.
+
+Jobs belong to the API process that started them, and the limit counts
+that process's jobs. The API runs as one uvicorn process (see
+`supervisord.conf`); with `--workers` each worker would allow `max_jobs`.
+A job cut short by a shutdown is marked `failed`, and `recover` marks
+failed any job a crashed process left queued or running.
+
+On success a `ModelRegistry` entry is written for the saved model. It is
+`candidate` unless activation was requested, in which case the inference
+service picks it up and the previously active entries are `archived`.
+
+Workers read training data with the synchronous Cosmos client. With the
+local stand-in they need `CONFIGURATION__AZURECOSMOSDB__LOCALPATH`, since
+each process otherwise starts with its own empty store. With the training
+source set to `snapshots` they read the columnar snapshots kept by
+`src.services.snapshots` instead, which are as fresh as its last export.
+
+Settings:
+- `CONFIGURATION__JOBS__MAXCONCURRENT` (default 1)
+- `CONFIGURATION__TRAINING__MODELDIR` (default `./models`)
+- `CONFIGURATION__TRAINING__BLOBCONTAINERURL`: upload models to Blob Storage
+- `CONFIGURATION__TRAINING__SOURCE`: `cosmos` (default) or `snapshots`
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timezone
+from typing import Any, Callable, Dict, Optional, Set
+
+from dotenv import load_dotenv
+
+from src.ml.inference import ACTIVE_MODEL_QUERY, DEFAULT_MODEL_NAME
+from src.services.cache import uncached
+from src.services.routing import make_id
+from src.services.serialization import strip_system_fields
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_JOBS = 1
+DEFAULT_MODEL_DIR = "./models"
+
+UNFINISHED_JOBS_QUERY = "SELECT * FROM c WHERE ARRAY_CONTAINS(@statuses, c.status)"
+
+
+class TooManyJobs(RuntimeError):
+    """The job limit is reached; try again once a job finishes."""
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def retrain(job_id: str, params: dict, events: Any) -> dict:
+    """
+    Train and save a model in a worker process; return its artifact and
+    final metrics. Epoch progress is put on `events`.
+    """
+    load_dotenv()
+    from src.ml.trainer import (
+        ArrowSource,
+        CosmosSource,
+        TrainConfig,
+        save_model,
+        train,
+        upload_artifact,
+    )
+    from src.services.cosmos import get_db
+    from src.services.snapshots import snapshot_dir
+
+    def parse(value: Optional[str]) -> Optional[date]:
+        return date.fromisoformat(value) if value else None
+
+    start, end = parse(params.get("start")), parse(params.get("end"))
+    source: Any
+    if os.getenv("CONFIGURATION__TRAINING__SOURCE", "cosmos").lower() == "snapshots":
+        source = ArrowSource(snapshot_dir(), start, end)
+    else:
+        source = CosmosSource(get_db(), start, end)
+    config = TrainConfig(
+        epochs=params["epochs"], validation_from=parse(params.get("validation_from"))
+    )
+
+    def on_epoch(epoch: int, metrics: Dict[str, float], throughput: dict) -> None:
+        events.put({"epoch": epoch, "metrics": metrics, "throughput": throughput})
+
+    result = train(source, config, on_epoch)
+    path = save_model(
+        result.model,
+        os.getenv("CONFIGURATION__TRAINING__MODELDIR", DEFAULT_MODEL_DIR),
+        params["version"],
+    )
+    container_url = os.getenv("CONFIGURATION__TRAINING__BLOBCONTAINERURL")
+    artifact = upload_artifact(path, container_url) if container_url else path
+    return {"artifact": artifact, "metrics": result.metrics}
+
+
+class JobManager:
+    """Runs jobs in worker processes and keeps their documents current."""
+
+    def __init__(
+        self,
+        db: Any,
+        max_jobs: int = DEFAULT_MAX_JOBS,
+        target: Callable[[str, dict, Any], dict] = retrain,
+    ):
+        self.db = db
+        self.max_jobs = max_jobs
+        self.target = target
+        self.model_name = os.getenv(
+            "CONFIGURATION__INFERENCE__MODELNAME", DEFAULT_MODEL_NAME
+        )
+        # Fresh interpreters: forking would copy the event loop's threads.
+        self._context = multiprocessing.get_context("spawn")
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._queues: Any = None
+        self._tasks: Set["asyncio.Task[None]"] = set()
+
+    def _start(self) -> None:
+        """Start the queue server and the pool on first use."""
+        if self._pool is None:
+            self._queues = self._context.Manager()
+            self._pool = ProcessPoolExecutor(self.max_jobs, mp_context=self._context)
+
+    async def _update(self, job: dict, **changes: Any) -> None:
+        job.update(changes, updated_at=_now())
+        await self.db.upsert_item("jobs", job)
+
+    async def submit_retrain(self, params: dict) -> dict:
+        """Queue a retraining job and return its document."""
+        if len(self._tasks) >= self.max_jobs:
+            raise TooManyJobs(f"{self.max_jobs} job(s) already queued or running")
+        job = {
+            "id": make_id("jobs", None),
+            "type": "retrain",
+            "status": "queued",
+            "params": params,
+            "epoch": 0,
+            "epochs": params["epochs"],
+            "progress": 0.0,
+            "history": [],
+            "created_at": _now(),
+        }
+        await self._update(job)
+        task = asyncio.create_task(self._run(job))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    async def _run(self, job: dict) -> None:
+        params = {**job["params"], "version": time.strftime("%Y%m%d%H%M%S")}
+        try:
+            result = await self._execute(job, params)
+            record = await self._register(params, result)
+        except asyncio.CancelledError:
+            await self._update(
+                job, status="failed", error="Interrupted", finished_at=_now()
+            )
+            raise
+        except Exception as exc:
+            logger.exception("Job %s failed", job["id"])
+            await self._update(
+                job, status="failed", error=repr(exc), finished_at=_now()
+            )
+            return
+        await self._update(
+            job,
+            status="succeeded",
+            progress=1.0,
+            metrics=result["metrics"],
+            artifact=result["artifact"],
+            model_registry_id=record["id"],
+            finished_at=_now(),
+        )
+
+    async def _execute(self, job: dict, params: dict) -> dict:
+        """Run the job's target in the pool, recording each epoch it reports."""
+        self._start()
+        assert self._pool is not None
+        events = self._queues.Queue()
+        future = asyncio.get_running_loop().run_in_executor(
+            self._pool, self.target, job["id"], params, events
+        )
+        await self._update(job, status="running", started_at=_now())
+
+        async def follow() -> None:
+            while True:
+                event = await asyncio.to_thread(events.get)
+                if event is None:
+                    return
+                await self._update(
+                    job,
+                    epoch=event["epoch"],
+                    progress=round(event["epoch"] / job["epochs"], 3),
+                    metrics=event["metrics"],
+                    throughput=event["throughput"],
+                    history=[*job["history"], event["metrics"]],
+                )
+
+        progress = asyncio.create_task(follow())
+        try:
+            return await future
+        finally:
+            # The target has returned, so every event is queued before this.
+            events.put(None)
+            await progress
+
+    async def _register(self, params: dict, result: dict) -> dict:
+        """Write the `ModelRegistry` entry for a trained model."""
+        metrics = result["metrics"]
+        record = {
+            "id": make_id("modelRegistry", self.model_name),
+            "model_name": self.model_name,
+            "model_id": self.model_name,
+            "version": params["version"],
+            "trained_at": date.today().isoformat(),
+            "accuracy": metrics.get("val_auc", metrics.get("auc")),
+            "notes": f"Retrained on sessions from {params.get('start') or 'the start'}"
+            f" to {params.get('end') or 'today'}",
+            "status": "active" if params.get("activate") else "candidate",
+            "artifact": result["artifact"],
+        }
+        await self.db.upsert_item("modelRegistry", record)
+        if params.get("activate"):
+            await self._archive_others(record["id"])
+        return record
+
+    async def _archive_others(self, active_id: str) -> None:
+        """Mark every other active entry of the model `archived`."""
+        previous = await uncached(self.db).query_items(
+            "modelRegistry",
+            ACTIVE_MODEL_QUERY,
+            [{"name": "@status", "value": "active"}],
+            partition_key=self.model_name,
+        )
+        for entry in previous:
+            if entry["id"] != active_id:
+                await self.db.upsert_item(
+                    "modelRegistry",
+                    {**strip_system_fields(entry), "status": "archived"},
+                )
+
+    async def recover(self) -> int:
+        """Mark failed the jobs left queued or running; return how many."""
+        jobs = await uncached(self.db).query_items(
+            "jobs",
+            UNFINISHED_JOBS_QUERY,
+            [{"name": "@statuses", "value": ["queued", "running"]}],
+        )
+        for job in jobs:
+            await self._update(
+                strip_system_fields(job),
+                status="failed",
+                error="Interrupted",
+                finished_at=_now(),
+            )
+        return len(jobs)
+
+    async def close(self) -> None:
+        # Jobs record their interruption while the event queues still exist.
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._queues.shutdown()
+            self._pool = None
+
+
+def create_job_manager(db: Any) -> JobManager:
+    load_dotenv()
+    max_jobs = int(os.getenv("CONFIGURATION__JOBS__MAXCONCURRENT", DEFAULT_MAX_JOBS))
+    return JobManager(db, max_jobs)
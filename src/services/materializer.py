@@ -0,0 +1,322 @@
+"""
+Background materialization of weekly `Metric` documents from sessions.
+
+A `MetricsMaterializer` follows new and updated sessions, works out which
+player-weeks they affect and recomputes only those with the ACWR engine in
+`src.ml.features`. Metric ids are derived from player and week, so upserting
+a recomputed week replaces the previous row and replaying changes is safe.
+
+Changes come from the Cosmos change feed (the in-process stand-in keeps one
+too). `PollingSource` is a fallback for backends without one: it walks the
+`_ts` timestamp with an ordinary query. The position reached is saved in
+the `leases` container after each page, so a restart resumes from there.
+
+Every API process (e.g. each uvicorn worker) starts a materializer, but
+only the holder of the lease works; the others stand by and take over
+once it stops renewing the lease.
+
+Configure with `CONFIGURATION__MATERIALIZER__MODE` (`feed`, `poll` or
+`off`) and `CONFIGURATION__MATERIALIZER__INTERVALSECONDS`.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+from uuid import uuid4
+
+from azure.cosmos.exceptions import CosmosAccessConditionFailedError
+from dotenv import load_dotenv
+
+from src.ml.features import ACUTE_DAYS, CHRONIC_DAYS, week_start, weekly_metrics
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait before polling again once the feed is drained.
+DEFAULT_INTERVAL_SECONDS = 5.0
+
+# Changed sessions processed per checkpoint.
+CHANGES_PER_PAGE = 1000
+
+# A session counts towards its own week's acute load and towards the
+# chronic window of that week and the three that follow.
+WEEKS_AFFECTED = CHRONIC_DAYS // ACUTE_DAYS
+
+# Players recomputed concurrently; bounds load on the connection pool.
+MAX_CONCURRENT_PLAYERS = 8
+
+# Cosmos DB limits a transactional batch to 100 operations.
+MAX_BATCH_SIZE = 100
+
+# Seconds a lease stays with its owner without being renewed. Owners renew
+# it on every poll, so this must be well above the polling interval.
+LEASE_SECONDS = 60
+
+# Writes may land a little after their `_ts` second has been read; the
+# polling cursor stays this far behind the clock so it does not skip them.
+POLL_SAFETY_SECONDS = 2
+
+SESSION_FIELDS_QUERY = (
+    "SELECT c.player_id, c.date, c.rpe, c.duration FROM c"
+    " WHERE c.date >= @from AND c.date <= @to"
+)
+
+
+def materializer_mode() -> str:
+    load_dotenv()
+    return os.getenv("CONFIGURATION__MATERIALIZER__MODE", "feed").lower()
+
+
+def affected_weeks(session_date: date, today: date) -> List[date]:
+    """Weeks (by Monday) whose metrics depend on a session on `session_date`."""
+    first = week_start(session_date)
+    current = week_start(today)
+    weeks = [first + timedelta(weeks=i) for i in range(WEEKS_AFFECTED)]
+    return [week for week in weeks if week <= current]
+
+
+class ChangeFeedSource:
+    """
+    Reads changed documents from the container's change feed, from
+    `start_time` (`"Beginning"` or `"Now"`) until there is a cursor.
+    """
+
+    def __init__(
+        self, db: Any, container_name: str = "sessions", start_time: str = "Beginning"
+    ):
+        self.db = db
+        self.container_name = container_name
+        self.start_time = start_time
+
+    async def read(self, cursor: Optional[str]) -> Tuple[List[dict], Optional[str]]:
+        return await self.db.read_changes(
+            self.container_name,
+            cursor,
+            max_item_count=CHANGES_PER_PAGE,
+            start_time=self.start_time,
+        )
+
+
+class PollingSource:
+    """
+    Reads changed documents by polling on `_ts`, for backends without a
+    change feed.
+
+    The cursor holds the last fully read second and the continuation of the
+    query in progress. Each pass reads documents newer than that second,
+    page by page, then advances it to the newest `_ts` seen. Without a
+    cursor it starts at the beginning, or with `start_time` `"Now"` at the
+    current second.
+    """
+
+    query = "SELECT * FROM c WHERE c._ts > @since ORDER BY c._ts ASC"
+
+    def __init__(
+        self, db: Any, container_name: str = "sessions", start_time: str = "Beginning"
+    ):
+        self.db = db
+        self.container_name = container_name
+        self.start_time = start_time
+
+    async def read(self, cursor: Optional[str]) -> Tuple[List[dict], Optional[str]]:
+        if cursor:
+            state = json.loads(cursor)
+        else:
+            since = int(time.time()) if self.start_time == "Now" else 0
+            state = {"since": since, "newest": since}
+        items, continuation = await self.db.query_page(
+            self.container_name,
+            self.query,
+            [{"name": "@since", "value": state["since"]}],
+            max_item_count=CHANGES_PER_PAGE,
+            continuation=state.get("continuation"),
+        )
+        newest = max([state["newest"], *(item["_ts"] for item in items)])
+        if continuation is None:
+            # Pass complete: documents from the last few seconds are read
+            # again next time in case more writes land in those seconds.
+            since = max(
+                state["since"], min(newest, int(time.time()) - POLL_SAFETY_SECONDS)
+            )
+            state = {"since": since, "newest": since}
+        else:
+            state = {**state, "newest": newest, "continuation": continuation}
+        return items, json.dumps(state)
+
+
+class LeaseLost(RuntimeError):
+    """Another process has taken the lease over."""
+
+
+class Checkpoint:
+    """
+    Position of a change processor, stored in the `leases` container.
+
+    The lease also elects one owner among the processes running the same
+    processor. `acquire` takes the lease when it is free or expired and
+    renews it for its owner. Writes are conditional on the lease's ETag, so
+    a process that lost the lease gets `LeaseLost` instead of overwriting
+    the new owner's position.
+    """
+
+    def __init__(self, db: Any, lease_id: str, lease_seconds: float = LEASE_SECONDS):
+        self.db = db
+        self.lease_id = lease_id
+        self.lease_seconds = lease_seconds
+        self.owner = uuid4().hex
+        self.continuation: Optional[str] = None
+        self._etag: Optional[str] = None
+
+    async def _write(self, continuation: Optional[str], etag: Optional[str]) -> None:
+        try:
+            lease = await self.db.upsert_item(
+                "leases",
+                {
+                    "id": self.lease_id,
+                    "continuation": continuation,
+                    "owner": self.owner,
+                    "expires_at": time.time() + self.lease_seconds,
+                    "updated_at": datetime.now(timezone.utc).isoformat(),
+                },
+                etag,
+            )
+        except CosmosAccessConditionFailedError:
+            self._etag = None
+            raise LeaseLost(self.lease_id)
+        self.continuation = continuation
+        self._etag = lease["_etag"]
+
+    async def acquire(self) -> bool:
+        """Take or renew the lease; False while another process holds it."""
+        lease = await self.db.get_item("leases", self.lease_id)
+        if lease is None:
+            # Two processes may both create it; the later write wins and
+            # the other loses the lease at its next write.
+            await self._write(None, None)
+            return True
+        if (
+            lease.get("owner") not in (None, self.owner)
+            and lease.get("expires_at", 0) > time.time()
+        ):
+            self._etag = None
+            return False
+        try:
+            await self._write(lease.get("continuation"), lease["_etag"])
+        except LeaseLost:
+            return False
+        return True
+
+    async def save(self, continuation: Optional[str]) -> None:
+        """Record the position reached, while the lease is still ours."""
+        if self._etag is None:
+            raise LeaseLost(self.lease_id)
+        await self._write(continuation, self._etag)
+
+
+class MetricsMaterializer:
+    """Keeps the `metrics` container in step with `sessions`."""
+
+    def __init__(
+        self,
+        db: Any,
+        source: Any,
+        checkpoint: Checkpoint,
+        interval: float = DEFAULT_INTERVAL_SECONDS,
+    ):
+        self.db = db
+        self.source = source
+        self.checkpoint = checkpoint
+        self.interval = interval
+        self.metrics_written = 0
+
+    async def _load_sessions(self, player_id: str, weeks: Set[date]) -> List[dict]:
+        """Fetch the sessions the 28-day windows of `weeks` cover."""
+        params = [
+            {"name": "@from", "value": (min(weeks) - timedelta(weeks=3)).isoformat()},
+            {"name": "@to", "value": (max(weeks) + timedelta(days=6)).isoformat()},
+        ]
+        return await self.db.query_items(
+            "sessions", SESSION_FIELDS_QUERY, params, partition_key=player_id
+        )
+
+    async def _write(self, player_id: str, metrics: List[dict]) -> None:
+        for i in range(0, len(metrics), MAX_BATCH_SIZE):
+            await self.db.upsert_batch(
+                "metrics", metrics[i : i + MAX_BATCH_SIZE], player_id
+            )
+
+    async def refresh(self, affected: Dict[str, Set[date]]) -> int:
+        """Recompute and upsert the given player-weeks; return rows written."""
+        if not affected:
+            return 0
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_PLAYERS)
+
+        async def load(player_id: str) -> List[dict]:
+            async with semaphore:
+                return await self._load_sessions(player_id, affected[player_id])
+
+        loaded = await asyncio.gather(*(load(player_id) for player_id in affected))
+        sessions = [row for rows in loaded for row in rows]
+        until = max(week for weeks in affected.values() for week in weeks)
+        by_player: Dict[str, List[dict]] = defaultdict(list)
+        # One vectorized pass over every affected player.
+        for metric in weekly_metrics(sessions, until=until):
+            if date.fromisoformat(metric["week"]) in affected[metric["player_id"]]:
+                by_player[metric["player_id"]].append(metric)
+
+        async def write(player_id: str, metrics: List[dict]) -> None:
+            async with semaphore:
+                await self._write(player_id, metrics)
+
+        await asyncio.gather(*(write(p, rows) for p, rows in by_player.items()))
+        return sum(len(rows) for rows in by_player.values())
+
+    async def poll_once(self) -> int:
+        """Process one page of changes and checkpoint; return changes read."""
+        if not await self.checkpoint.acquire():
+            return 0
+        changes, cursor = await self.source.read(self.checkpoint.continuation)
+        today = date.today()
+        affected: Dict[str, Set[date]] = defaultdict(set)
+        for session in changes:
+            session_date = date.fromisoformat(session["date"])
+            affected[session["player_id"]].update(affected_weeks(session_date, today))
+        self.metrics_written += await self.refresh(affected)
+        if cursor != self.checkpoint.continuation:
+            await self.checkpoint.save(cursor)
+        return len(changes)
+
+    async def run(self) -> None:
+        """Poll until cancelled, sleeping whenever the feed is drained."""
+        while True:
+            try:
+                if await self.poll_once():
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except LeaseLost:
+                logger.info("Metrics lease taken over by another process")
+            except Exception:
+                logger.exception("Metric materialization failed; retrying")
+            await asyncio.sleep(self.interval)
+
+
+def create_materializer(db: Any) -> Optional[MetricsMaterializer]:
+    """Build the materializer selected by configuration, or None if off."""
+    mode = materializer_mode()
+    if mode == "off":
+        return None
+    if mode not in ("feed", "poll"):
+        raise ValueError(f"Unknown materializer mode: {mode}")
+    source = ChangeFeedSource(db) if mode == "feed" else PollingSource(db)
+    interval = float(
+        os.getenv(
+            "CONFIGURATION__MATERIALIZER__INTERVALSECONDS", DEFAULT_INTERVAL_SECONDS
+        )
+    )
+    checkpoint = Checkpoint(db, f"metrics-materializer.{mode}")
+    return MetricsMaterializer(db, source, checkpoint, interval)
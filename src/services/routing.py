@@ -0,0 +1,72 @@
+"""
+Partition routing for Cosmos DB documents.
+
+Every container is partitioned on a field (see infra/main.bicep). A point
+read (`read_item`) costs ~1 RU but needs both the id and the partition key,
+whereas a `WHERE c.id = @id` query fans out to every physical partition.
+
+To always know the partition key from an id alone, new ids are
+partition-qualified: `<partition value>:<uuid4>`. Ids created before this
+scheme (bare uuids) cannot be routed and fall back to a query.
+"""
+
+from typing import Dict, Optional
+from uuid import UUID, uuid4
+
+# Partition key path per container, mirroring infra/main.bicep.
+PARTITION_KEYS: Dict[str, str] = {
+    "players": "team_id",
+    "teams": "team_id",
+    "sessions": "player_id",
+    "cycleLogs": "player_id",
+    "metrics": "player_id",
+    "injuries": "player_id",
+    "modelRegistry": "model_id",
+    "leases": "id",
+    "jobs": "id",
+}
+
+# Containers whose partition key value is the document's own id, so the id
+# needs no qualifier (a team, lease or job is the only document in its
+# partition).
+SELF_PARTITIONED = {"teams", "leases", "jobs"}
+
+ID_SEPARATOR = ":"
+
+# Characters Cosmos DB does not allow in a document id.
+_INVALID_ID_CHARS = set("/\\?#")
+
+
+def make_id(container_name: str, partition_value: Optional[str]) -> str:
+    """
+    Create a new document id that encodes its partition key value.
+
+    Falls back to a bare uuid when there is no partition value or when the
+    value contains characters Cosmos does not accept in ids.
+    """
+    new_id = str(uuid4())
+    if container_name in SELF_PARTITIONED:
+        return new_id
+    if not partition_value or _INVALID_ID_CHARS & set(partition_value):
+        return new_id
+    return f"{partition_value}{ID_SEPARATOR}{new_id}"
+
+
+def partition_for_id(container_name: str, item_id: str) -> Optional[str]:
+    """
+    Recover the partition key value from a document id.
+
+    Returns None for ids that do not carry a partition (legacy bare uuids),
+    in which case the caller must fall back to a cross-partition query.
+    """
+    if container_name in SELF_PARTITIONED:
+        return item_id
+    # rpartition: the uuid never contains the separator, the prefix may.
+    partition_value, sep, suffix = item_id.rpartition(ID_SEPARATOR)
+    if not sep or not partition_value:
+        return None
+    try:
+        UUID(suffix)
+    except ValueError:
+        return None
+    return partition_value
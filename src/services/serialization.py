@@ -0,0 +1,52 @@
+"""
+Single serialization path between pydantic models, Cosmos documents and
+HTTP responses.
+
+Writes dump models once in pydantic's JSON mode (dates become ISO strings
+inside pydantic-core), so no deepcopy or recursive Python walk is needed.
+Reads skip re-validating documents that Cosmos already stores in the
+model's shape: system properties are dropped and rows are encoded with
+orjson, a fast JSON encoder written in Rust.
+"""
+
+from typing import Any, Iterable, List, Union
+
+import orjson
+from pydantic import BaseModel
+
+# Properties Cosmos DB adds to every stored document (`_lsn` appears on
+# change feed results).
+SYSTEM_FIELDS = frozenset({"_rid", "_self", "_etag", "_attachments", "_ts", "_lsn"})
+
+
+def to_document(item: Union[BaseModel, dict]) -> dict:
+    """
+    Convert a model to a JSON-ready Cosmos document.
+
+    Dicts are passed through unchanged and must already be JSON-ready,
+    e.g. produced by `model_dump(mode="json")`.
+    """
+    if isinstance(item, BaseModel):
+        return item.model_dump(mode="json")
+    return item
+
+
+def strip_system_fields(document: dict) -> dict:
+    """Drop Cosmos system properties so only model fields are returned."""
+    return {k: v for k, v in document.items() if k not in SYSTEM_FIELDS}
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode to JSON bytes with orjson."""
+    return orjson.dumps(obj)
+
+
+def dumps_documents(documents: Iterable[dict]) -> bytes:
+    """Encode Cosmos documents as a JSON array without system properties."""
+    rows: List[dict] = [strip_system_fields(doc) for doc in documents]
+    return orjson.dumps(rows)
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decode JSON bytes or text with orjson."""
+    return orjson.loads(data)
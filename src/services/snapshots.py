@@ -0,0 +1,437 @@
+"""
+Columnar snapshots of player data for analytics and training.
+
+`SnapshotExporter` copies `sessions`, `cycleLogs`, `metrics` and
+`injuries` into Arrow IPC files on local disk, one file per container,
+team and week:
+
+    <root>/<container>/team=<team_id>/week=<monday>/data.arrow
+
+The layout is Hive-style, so `pyarrow.dataset` can also read a container
+directory with `partitioning="hive"`. Columns follow the container's model,
+with dates stored as dates. A player's team is their `team_id`; players
+without one are filed under `team=_unassigned`. Teams are followed
+through the `players` change feed, and a player not seen there yet is
+read when their first document is exported. When a player changes team,
+the rows already exported for them are moved to the new team's files.
+
+Exports are incremental. Each run reads the change feed of every
+container from the cursors saved in `<root>/_manifest.json`. Only the
+team-weeks a changed document falls in are rewritten: rows are merged by
+id, and each file is replaced atomically. The feed does not report
+deletes, and a document whose date is edited stays in its old week as
+well as its new one, so run with `--full` now and then to rebuild.
+
+`SnapshotStore` reads the files memory-mapped. The files are
+uncompressed, so a table's columns point straight into the page cache
+and nothing is copied or parsed until a column is used. Files replaced
+by a later export stay readable to anyone who has them mapped.
+
+Run one exporter per directory:
+    python -m src.services.snapshots --output ./snapshots --interval 300
+
+With the local stand-in the exporter needs
+`CONFIGURATION__AZURECOSMOSDB__LOCALPATH`, to read the API's data.
+
+Settings:
+- `CONFIGURATION__SNAPSHOTS__DIR` (default `./snapshots`)
+- `CONFIGURATION__SNAPSHOTS__ENABLED`: run the exporter under supervisord
+  (default false)
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import time
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+from urllib.parse import quote, unquote
+
+from dotenv import load_dotenv
+
+from src.ml.features import week_start
+from src.models.models import CycleLog, Injury, Metric, Session
+from src.services.export import arrow_schema, arrow_table, column_types
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SNAPSHOT_DIR = "./snapshots"
+
+# Snapshotted containers: their model and the date that picks the week.
+SNAPSHOT_CONTAINERS: Dict[str, Tuple[Any, str]] = {
+    "sessions": (Session, "date"),
+    "cycleLogs": (CycleLog, "period_start"),
+    "metrics": (Metric, "week"),
+    "injuries": (Injury, "date"),
+}
+
+# Team directory of players without a team.
+UNASSIGNED_TEAM = "_unassigned"
+
+MANIFEST_FILE = "_manifest.json"
+DATA_FILE = "data.arrow"
+
+# Changed documents read per change-feed page.
+CHANGES_PER_PAGE = 1000
+
+# Changed documents held before their files are rewritten and the cursor
+# saved. Larger values rewrite busy team-weeks less often on a first run.
+FLUSH_DOCUMENTS = 20_000
+
+
+def snapshot_dir() -> str:
+    load_dotenv()
+    return os.getenv("CONFIGURATION__SNAPSHOTS__DIR", DEFAULT_SNAPSHOT_DIR)
+
+
+def snapshot_schema(container_name: str) -> Any:
+    """Arrow schema of a container's snapshot files: its model's fields."""
+    model, _ = SNAPSHOT_CONTAINERS[container_name]
+    return arrow_schema(column_types(model, list(model.model_fields)))
+
+
+def read_file(path: str) -> Any:
+    """An Arrow IPC file as a table backed by a memory map, without copying."""
+    import pyarrow as pa
+
+    with pa.memory_map(path) as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+class SnapshotStore:
+    """Reads and writes the snapshot files under `root`."""
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or snapshot_dir()
+
+    def team_dir(self, container_name: str, team_id: str) -> str:
+        return os.path.join(
+            self.root, container_name, f"team={quote(team_id, safe='')}"
+        )
+
+    def path(self, container_name: str, team_id: str, week: date) -> str:
+        return os.path.join(
+            self.team_dir(container_name, team_id),
+            f"week={week.isoformat()}",
+            DATA_FILE,
+        )
+
+    def teams(self, container_name: str) -> List[str]:
+        """Teams with at least one file for the container."""
+        directory = os.path.join(self.root, container_name)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(
+            unquote(name.partition("=")[2])
+            for name in os.listdir(directory)
+            if name.startswith("team=")
+        )
+
+    def weeks(self, container_name: str, team_id: str) -> List[date]:
+        """Weeks with a file for the container and team."""
+        directory = self.team_dir(container_name, team_id)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(
+            date.fromisoformat(name.partition("=")[2])
+            for name in os.listdir(directory)
+            if name.startswith("week=")
+        )
+
+    def files(
+        self,
+        container_name: str,
+        team_ids: Optional[Iterable[str]] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> List[str]:
+        """Paths of the files for these teams (default: all) and weeks."""
+        first = week_start(start).isoformat() if start else ""
+        last = end.isoformat() if end else "9999-12-31"
+        paths = []
+        for team_id in self.teams(container_name) if team_ids is None else team_ids:
+            directory = self.team_dir(container_name, team_id)
+            if not os.path.isdir(directory):
+                continue
+            for name in sorted(os.listdir(directory)):
+                week = name.partition("=")[2]
+                if name.startswith("week=") and first <= week <= last:
+                    paths.append(os.path.join(directory, name, DATA_FILE))
+        return paths
+
+    def read_table(
+        self,
+        container_name: str,
+        team_ids: Optional[Iterable[str]] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> Any:
+        """
+        The container's rows for these teams and dates (inclusive) as one
+        Arrow table. Each file stays memory-mapped; only rows outside the
+        dates of a partly covered week are filtered into new buffers.
+        """
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        schema = snapshot_schema(container_name)
+        tables = [
+            read_file(path)
+            for path in self.files(container_name, team_ids, start, end)
+            if os.path.exists(path)
+        ]
+        table = pa.concat_tables(tables) if tables else schema.empty_table()
+        _, date_field = SNAPSHOT_CONTAINERS[container_name]
+        if start is not None and start != week_start(start):
+            table = table.filter(pc.field(date_field) >= start)
+        if end is not None and end.weekday() != 6:
+            table = table.filter(pc.field(date_field) <= end)
+        return table.select(list(columns)) if columns else table
+
+    def read_frame(self, container_name: str, **filters: Any) -> "pd.DataFrame":
+        """`read_table` as a pandas DataFrame, with dates as `datetime64`."""
+        return self.read_table(container_name, **filters).to_pandas(
+            date_as_object=False
+        )
+
+    def write_file(self, path: str, table: Any) -> None:
+        """Write `table` to `path`, replacing any previous file atomically."""
+        import pyarrow as pa
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f"{path}.tmp"
+        with pa.OSFile(temporary, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(temporary, path)
+
+    def remove_file(self, path: str) -> None:
+        """Delete a file and the directories it leaves empty."""
+        os.remove(path)
+        week_dir = os.path.dirname(path)
+        for directory in (week_dir, os.path.dirname(week_dir)):
+            try:
+                os.rmdir(directory)
+            except OSError:
+                break
+
+    def load_manifest(self) -> dict:
+        path = os.path.join(self.root, MANIFEST_FILE)
+        if not os.path.exists(path):
+            return {"cursors": {}, "teams": {}}
+        with open(path) as f:
+            return json.load(f)
+
+    def save_manifest(self, manifest: dict) -> None:
+        os.makedirs(self.root, exist_ok=True)
+        path = os.path.join(self.root, MANIFEST_FILE)
+        manifest["updated_at"] = datetime.now(timezone.utc).isoformat()
+        with open(f"{path}.tmp", "w") as f:
+            json.dump(manifest, f)
+        os.replace(f"{path}.tmp", path)
+
+    def clear(self) -> None:
+        """Delete every snapshot file and the manifest."""
+        for container_name in SNAPSHOT_CONTAINERS:
+            shutil.rmtree(os.path.join(self.root, container_name), ignore_errors=True)
+        manifest = os.path.join(self.root, MANIFEST_FILE)
+        if os.path.exists(manifest):
+            os.remove(manifest)
+
+
+class SnapshotExporter:
+    """Brings a `SnapshotStore` up to date from the Cosmos change feeds."""
+
+    def __init__(self, db: Any, store: SnapshotStore):
+        self.db = db
+        self.store = store
+        self.manifest = store.load_manifest()
+        self.files_written = 0
+
+    def _changes(self, container_name: str) -> Iterable[Tuple[List[dict], Any]]:
+        """Pages of changed documents, each with the cursor that follows it."""
+        cursor = self.manifest["cursors"].get(container_name)
+        while True:
+            items, cursor = self.db.read_changes(
+                container_name, cursor, max_item_count=CHANGES_PER_PAGE
+            )
+            if not items:
+                return
+            yield items, cursor
+
+    def _update_teams(self) -> None:
+        teams = self.manifest["teams"]
+        # Players who left each team, with rows possibly filed under it.
+        left: Dict[str, Set[str]] = defaultdict(set)
+        for players, cursor in self._changes("players"):
+            for player in players:
+                team_id = player.get("team_id") or UNASSIGNED_TEAM
+                previous = teams.get(player["id"])
+                if previous is not None and previous != team_id:
+                    left[previous].add(player["id"])
+                teams[player["id"]] = team_id
+            self.manifest["cursors"]["players"] = cursor
+        # Before the cursor is saved, so a move cut short is redone.
+        for team_id, player_ids in left.items():
+            moved = {pid for pid in player_ids if teams[pid] != team_id}
+            for container_name in SNAPSHOT_CONTAINERS:
+                self._move(container_name, team_id, moved)
+
+    def _move(self, container_name: str, team_id: str, player_ids: Set[str]) -> None:
+        """Refile the rows of `player_ids` under `team_id` with their new teams."""
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        if not player_ids:
+            return
+        teams = self.manifest["teams"]
+        for week in self.store.weeks(container_name, team_id):
+            path = self.store.path(container_name, team_id, week)
+            table = read_file(path)
+            leaving = pc.is_in(table["player_id"], pa.array(sorted(player_ids)))
+            if not pc.any(leaving).as_py():
+                continue
+            rows = table.filter(leaving)
+            for new_team in {teams[pid] for pid in rows["player_id"].to_pylist()}:
+                joining = [pid for pid in player_ids if teams[pid] == new_team]
+                self._merge(
+                    container_name,
+                    new_team,
+                    week,
+                    rows.filter(pc.is_in(rows["player_id"], pa.array(joining))),
+                )
+                self.files_written += 1
+            kept = table.filter(pc.invert(leaving))
+            if kept.num_rows:
+                self.store.write_file(path, kept)
+            else:
+                self.store.remove_file(path)
+            self.files_written += 1
+
+    def _team_of(self, player_id: str) -> str:
+        """
+        The player's team. A player created since `_update_teams` is read
+        from `players`; one that does not exist is unassigned, but not
+        remembered, in case they are created later.
+        """
+        teams = self.manifest["teams"]
+        if player_id not in teams:
+            player = self.db.get_item("players", player_id)
+            if player is None:
+                return UNASSIGNED_TEAM
+            teams[player_id] = player.get("team_id") or UNASSIGNED_TEAM
+        return teams[player_id]
+
+    def _merge(self, container_name: str, team_id: str, week: date, table: Any) -> int:
+        """Replace rows by id in one team-week file; return its row count."""
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        path = self.store.path(container_name, team_id, week)
+        if os.path.exists(path):
+            previous = read_file(path)
+            kept = previous.filter(pc.invert(pc.is_in(previous["id"], table["id"])))
+            table = pa.concat_tables([kept, table])
+        _, date_field = SNAPSHOT_CONTAINERS[container_name]
+        table = table.sort_by([("player_id", "ascending"), (date_field, "ascending")])
+        self.store.write_file(path, table)
+        return table.num_rows
+
+    def _flush(
+        self, container_name: str, pending: Dict[Tuple[str, date], Dict[str, dict]]
+    ) -> None:
+        schema = snapshot_schema(container_name)
+        for (team_id, week), documents in pending.items():
+            table = arrow_table(schema, list(documents.values()))
+            self._merge(container_name, team_id, week, table)
+        self.files_written += len(pending)
+        pending.clear()
+
+    def _checkpoint(self, container_name: str, cursor: Any) -> None:
+        self.manifest["cursors"][container_name] = cursor
+        self.store.save_manifest(self.manifest)
+
+    def export_container(self, container_name: str) -> int:
+        """Apply the container's changes since its cursor; return documents read."""
+        _, date_field = SNAPSHOT_CONTAINERS[container_name]
+        pending: Dict[Tuple[str, date], Dict[str, dict]] = defaultdict(dict)
+        held = read = 0
+        cursor = None
+        for documents, cursor in self._changes(container_name):
+            for document in documents:
+                team_id = self._team_of(document["player_id"])
+                week = week_start(date.fromisoformat(document[date_field]))
+                pending[team_id, week][document["id"]] = document
+            held += len(documents)
+            read += len(documents)
+            # The cursor is saved only once the changes before it are on disk.
+            if held >= FLUSH_DOCUMENTS:
+                self._flush(container_name, pending)
+                self._checkpoint(container_name, cursor)
+                held = 0
+        if held:
+            self._flush(container_name, pending)
+            self._checkpoint(container_name, cursor)
+        return read
+
+    def run_once(self) -> Dict[str, int]:
+        """Export every container's changes; return documents read per container."""
+        self._update_teams()
+        self.store.save_manifest(self.manifest)
+        return {name: self.export_container(name) for name in SNAPSHOT_CONTAINERS}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--output", help=f"default: {DEFAULT_SNAPSHOT_DIR}")
+    parser.add_argument(
+        "--full", action="store_true", help="delete the snapshot and rebuild it"
+    )
+    parser.add_argument(
+        "--interval", type=float, help="keep exporting, this many seconds apart"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    from src.services.cosmos import get_db
+    from src.services.cosmos_local import use_local_backend
+
+    if use_local_backend() and not os.getenv("CONFIGURATION__AZURECOSMOSDB__LOCALPATH"):
+        parser.error(
+            "the local backend needs CONFIGURATION__AZURECOSMOSDB__LOCALPATH"
+            " to read the API's data"
+        )
+
+    store = SnapshotStore(args.output)
+    if args.full:
+        store.clear()
+    exporter = SnapshotExporter(get_db(), store)
+    while True:
+        started = time.perf_counter()
+        counts = exporter.run_once()
+        logger.info(
+            "Exported changes %s, %d files written in total, in %.1f s",
+            counts,
+            exporter.files_written,
+            time.perf_counter() - started,
+        )
+        if args.interval is None:
+            break
+        time.sleep(args.interval)
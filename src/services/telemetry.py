@@ -0,0 +1,470 @@
+"""
+Request-charge and latency telemetry for Cosmos DB calls and API routes.
+
+`InstrumentedCosmosClient` wraps the async client and records every call
+it makes: latency, request units (RU), items returned or written and
+pages fetched. Calls are tagged by container, operation and query shape,
+which is the query text with its whitespace collapsed and any literals
+replaced by `?`. The wrapper sits inside the read-through cache, so cache
+hits cost no RU and are not counted here; `/cache/stats` counts them.
+
+Only the API's calls are recorded, since only the API serves the
+metrics. The synchronous client, which training workers and the snapshot
+exporter use in their own processes, is not instrumented.
+
+The RU charge is reported per HTTP response: by the async SDK client
+through `raw_response_hook` (see `record_response`), and by the local
+stand-in when it charges its simulated RUs. Each call runs in a context variable,
+so concurrent requests add their charges to their own call. A call that
+fetches several query pages adds up the charge of each page.
+
+The HTTP middleware (`src.api.telemetry`) times every route, and it tags
+each Cosmos call with the route that made it. `Telemetry.exposition`
+renders everything in the Prometheus text format. Calls slower than the
+threshold are logged and kept for `/metrics/internal/slow`.
+
+Settings:
+- `CONFIGURATION__TELEMETRY__ENABLED` (default true)
+- `CONFIGURATION__TELEMETRY__SLOWQUERYMS` (default 100)
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from src.services.cosmos import CONTAINERS, DEFAULT_PAGE_SIZE
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SLOW_QUERY_MS = 100.0
+
+# Recent slow calls kept for `/metrics/internal/slow`.
+SLOW_LOG_SIZE = 100
+
+# Histogram bucket upper bounds in seconds (the Prometheus client defaults).
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Route labels for requests that matched no route, and for calls made
+# outside any request (the materializer, the inference watcher).
+UNMATCHED_ROUTE = "<unmatched>"
+BACKGROUND_ROUTE = "<background>"
+
+_LITERALS = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|\b\d+(?:\.\d+)?\b")
+
+
+def telemetry_enabled() -> bool:
+    load_dotenv()
+    return os.getenv("CONFIGURATION__TELEMETRY__ENABLED", "true").lower() == "true"
+
+
+@lru_cache(maxsize=1024)
+def query_shape(query: str) -> str:
+    """The query with whitespace collapsed and literals replaced by `?`."""
+    return " ".join(_LITERALS.sub("?", query).split())
+
+
+@dataclass
+class Histogram:
+    counts: List[int] = field(default_factory=lambda: [0] * len(LATENCY_BUCKETS))
+    count: int = 0
+    sum: float = 0.0
+
+    def observe(self, seconds: float) -> None:
+        index = bisect_left(LATENCY_BUCKETS, seconds)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.count += 1
+        self.sum += seconds
+
+
+@dataclass
+class CallTotals:
+    calls: int = 0
+    errors: int = 0
+    request_charge: float = 0.0
+    items: int = 0
+    pages: int = 0
+
+
+@dataclass
+class CosmosCall:
+    """One client call in progress; response hooks add to it."""
+
+    container: str
+    operation: str
+    shape: str
+    started: float = field(default_factory=time.perf_counter)
+    request_charge: float = 0.0
+    pages: int = 0
+    items: int = 0
+
+
+# The call the current task is making, and the ASGI scope of the request it
+# serves (set by the HTTP middleware).
+_current_call: ContextVar[Optional[CosmosCall]] = ContextVar(
+    "cosmos_call", default=None
+)
+current_scope: ContextVar[Optional[dict]] = ContextVar("http_scope", default=None)
+
+
+def route_of(scope: Optional[dict]) -> str:
+    """The route template a request matched, such as `/players/{player_id}`."""
+    if scope is None:
+        return BACKGROUND_ROUTE
+    return getattr(scope.get("route"), "path", None) or UNMATCHED_ROUTE
+
+
+@contextmanager
+def charging(call: CosmosCall) -> Iterator[None]:
+    """Add the charges of responses received in this block to `call`."""
+    token = _current_call.set(call)
+    try:
+        yield
+    finally:
+        _current_call.reset(token)
+
+
+def add_request_charge(request_units: float, pages: int = 1) -> None:
+    """Add a response's RU charge to the current call, if there is one."""
+    call = _current_call.get()
+    if call is not None:
+        call.request_charge += request_units
+        call.pages += pages
+
+
+def record_response(response: Any) -> None:
+    """`raw_response_hook` for Cosmos SDK clients: charge each response."""
+    charge = response.http_response.headers.get("x-ms-request-charge")
+    if charge is not None:
+        add_request_charge(float(charge))
+
+
+class _Tracked:
+    """Context manager for `Telemetry.track`; a class, as it runs per call."""
+
+    __slots__ = ("telemetry", "call", "token")
+
+    def __init__(self, telemetry: "Telemetry", call: CosmosCall):
+        self.telemetry = telemetry
+        self.call = call
+
+    def __enter__(self) -> CosmosCall:
+        self.token = _current_call.set(self.call)
+        return self.call
+
+    def __exit__(self, exc_type: Any, exc: Any, traceback: Any) -> None:
+        _current_call.reset(self.token)
+        seconds = time.perf_counter() - self.call.started
+        self.telemetry.observe_call(self.call, seconds, exc_type is not None)
+
+
+class Telemetry:
+    """Process-wide Cosmos and route metrics, and the slow-call log."""
+
+    def __init__(self, slow_query_ms: float = DEFAULT_SLOW_QUERY_MS):
+        self.slow_query_seconds = slow_query_ms / 1000
+        self._lock = threading.Lock()
+        self._calls: Dict[Tuple[str, str, str], CallTotals] = defaultdict(CallTotals)
+        self._call_latency: Dict[Tuple[str, str], Histogram] = defaultdict(Histogram)
+        self._route_charge: Dict[str, float] = defaultdict(float)
+        self._requests: Dict[Tuple[str, str, int], int] = defaultdict(int)
+        self._request_latency: Dict[Tuple[str, str], Histogram] = defaultdict(Histogram)
+        self.slow: Deque[Dict[str, Any]] = deque(maxlen=SLOW_LOG_SIZE)
+
+    def track(self, container: str, operation: str, query: str = "") -> "_Tracked":
+        """Record one client call; set `items` on the call it yields."""
+        return _Tracked(
+            self, CosmosCall(container, operation, query_shape(query) if query else "")
+        )
+
+    def observe_call(self, call: CosmosCall, seconds: float, failed: bool) -> None:
+        route = route_of(current_scope.get())
+        with self._lock:
+            totals = self._calls[(call.container, call.operation, call.shape)]
+            totals.calls += 1
+            totals.errors += failed
+            totals.request_charge += call.request_charge
+            totals.items += call.items
+            totals.pages += call.pages
+            self._call_latency[(call.container, call.operation)].observe(seconds)
+            self._route_charge[route] += call.request_charge
+        if seconds >= self.slow_query_seconds:
+            entry = {
+                "at": datetime.now(timezone.utc).isoformat(),
+                "route": route,
+                "container": call.container,
+                "operation": call.operation,
+                "shape": call.shape,
+                "ms": round(seconds * 1000, 1),
+                "request_charge": round(call.request_charge, 2),
+                "items": call.items,
+                "pages": call.pages,
+                "failed": failed,
+            }
+            self.slow.append(entry)
+            logger.warning("Slow Cosmos call: %s", entry)
+
+    def observe_request(
+        self, method: str, route: str, status: int, seconds: float
+    ) -> None:
+        with self._lock:
+            self._requests[(method, route, status)] += 1
+            self._request_latency[(method, route)].observe(seconds)
+
+    def exposition(self) -> str:
+        """All metrics in the Prometheus text format (version 0.0.4)."""
+        with self._lock:
+            lines: List[str] = []
+            call_labels = ("container", "operation", "shape")
+            for name, kind, help_text, attribute in (
+                ("cosmos_requests_total", "counter", "Cosmos calls.", "calls"),
+                ("cosmos_errors_total", "counter", "Failed Cosmos calls.", "errors"),
+                (
+                    "cosmos_request_charge_total",
+                    "counter",
+                    "Request units charged.",
+                    "request_charge",
+                ),
+                ("cosmos_items_total", "counter", "Items read or written.", "items"),
+                ("cosmos_pages_total", "counter", "Responses fetched.", "pages"),
+            ):
+                lines += _header(name, kind, help_text)
+                lines += [
+                    _sample(name, zip(call_labels, key), getattr(totals, attribute))
+                    for key, totals in sorted(self._calls.items())
+                ]
+            lines += _histogram(
+                "cosmos_request_duration_seconds",
+                "Cosmos call latency.",
+                ("container", "operation"),
+                self._call_latency,
+            )
+            lines += _header(
+                "cosmos_route_request_charge_total",
+                "counter",
+                "Request units charged, by the API route that made the calls.",
+            )
+            lines += [
+                _sample("cosmos_route_request_charge_total", [("route", route)], ru)
+                for route, ru in sorted(self._route_charge.items())
+            ]
+            lines += _header("http_requests_total", "counter", "HTTP requests.")
+            lines += [
+                _sample(
+                    "http_requests_total",
+                    zip(("method", "route", "status"), map(str, key)),
+                    count,
+                )
+                for key, count in sorted(self._requests.items())
+            ]
+            lines += _histogram(
+                "http_request_duration_seconds",
+                "HTTP request latency, until the response body is sent.",
+                ("method", "route"),
+                self._request_latency,
+            )
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _sample(name: str, labels: Any, value: float) -> str:
+    rendered = ",".join(f'{key}="{_escape(str(val))}"' for key, val in labels)
+    return f"{name}{{{rendered}}} {value:g}" if rendered else f"{name} {value:g}"
+
+
+def _header(name: str, kind: str, help_text: str) -> List[str]:
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+
+
+def _histogram(
+    name: str,
+    help_text: str,
+    label_names: Tuple[str, ...],
+    histograms: Dict[Tuple[str, str], Histogram],
+) -> List[str]:
+    lines = _header(name, "histogram", help_text)
+    for key, histogram in sorted(histograms.items()):
+        labels = list(zip(label_names, key))
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS, histogram.counts):
+            cumulative += count
+            lines.append(
+                _sample(f"{name}_bucket", labels + [("le", f"{bound:g}")], cumulative)
+            )
+        lines.append(
+            _sample(f"{name}_bucket", labels + [("le", "+Inf")], histogram.count)
+        )
+        lines.append(_sample(f"{name}_sum", labels, histogram.sum))
+        lines.append(_sample(f"{name}_count", labels, histogram.count))
+    return lines
+
+
+@lru_cache(maxsize=1)
+def get_telemetry() -> Telemetry:
+    """Return the process-wide telemetry, configured from the environment."""
+    load_dotenv()
+    return Telemetry(
+        float(os.getenv("CONFIGURATION__TELEMETRY__SLOWQUERYMS", DEFAULT_SLOW_QUERY_MS))
+    )
+
+
+class InstrumentedCosmosClient:
+    """
+    Async Cosmos client that records every call in `Telemetry`.
+
+    Attributes not defined here (such as the stand-in's `local`) come from
+    the wrapped client.
+    """
+
+    def __init__(self, inner: Any, telemetry: Optional[Telemetry] = None):
+        self.inner = inner
+        self.telemetry = telemetry or get_telemetry()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.inner, name)
+
+    async def warm(self, container_names: List[str] = CONTAINERS) -> None:
+        await self.inner.warm(container_names)
+
+    async def close(self) -> None:
+        await self.inner.close()
+
+    async def upsert_item(
+        self, container_name: str, item: Any, etag: Optional[str] = None
+    ) -> dict:
+        with self.telemetry.track(container_name, "upsert_item") as call:
+            result = await self.inner.upsert_item(container_name, item, etag)
+            call.items = 1
+        return result
+
+    async def upsert_batch(
+        self, container_name: str, items: list, partition_key: str
+    ) -> list:
+        with self.telemetry.track(container_name, "upsert_batch") as call:
+            result = await self.inner.upsert_batch(container_name, items, partition_key)
+            call.items = len(items)
+        return result
+
+    async def delete_item(
+        self, container_name: str, item_id: str, partition_key: str
+    ) -> None:
+        with self.telemetry.track(container_name, "delete_item"):
+            await self.inner.delete_item(container_name, item_id, partition_key)
+
+    async def read_item(
+        self, container_name: str, item_id: str, partition_key: str
+    ) -> dict:
+        with self.telemetry.track(container_name, "read_item") as call:
+            result = await self.inner.read_item(container_name, item_id, partition_key)
+            call.items = 1
+        return result
+
+    async def get_item(self, container_name: str, item_id: str) -> Optional[dict]:
+        with self.telemetry.track(container_name, "get_item") as call:
+            result = await self.inner.get_item(container_name, item_id)
+            call.items = int(result is not None)
+        return result
+
+    async def query_items(
+        self,
+        container_name: str,
+        query: str,
+        parameters: list = [],
+        partition_key: Optional[str] = None,
+    ) -> list:
+        with self.telemetry.track(container_name, "query_items", query) as call:
+            result = await self.inner.query_items(
+                container_name, query, parameters, partition_key
+            )
+            call.items = len(result)
+        return result
+
+    async def query_page(
+        self,
+        container_name: str,
+        query: str,
+        parameters: list = [],
+        max_item_count: int = DEFAULT_PAGE_SIZE,
+        continuation: Optional[str] = None,
+        partition_key: Optional[str] = None,
+    ) -> Tuple[List[dict], Optional[str]]:
+        with self.telemetry.track(container_name, "query_page", query) as call:
+            items, token = await self.inner.query_page(
+                container_name,
+                query,
+                parameters,
+                max_item_count=max_item_count,
+                continuation=continuation,
+                partition_key=partition_key,
+            )
+            call.items = len(items)
+        return items, token
+
+    async def iter_items(
+        self,
+        container_name: str,
+        query: str,
+        parameters: list = [],
+        page_size: int = DEFAULT_PAGE_SIZE,
+        partition_key: Optional[str] = None,
+    ) -> AsyncIterator[dict]:
+        """
+        Stream query results. The call lasts until the stream is exhausted or
+        closed, so its latency includes the time the consumer takes.
+        """
+        call = CosmosCall(container_name, "iter_items", query_shape(query))
+        items = self.inner.iter_items(
+            container_name,
+            query,
+            parameters,
+            page_size=page_size,
+            partition_key=partition_key,
+        ).__aiter__()
+        failed = False
+        try:
+            while True:
+                # Charged per step: the context must not stay set across the
+                # yield, where the consumer runs.
+                with charging(call):
+                    try:
+                        item = await items.__anext__()
+                    except StopAsyncIteration:
+                        break
+                call.items += 1
+                yield item
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self.telemetry.observe_call(
+                call, time.perf_counter() - call.started, failed
+            )
+
+    async def read_changes(
+        self,
+        container_name: str,
+        continuation: Optional[str] = None,
+        max_item_count: int = DEFAULT_PAGE_SIZE,
+        start_time: str = "Beginning",
+    ) -> Tuple[List[dict], Optional[str]]:
+        with self.telemetry.track(container_name, "read_changes") as call:
+            items, token = await self.inner.read_changes(
+                container_name, continuation, max_item_count, start_time
+            )
+            call.items = len(items)
+        return items, token
@@ -2,24 +2,153 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 
+from typing import List, Optional
 
-def coach_view() -> None:
+from src.ui.data import (
+    AlertFeed,
+    debug_panel,
+    get_alert_feed,
+    get_fresh,
+    get_json,
+    post_json,
+    start_render,
+)
+
+TEAM_COLUMNS = {
+    "name": "Name",
+    "role": "Role",
+    "last_7_days_load": "Last 7d Load",
+    "acwr": "A:C Ratio",
+    "risk": "Risk",
+}
+
+# Seconds between redraws of the team table from the live alert feed; a
+# redraw reads memory, not the API.
+ALERT_REFRESH_SECONDS = 2
+
+# Seconds between job status polls while a job is queued or running.
+JOB_POLL_SECONDS = 2
+FINISHED_JOB_STATUSES = ("succeeded", "failed")
+
+
+def retrain_form(api_url: str) -> None:
+    """Form that starts a retraining job and remembers its id."""
+    with st.form("retrain_form"):
+        start = st.date_input("Sessions from", value=None)
+        end = st.date_input("Sessions to", value=None)
+        validation_from = st.date_input("Validate on weeks from", value=None)
+        epochs = st.slider("Epochs", min_value=1, max_value=20, value=5)
+        activate = st.checkbox("Serve the new model when training finishes")
+        submitted = st.form_submit_button("Start Model Retraining")
+    if not submitted:
+        return
+    payload = {
+        "start": start.isoformat() if start else None,
+        "end": end.isoformat() if end else None,
+        "validation_from": validation_from.isoformat() if validation_from else None,
+        "epochs": epochs,
+        "activate": activate,
+    }
+    resp = post_json(f"{api_url}/retrain", payload)
+    if resp.status_code == 202:
+        st.session_state["retrain_job"] = resp.json()["id"]
+    else:
+        st.error(resp.json().get("detail", "Could not start retraining"))
+
+
+def job_status(api_url: str, job_id: str) -> None:
+    """
+    Show a job's progress and metrics. While it is unfinished, only this
+    fragment reruns, every `JOB_POLL_SECONDS`; an unchanged job costs a 304.
+    """
+    finished = st.session_state.get("retrain_job_finished") == job_id
+
+    @st.fragment(run_every=None if finished else JOB_POLL_SECONDS)
+    def render() -> None:
+        job = get_fresh(f"{api_url}/jobs/{job_id}")
+        st.write(f"**Status:** {job['status'].capitalize()}")
+        st.progress(job["progress"], text=f"Epoch {job['epoch']}/{job['epochs']}")
+        if job["history"]:
+            st.line_chart(pd.DataFrame(job["history"]).rename_axis("Epoch"))
+        if job.get("metrics"):
+            st.write("**Latest metrics:**")
+            st.json(job["metrics"])
+        if job["status"] == "succeeded":
+            st.success(f"Model saved to {job['artifact']}")
+        elif job["status"] == "failed":
+            st.error(job.get("error") or "Retraining failed")
+        if job["status"] in FINISHED_JOB_STATUSES:
+            st.write(f"**Last Retrained:** {job['finished_at'][:19]}")
+            if not finished:
+                # A full rerun rebuilds the fragment without the poll timer.
+                st.session_state["retrain_job_finished"] = job_id
+                st.rerun()
+
+    render()
+
+
+def live_players(players: List[dict], feed: Optional[AlertFeed]) -> List[dict]:
+    """Summary rows with load, ACWR and risk taken from live statuses."""
+    statuses = feed.statuses() if feed else {}
+    rows = []
+    for player in players:
+        live = statuses.get(player["player_id"])
+        if live:
+            player = {
+                **player,
+                "last_7_days_load": live["last_7_days_load"],
+                "acwr": live["acwr"],
+                "risk": live["status"],
+            }
+        rows.append(player)
+    return rows
+
+
+@st.fragment(run_every=ALERT_REFRESH_SECONDS)
+def team_dashboard(
+    players: List[dict], feed: Optional[AlertFeed], filter_role: str
+) -> None:
+    """Player table and team summary, redrawn as alerts arrive."""
+    if feed is not None:
+        seen = st.session_state.get("alerts_seen", {}).get(feed.url)
+        alerts, received = feed.alerts_since(seen or 0)
+        # Alerts from before this session opened the team are not news.
+        for alert in alerts if seen is not None else []:
+            st.toast(alert["message"])
+        st.session_state.setdefault("alerts_seen", {})[feed.url] = received
+    df_filtered = pd.DataFrame(
+        live_players(players, feed), columns=list(TEAM_COLUMNS)
+    ).rename(columns=TEAM_COLUMNS)
+    if filter_role != "All":
+        df_filtered = df_filtered[df_filtered["Role"] == filter_role]
+    st.dataframe(df_filtered, width="stretch")
+    st.subheader("Team Summary")
+    st.bar_chart(df_filtered.set_index("Name")["Last 7d Load"])
+    avg_load = df_filtered["Last 7d Load"].mean()
+    red_flags = (df_filtered["Risk"] == "Red").sum()
+    yellow_flags = (df_filtered["Risk"] == "Yellow").sum()
+    st.metric("Average Load", f"{avg_load:.0f}")
+    st.metric("Red Flags", red_flags)
+    st.metric("Yellow Flags", yellow_flags)
+
+
+def coach_view(api_url: str) -> None:
     """Render the Coach UI: team dashboard, player profile and model retraining."""
-    roles = ["Batter", "Bowler", "All-rounder"]
-    player_names = [f"Player {i+1}" for i in range(12)]
-    player_roles = np.random.choice(roles, size=12)
-    last7_load = np.random.randint(80, 300, size=12)
-    acwr = np.round(np.random.uniform(0.8, 1.6, size=12), 2)
-    risk_status = ["Red" if x > 1.4 else "Yellow" if x > 1.2 else "Green" for x in acwr]
-    df = pd.DataFrame(
-        {
-            "Name": player_names,
-            "Role": player_roles,
-            "Last 7d Load": last7_load,
-            "A:C Ratio": acwr,
-            "Risk": risk_status,
-        }
-    )
+    started = start_render()
+    # Only names for the picker, not every team's player_ids.
+    teams = get_json(f"{api_url}/teams?fields=id,name")
+    team_names = {team["name"]: team["id"] for team in teams}
+    team_name = st.sidebar.selectbox("Team", list(team_names))
+    players: List[dict] = []
+    feed: Optional[AlertFeed] = None
+    if team_name is not None:
+        team_id = team_names[team_name]
+        players = get_json(f"{api_url}/teams/{team_id}/summary")["players"]
+        feed = get_alert_feed(api_url, team_id)
+    df = pd.DataFrame(players, columns=list(TEAM_COLUMNS))
+    df = df.rename(columns=TEAM_COLUMNS)
+    roles = sorted(df["Role"].dropna().unique())
+    player_names = df["Name"].fillna("Unknown player").tolist()
     tab = st.sidebar.radio(
         "Coach Menu", ["Team Dashboard", "Player Profile", "Model Retraining"]
     )
@@ -27,18 +156,7 @@ def coach_view() -> None:
         st.header("Team Dashboard")
         st.subheader("Player Table")
         filter_role = st.selectbox("Filter by Role", ["All"] + roles)
-        df_filtered = df.copy()
-        if filter_role != "All":
-            df_filtered = df_filtered[df_filtered["Role"] == filter_role]
-        st.dataframe(df_filtered, width="stretch")
-        st.subheader("Team Summary")
-        st.bar_chart(df_filtered.set_index("Name")["Last 7d Load"])
-        avg_load = df_filtered["Last 7d Load"].mean()
-        red_flags = (df_filtered["Risk"] == "Red").sum()
-        yellow_flags = (df_filtered["Risk"] == "Yellow").sum()
-        st.metric("Average Load", f"{avg_load:.0f}")
-        st.metric("Red Flags", red_flags)
-        st.metric("Yellow Flags", yellow_flags)
+        team_dashboard(players, feed, filter_role)
     elif tab == "Player Profile":
         st.header("Player Profile View")
         selected_player = st.selectbox("Select Player", player_names)
@@ -80,10 +198,8 @@ def coach_view() -> None:
 
         st.markdown("---")
         st.subheader(f"Add Manual Workload Entry for {selected_player}")
-        if "coach_workload_entries" not in st.session_state:
-            st.session_state["coach_workload_entries"] = {
-                name: [] for name in player_names
-            }
+        entries = st.session_state.setdefault("coach_workload_entries", {})
+        entries.setdefault(selected_player, [])
         with st.form("coach_workload_form_profile"):
             session_type_c = st.selectbox(
                 "Session Type", ["Training", "Match", "Other sport"]
@@ -130,26 +246,10 @@ def coach_view() -> None:
 
     elif tab == "Model Retraining":
         st.header("Model Retraining")
-        st.write("Trigger a model retraining job and view status.")
-        import time
-
-        if "retrain_status" not in st.session_state:
-            st.session_state["retrain_status"] = "Idle"
-            st.session_state["last_retrained"] = "Never"
-            st.session_state["retrain_log"] = []
-        if st.button("Start Model Retraining"):
-            st.session_state["retrain_status"] = "Running"
-            st.session_state["last_retrained"] = time.strftime("%Y-%m-%d %H:%M:%S")
-            st.session_state["retrain_log"] = ["Retraining started..."]
-        if st.session_state["retrain_status"] == "Running":
-            st.progress(70)
-            st.session_state["retrain_log"].append("Epoch 1/3: Loss=0.45")
-            st.session_state["retrain_log"].append("Epoch 2/3: Loss=0.39")
-            st.session_state["retrain_log"].append("Epoch 3/3: Loss=0.33")
-            st.session_state["retrain_log"].append("Model retraining complete.")
-            st.session_state["retrain_status"] = "Complete"
-        st.write(f"**Status:** {st.session_state['retrain_status']}")
-        st.write(f"**Last Retrained:** {st.session_state['last_retrained']}")
-        st.write("**Retraining Log:**")
-        for log_entry in st.session_state["retrain_log"]:
-            st.write(log_entry)
+        st.write("Retrain the injury-risk model in the background.")
+        retrain_form(api_url)
+        job_id = st.session_state.get("retrain_job")
+        if job_id:
+            job_status(api_url, job_id)
+
+    debug_panel(started)
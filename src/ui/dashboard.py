@@ -1,8 +1,4 @@
 import streamlit as st
-from src.ui.player_view import player_view
-from src.ui.coach_view import coach_view
-
-import requests  # type: ignore
 
 API_URL = "http://localhost:8000"
 
@@ -22,8 +18,14 @@ st.json(st.user)
 # Role selection (placeholder for Auth0 integration)
 role = st.sidebar.selectbox("Select your role", ["Player", "Coach"])
 
+# Views are imported once a role is picked: they pull in pandas, which the
+# login page does not need.
 if role == "Player":
+    from src.ui.player_view import player_view
+
     player_view(API_URL)
 
 if role == "Coach":
-    coach_view()
+    from src.ui.coach_view import coach_view
+
+    coach_view(API_URL)
@@ -0,0 +1,237 @@
+"""
+Data access for the Streamlit views.
+
+Streamlit reruns the whole script on every widget interaction, so the
+views load API data through this module instead of calling `requests`
+directly.
+
+- One pooled `requests.Session` per process keeps connections to the
+  API alive between reruns and users.
+- GET results are cached with `st.cache_data` for a TTL per resource.
+  After that they are revalidated with their ETag, so an unchanged
+  resource costs a `304` and no body.
+- `get_fresh` skips the cache for data that must be current, such as a
+  running job; it still revalidates with the ETag.
+- `post_json` invalidates the cached copies of the resource it wrote, so
+  the rerun after a form submit shows the new row.
+- Each fetch is timed. With `?debug=1` in the page URL, `debug_panel`
+  shows the timings and the time to render the page.
+- `get_alert_feed` follows a team's server-sent risk alerts in a
+  background thread, one per team and process. Views read the live
+  statuses from memory instead of polling the API.
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Tuple
+from urllib.parse import quote, urlsplit
+
+import requests  # type: ignore
+import streamlit as st
+from requests.adapters import HTTPAdapter  # type: ignore
+
+# Seconds a cached GET result is reused before asking the API again.
+TTLS: Dict[str, int] = {
+    "sessions": 30,
+    "cyclelogs": 30,
+    "metrics": 120,
+    "injuries": 120,
+    "dashboard": 30,
+    "summary": 60,
+}
+DEFAULT_TTL = 60
+
+# Resources whose cached copies also go stale when a resource is written.
+DEPENDENTS: Dict[str, Tuple[str, ...]] = {
+    "sessions": ("dashboard", "summary"),
+    "cyclelogs": ("dashboard",),
+    "metrics": ("dashboard",),
+    "injuries": ("dashboard",),
+}
+
+# Pooled connections to the API.
+POOL_SIZE = 8
+
+REQUEST_TIMEOUT = 10
+
+# An alert stream sends a keep-alive every 15 s; silence for longer than
+# this means the connection is dead and is reopened.
+ALERT_READ_TIMEOUT = 45
+ALERT_RECONNECT_SECONDS = 3
+# Recent alerts kept per team.
+ALERT_HISTORY = 50
+
+
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    """Return the process-wide HTTP session with a pooled adapter."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+@st.cache_resource
+def _etag_store() -> Dict[str, Tuple[str, Any]]:
+    """Last ETag and body seen per URL, for conditional GETs."""
+    return {}
+
+
+def resource_of(url: str) -> str:
+    """The resource a URL reads or writes: the last path segment."""
+    return urlsplit(url).path.rstrip("/").rsplit("/", 1)[-1]
+
+
+def _fetch(url: str) -> Any:
+    """GET `url`, sending the stored ETag and reusing its body on 304."""
+    etags = _etag_store()
+    cached = etags.get(url)
+    headers = {"If-None-Match": cached[0]} if cached else {}
+    resp = get_http_session().get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+    if resp.status_code == 304 and cached:
+        return cached[1]
+    resp.raise_for_status()
+    data = resp.json()
+    etag = resp.headers.get("ETag")
+    if etag:
+        etags[url] = (etag, data)
+    return data
+
+
+@st.cache_data(ttl=max(TTLS.values()), max_entries=512, show_spinner=False)
+def _cached_get(url: str, window: int, generation: int) -> Any:
+    """
+    Cached GET. `window` rolls over every TTL of the resource, and
+    `generation` moves on when the resource is invalidated; either change
+    misses the cache.
+    """
+    return _fetch(url)
+
+
+def _generations() -> Dict[str, int]:
+    return st.session_state.setdefault("data_generations", {})
+
+
+def _cache_key(url: str) -> Tuple[str, int, int]:
+    resource = resource_of(url)
+    ttl = TTLS.get(resource, DEFAULT_TTL)
+    return url, int(time.time() // ttl), _generations().get(resource, 0)
+
+
+def _timings() -> List[Dict[str, Any]]:
+    return st.session_state.setdefault("data_timings", [])
+
+
+def _record(url: str, seconds: float) -> None:
+    _timings().append({"request": urlsplit(url).path, "ms": round(seconds * 1000, 1)})
+
+
+def get_json(url: str) -> Any:
+    """Return the JSON body of `url`, from the cache when possible."""
+    start = time.perf_counter()
+    data = _cached_get(*_cache_key(url))
+    _record(url, time.perf_counter() - start)
+    return data
+
+
+def get_fresh(url: str) -> Any:
+    """Return the current JSON body of `url`, revalidating on every call."""
+    start = time.perf_counter()
+    data = _fetch(url)
+    _record(url, time.perf_counter() - start)
+    return data
+
+
+def invalidate(*resources: str) -> None:
+    """Drop this session's cached copies of `resources`."""
+    generations = _generations()
+    for resource in resources:
+        generations[resource] = generations.get(resource, 0) + 1
+
+
+def post_json(url: str, payload: dict) -> requests.Response:
+    """POST `payload` and invalidate the resource written to."""
+    resp = get_http_session().post(url, json=payload, timeout=REQUEST_TIMEOUT)
+    resource = resource_of(url)
+    invalidate(resource, *DEPENDENTS.get(resource, ()))
+    return resp
+
+
+def start_render() -> float:
+    """Mark the start of a page render and clear the previous timings."""
+    _timings().clear()
+    return time.perf_counter()
+
+
+def debug_panel(started: float) -> None:
+    """With `?debug=1` in the URL, show fetch timings and time to render."""
+    if st.query_params.get("debug") != "1":
+        return
+    with st.sidebar.expander("Debug: data loading", expanded=True):
+        st.metric("Time to render", f"{(time.perf_counter() - started) * 1000:.0f} ms")
+        st.table(_timings())
+
+
+class AlertFeed:
+    """A team's live risk statuses, kept current from its alert stream."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.connected = False
+        self._statuses: Dict[str, dict] = {}
+        self._alerts: Deque[Tuple[int, dict]] = deque(maxlen=ALERT_HISTORY)
+        self._received = 0
+        self._lock = threading.Lock()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self._listen()
+            except (requests.RequestException, ValueError):
+                pass
+            self.connected = False
+            time.sleep(ALERT_RECONNECT_SECONDS)
+
+    def _listen(self) -> None:
+        timeout = (REQUEST_TIMEOUT, ALERT_READ_TIMEOUT)
+        with requests.get(self.url, stream=True, timeout=timeout) as resp:
+            resp.raise_for_status()
+            resp.encoding = "utf-8"
+            self.connected = True
+            event, data = "message", []
+            for line in resp.iter_lines(decode_unicode=True):
+                if line.startswith("event:"):
+                    event = line[6:].strip()
+                elif line.startswith("data:"):
+                    data.append(line[5:].strip())
+                elif not line and data:
+                    self._handle(event, json.loads("\n".join(data)))
+                    event, data = "message", []
+
+    def _handle(self, event: str, message: dict) -> None:
+        with self._lock:
+            if event == "snapshot":
+                self._statuses = {p["player_id"]: p for p in message["players"]}
+            elif event == "alert":
+                self._statuses[message["player_id"]] = message
+                self._received += 1
+                self._alerts.append((self._received, message))
+
+    def statuses(self) -> Dict[str, dict]:
+        with self._lock:
+            return dict(self._statuses)
+
+    def alerts_since(self, seen: int) -> Tuple[List[dict], int]:
+        """Alerts received after the `seen`-th, and the count received."""
+        with self._lock:
+            return [a for n, a in self._alerts if n > seen], self._received
+
+
+@st.cache_resource(show_spinner=False)
+def get_alert_feed(api_url: str, team_id: str) -> AlertFeed:
+    """The process-wide alert feed of a team, started on first use."""
+    return AlertFeed(f"{api_url}/teams/{quote(team_id, safe='')}/alerts")
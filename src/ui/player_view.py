@@ -1,10 +1,35 @@
 import streamlit as st
-import requests  # type: ignore
 import pandas as pd
+from typing import Sequence
+from urllib.parse import quote
+
+from src.ui.data import debug_panel, get_json, post_json, start_render
+
+# Columns shown in the history tables; the API returns nothing else.
+SESSION_FIELDS = (
+    "date",
+    "session_type",
+    "duration",
+    "rpe",
+    "batting_minutes",
+    "bowling_overs",
+    "fielding_time",
+    "comment",
+)
+CYCLELOG_FIELDS = (
+    "period_start",
+    "symptoms",
+    "wellness",
+    "sleep",
+    "mood",
+    "soreness",
+    "comment",
+)
 
 
 def player_view(api_url: str) -> None:
     """Render the Player UI: workload input, cycle tracking and dashboard."""
+    started = start_render()
     tab = st.sidebar.radio(
         "Player Menu", ["Workload Tracking", "Cycle Tracking", "Dashboard"]
     )
@@ -45,15 +70,12 @@ def player_view(api_url: str) -> None:
                     "fielding_time": fielding_time,
                     "comment": comment,
                 }
-                resp = requests.post(f"{api_url}/sessions", json=payload)
+                resp = post_json(f"{api_url}/sessions", payload)
                 st.success(f"Session added: {resp.json()}")
         st.header("Previous sessions")
-        sessions = requests.get(f"{api_url}/sessions").json()
-        # Convert to DataFrame, drop player_id column, and show
+        sessions = get_json(player_url(api_url, "sessions", SESSION_FIELDS))
         if sessions:
-            df = pd.DataFrame(sessions)
-            df = CleanupPlayerData(df)
-            st.table(df)
+            st.table(pd.DataFrame(sessions))
         else:
             st.info("No sessions available.")
 
@@ -87,24 +109,31 @@ def player_view(api_url: str) -> None:
                     "soreness": soreness,
                     "comment": comment,
                 }
-                resp = requests.post(f"{api_url}/cyclelogs", json=payload)
+                resp = post_json(f"{api_url}/cyclelogs", payload)
                 st.success(f"CycleLog added: {resp.json()}")
         st.header("Previous cycle logs")
 
-        cyclelogs = requests.get(f"{api_url}/cyclelogs").json()
+        cyclelogs = get_json(player_url(api_url, "cyclelogs", CYCLELOG_FIELDS))
         if cyclelogs:
-            df = pd.DataFrame(cyclelogs)
-            df = CleanupPlayerData(df)
-            st.table(df)
+            st.table(pd.DataFrame(cyclelogs))
         else:
             st.info("No cycle logs available.")
 
     elif tab == "Dashboard":
         st.header("Player Dashboard")
-        sessions = requests.get(f"{api_url}/sessions").json()
-        metrics = requests.get(f"{api_url}/metrics").json()
-        injuries = requests.get(f"{api_url}/injuries").json()
-        cyclelogs = requests.get(f"{api_url}/cyclelogs").json()
+        data = get_json(player_url(api_url, "dashboard"))
+        summary = data["summary"]
+        load, chronic, acwr = st.columns(3)
+        load.metric("Load, last 7 days", summary["last_7_days_load"])
+        chronic.metric("Chronic weekly load", summary["chronic_load"])
+        acwr.metric("ACWR", summary["acwr"])
+        trend = pd.DataFrame(summary["rpe_trend"]).set_index("week")
+        st.subheader("Average RPE by week")
+        st.line_chart(trend["rpe"])
+        sessions = data["sessions"]
+        metrics = data["metrics"]
+        injuries = data["injuries"]
+        cyclelogs = data["cyclelogs"]
         st.subheader("Sessions")
         if sessions:
             df = pd.DataFrame(sessions)
@@ -134,6 +163,18 @@ def player_view(api_url: str) -> None:
         else:
             st.info("No cycle logs available.")
 
+    debug_panel(started)
+
+
+def player_url(api_url: str, resource: str, fields: Sequence[str] = ()) -> str:
+    """
+    Build the URL of the logged-in player's own, partition-scoped data,
+    projected to `fields` if any are given.
+    """
+    player_id = quote(str(st.user.name), safe="")
+    url = f"{api_url}/players/{player_id}/{resource}"
+    return f"{url}?fields={','.join(fields)}" if fields else url
+
 
 def CleanupPlayerData(df: pd.DataFrame) -> pd.DataFrame:
     if "id" in df.columns:
@@ -0,0 +1,47 @@
+"""
+Shared fixtures. The API runs on the in-process Cosmos stand-in, with the
+background materializer and alert engine off.
+"""
+
+import os
+
+import pytest
+
+os.environ["CONFIGURATION__AZURECOSMOSDB__BACKEND"] = "local"
+os.environ.pop("CONFIGURATION__AZURECOSMOSDB__LOCALPATH", None)
+os.environ["CONFIGURATION__MATERIALIZER__MODE"] = "off"
+os.environ["CONFIGURATION__ALERTS__MODE"] = "off"
+
+
+@pytest.fixture
+def client():
+    """A test client for the API, on an empty store."""
+    from fastapi.testclient import TestClient
+
+    from src.api.main import app
+    from src.services.cosmos import get_db
+
+    get_db.cache_clear()
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def session_row():
+    """Build a valid session body for a player and date."""
+
+    def build(player_id: str = "p1", day: str = "2024-05-01", **changes) -> dict:
+        return {
+            "player_id": player_id,
+            "date": day,
+            "session_type": "nets",
+            "duration": 60,
+            "rpe": 6,
+            "batting_minutes": 30,
+            "bowling_overs": 4,
+            "fielding_time": 10,
+            "comment": None,
+            **changes,
+        }
+
+    return build
@@ -0,0 +1,92 @@
+import asyncio
+from datetime import date
+
+from src.services.alerts import AlertBroker, RiskAlertEngine
+from src.services.cosmos_local import AsyncLocalCosmosDBClient
+from src.services.materializer import ChangeFeedSource
+
+TEAM = {"id": "t1", "team_id": "t1", "name": "Firsts", "player_ids": ["p1", "p2"]}
+
+
+async def engine_with_team():
+    db = AsyncLocalCosmosDBClient()
+    await db.upsert_item("teams", TEAM)
+    await db.upsert_item("players", {"id": "p1", "player_id": "p1", "name": "Asha"})
+    sources = {"sessions": ChangeFeedSource(db, "sessions", "Now")}
+    return db, RiskAlertEngine(db, sources)
+
+
+def test_broker_fans_out_per_team_and_drops_the_oldest():
+    async def main():
+        broker = AlertBroker(queue_size=2)
+        async with broker.subscribe("t1") as first, broker.subscribe(
+            "t1"
+        ) as second, broker.subscribe("t2") as other:
+            assert broker.subscribers("t1") == 2
+            for n in range(3):
+                broker.publish("t1", {"n": n})
+            for queue in (first, second):
+                assert [queue.get_nowait()["n"] for _ in range(2)] == [1, 2]
+            assert other.empty()
+        assert broker.subscribers("t1") == broker.subscribers("t2") == 0
+
+    asyncio.run(main())
+
+
+def test_watch_starts_with_a_snapshot_and_cleans_up_on_disconnect():
+    async def main():
+        _, engine = await engine_with_team()
+        async with engine.watch(TEAM) as queue:
+            snapshot = queue.get_nowait()
+            assert snapshot["type"] == "snapshot"
+            assert [player["status"] for player in snapshot["players"]] == [
+                "Green",
+                "Green",
+            ]
+            assert snapshot["players"][0]["name"] == "Asha"
+            assert engine.players_of == {"t1": ["p1", "p2"]}
+        assert engine.players_of == {}
+        assert engine.teams_of == {}
+        assert engine.status == {}
+
+    asyncio.run(main())
+
+
+def test_a_team_stays_watched_until_its_last_subscriber_leaves():
+    async def main():
+        _, engine = await engine_with_team()
+        async with engine.watch(TEAM):
+            async with engine.watch(TEAM):
+                pass
+            assert set(engine.status) == {"p1", "p2"}
+        assert engine.status == {}
+
+    asyncio.run(main())
+
+
+def test_a_status_change_is_published_to_watching_teams(session_row):
+    async def main():
+        db, engine = await engine_with_team()
+        # The engine's first poll places its cursor at the feed's end.
+        assert await engine.poll_once() == 0
+        async with engine.watch(TEAM) as queue:
+            queue.get_nowait()
+            # All of the load in the last week, none before: ACWR 4.
+            today = date.today().isoformat()
+            await db.upsert_item("sessions", {**session_row("p1", today), "id": "s1"})
+            await db.upsert_item("sessions", {**session_row("p3", today), "id": "s2"})
+            assert await engine.poll_once() == 2
+            alert = queue.get_nowait()
+            assert alert["type"] == "alert"
+            assert (alert["player_id"], alert["team_id"]) == ("p1", "t1")
+            assert (alert["previous_status"], alert["status"]) == ("Green", "Red")
+            assert alert["message"] == "Asha is in the high-risk zone this week"
+            assert alert["reasons"] == ["ACWR 4.00"]
+            # An unwatched player is not evaluated; an unchanged one is quiet.
+            assert "p3" not in engine.status
+            await db.upsert_item("sessions", {**session_row("p1", today), "id": "s3"})
+            assert await engine.poll_once() == 1
+            assert queue.empty()
+            assert engine.alerts_published == 1
+
+    asyncio.run(main())
@@ -0,0 +1,92 @@
+import asyncio
+import json
+
+from azure.cosmos.exceptions import CosmosBatchOperationError
+
+from src.api.bulk import MAX_BATCH_SIZE, bulk_upsert
+from src.models.models import Session
+
+
+def test_rows_get_results_in_order(client, session_row):
+    rows = [
+        session_row("p1"),
+        session_row("p1", rpe="hard"),
+        session_row("p2"),
+        {"player_id": "p2"},
+    ]
+    response = client.post("/sessions/bulk", json=rows)
+    assert response.status_code == 200
+    result = response.json()
+    assert (result["total"], result["succeeded"], result["failed"]) == (4, 2, 2)
+    assert [row["index"] for row in result["results"]] == [0, 1, 2, 3]
+    assert [row["status"] for row in result["results"]] == [
+        "upserted",
+        "invalid",
+        "upserted",
+        "invalid",
+    ]
+    assert result["results"][1]["error"].startswith("rpe:")
+    for row in result["results"][0::2]:
+        assert client.get(f"/sessions/{row['id']}").status_code == 200
+
+
+def test_ndjson_keeps_bad_lines_at_their_index(client, session_row):
+    body = "\n".join(
+        [json.dumps(session_row("p1")), "{not json", json.dumps(session_row("p2"))]
+    )
+    response = client.post(
+        "/sessions/bulk",
+        content=body,
+        headers={"content-type": "application/x-ndjson"},
+    )
+    results = response.json()["results"]
+    assert [row["status"] for row in results] == ["upserted", "invalid", "upserted"]
+
+
+def test_reimport_keeps_ids(client, session_row):
+    first = client.post("/sessions/bulk", json=[session_row()]).json()
+    row_id = first["results"][0]["id"]
+    second = client.post("/sessions/bulk", json=[session_row(id=row_id, rpe=8)]).json()
+    assert second["results"][0]["id"] == row_id
+    assert client.get(f"/sessions/{row_id}").json()["rpe"] == 8
+
+
+class FailingBatches:
+    """Fails the transactional batch of one partition at one operation."""
+
+    def __init__(self, partition_key, error_index):
+        self.partition_key = partition_key
+        self.error_index = error_index
+        self.batches = []
+
+    async def upsert_batch(self, container_name, items, partition_key):
+        self.batches.append((partition_key, len(items)))
+        if partition_key == self.partition_key:
+            raise CosmosBatchOperationError(
+                error_index=self.error_index,
+                headers={},
+                status_code=409,
+                message="Conflict",
+                operation_responses=[],
+            )
+        return items
+
+
+def test_failed_batch_reports_every_row(session_row):
+    db = FailingBatches("p1", error_index=1)
+    rows = [session_row("p1"), session_row("p2"), session_row("p1")]
+    result = asyncio.run(bulk_upsert(db, "sessions", Session, rows))
+    assert (result.succeeded, result.failed) == (1, 2)
+    statuses = [(row.index, row.status) for row in result.results]
+    assert statuses == [(0, "failed"), (1, "upserted"), (2, "failed")]
+    assert result.results[0].error == "Rolled back with its transactional batch"
+    assert result.results[1].error is None
+    assert result.results[2].error.endswith("Conflict")
+
+
+def test_partitions_are_split_into_batches(session_row):
+    db = FailingBatches(None, error_index=None)
+    rows = [session_row("p1") for _ in range(MAX_BATCH_SIZE + 1)]
+    result = asyncio.run(bulk_upsert(db, "sessions", Session, rows))
+    assert result.succeeded == MAX_BATCH_SIZE + 1
+    assert sorted(db.batches) == [("p1", 1), ("p1", MAX_BATCH_SIZE)]
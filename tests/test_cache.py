@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from src.services.cache import CachedCosmosClient, ResponseCache, query_window
+from src.services.cosmos_local import AsyncLocalCosmosDBClient
+
+QUERY = "SELECT * FROM c WHERE c.rpe >= @rpe"
+PARAMS = [{"name": "@rpe", "value": 0}]
+
+
+def test_writes_invalidate_only_their_partition(session_row):
+    async def main():
+        db = CachedCosmosClient(AsyncLocalCosmosDBClient())
+        for player_id in ("p1", "p2"):
+            await db.upsert_item(
+                "sessions", {**session_row(player_id), "id": player_id}
+            )
+
+        async def read_all():
+            return [
+                await db.query_items("sessions", QUERY, PARAMS, partition_key="p1"),
+                await db.query_items("sessions", QUERY, PARAMS, partition_key="p2"),
+                await db.read_item("sessions", "p1", "p1"),
+                await db.query_items("sessions", QUERY, PARAMS),
+            ]
+
+        await read_all()
+        stats = db.cache.stats
+        assert (stats.hits, stats.misses) == (0, 4)
+        await read_all()
+        assert (stats.hits, stats.misses) == (4, 4)
+
+        await db.upsert_item("sessions", {**session_row("p1", rpe=9), "id": "p1"})
+        p1, p2, item, everyone = await read_all()
+        # p2's query is still cached; p1's reads and the cross-partition
+        # query are read again and see the write.
+        assert (stats.hits, stats.misses) == (5, 7)
+        assert [row["rpe"] for row in p1] == [9]
+        assert item["rpe"] == 9
+        assert sorted(row["rpe"] for row in everyone) == [6, 9]
+        assert [row["rpe"] for row in p2] == [6]
+
+    asyncio.run(main())
+
+
+@pytest.mark.parametrize(
+    "container_name, document",
+    [
+        ("leases", {"id": "metrics", "continuation": "1"}),
+        ("jobs", {"id": "job", "status": "running"}),
+    ],
+)
+def test_uncached_containers(container_name, document):
+    async def main():
+        db = CachedCosmosClient(AsyncLocalCosmosDBClient())
+        await db.upsert_item(container_name, document)
+        assert await db.get_item(
+            container_name, document["id"]
+        ) == await db.inner.get_item(container_name, document["id"])
+        # Written behind the cache's back, so only an uncached read sees it.
+        await db.inner.upsert_item(container_name, {**document, "changed": True})
+        assert (await db.get_item(container_name, document["id"]))["changed"]
+        rows = await db.query_items(container_name, "SELECT * FROM c")
+        assert rows[0]["changed"]
+        assert db.cache.snapshot()["entries"] == 0
+        assert (db.cache.stats.hits, db.cache.stats.misses) == (0, 0)
+
+    asyncio.run(main())
+
+
+def test_window_queries_outlive_the_container_ttl(session_row):
+    async def main():
+        cache = ResponseCache(ttls={"sessions": 0.001})
+        db = CachedCosmosClient(AsyncLocalCosmosDBClient(), cache)
+        await db.upsert_item("sessions", {**session_row(), "id": "s1"})
+        other = [{"name": "@rpe", "value": 1}]
+        for _ in range(2):
+            await query_window(db, "sessions", QUERY, PARAMS, "p1")
+            await db.query_items("sessions", QUERY, other, partition_key="p1")
+            await asyncio.sleep(0.01)
+        # Only the window query is still cached after the container TTL.
+        assert (cache.stats.hits, cache.stats.misses) == (1, 3)
+
+        await db.upsert_item("sessions", {**session_row(rpe=9), "id": "s1"})
+        rows = await query_window(db, "sessions", QUERY, PARAMS, "p1")
+        assert [row["rpe"] for row in rows] == [9]
+        assert (cache.stats.hits, cache.stats.misses) == (1, 4)
+
+    asyncio.run(main())
@@ -0,0 +1,33 @@
+import pytest
+from azure.cosmos.exceptions import CosmosHttpResponseError
+
+from src.services.cosmos_local import LocalCosmosDBClient
+
+
+@pytest.mark.parametrize("token", ["abc", "-3"])
+def test_bad_continuation_tokens_are_rejected(token):
+    db = LocalCosmosDBClient()
+    for read in (
+        lambda: db.query_page("teams", "SELECT * FROM c", continuation=token),
+        lambda: db.read_changes("teams", token),
+    ):
+        with pytest.raises(CosmosHttpResponseError) as info:
+            read()
+        assert info.value.status_code == 400
+
+
+def test_results_are_copies():
+    db = LocalCosmosDBClient()
+    db.upsert_item(
+        "teams", {"id": "t1", "team_id": "t1", "name": "A", "player_ids": ["p1"]}
+    )
+    for read in (
+        lambda: db.query_items("teams", "SELECT * FROM c")[0],
+        lambda: db.read_item("teams", "t1", "t1"),
+        lambda: db.read_changes("teams")[0][0],
+    ):
+        document = read()
+        document["name"] = "B"
+        document["player_ids"].append("p2")
+    stored = db.read_item("teams", "t1", "t1")
+    assert (stored["name"], stored["player_ids"]) == ("A", ["p1"])
@@ -0,0 +1,30 @@
+def test_detail_route_etags(client, session_row):
+    session_id = client.post("/sessions", json=session_row()).json()["id"]
+    first = client.get(f"/sessions/{session_id}")
+    etag = first.headers["ETag"]
+    assert first.status_code == 200 and etag.startswith('"')
+
+    cached = client.get(f"/sessions/{session_id}", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["ETag"] == etag
+
+    # Re-importing the row under its id writes a new version.
+    client.post("/sessions/bulk", json=[session_row(id=session_id, rpe=9)])
+    changed = client.get(f"/sessions/{session_id}", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["rpe"] == 9
+    assert changed.headers["ETag"] not in (None, etag)
+
+
+def test_list_route_etags(client, session_row):
+    client.post("/sessions", json=session_row())
+    etag = client.get("/players/p1/sessions").headers["ETag"]
+    cached = client.get("/players/p1/sessions", headers={"If-None-Match": etag})
+    assert (cached.status_code, cached.content) == (304, b"")
+
+    client.post("/sessions", json=session_row(day="2024-05-02"))
+    changed = client.get("/players/p1/sessions", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert len(changed.json()) == 2
+    assert changed.headers["ETag"] != etag
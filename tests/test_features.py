@@ -0,0 +1,129 @@
+from datetime import date, timedelta
+
+import pytest
+
+from benchmarks.synthetic import Scale, generate
+from src.ml.features import (
+    LoadTracker,
+    PlayerLoadState,
+    current_loads,
+    weekly_metrics,
+    wellness_status,
+)
+
+
+def synthetic_sessions(seasons: int = 1) -> list:
+    scale = Scale(teams=1, players_per_team=3, seasons=seasons, seed=7)
+    return [doc for name, doc in generate(scale) if name == "sessions"]
+
+
+def incremental_weeks(sessions: list, method: str) -> dict:
+    """Each player's windows at the end of every week, from `PlayerLoadState`."""
+    weeks = {}
+    for player_id in dict.fromkeys(s["player_id"] for s in sessions):
+        days = sorted(
+            (date.fromisoformat(s["date"]), s["rpe"] * s["duration"])
+            for s in sessions
+            if s["player_id"] == player_id
+        )
+        state = PlayerLoadState()
+        monday = days[0][0] - timedelta(days=days[0][0].weekday())
+        position = 0
+        while position < len(days):
+            sunday = monday + timedelta(days=6)
+            while position < len(days) and days[position][0] <= sunday:
+                state.add(*days[position])
+                position += 1
+            if state.day is not None:
+                state.add(sunday, 0.0)
+                weeks[player_id, monday.isoformat()] = state.windows(method)
+            monday += timedelta(weeks=1)
+    return weeks
+
+
+@pytest.mark.parametrize("method", ["rolling", "ewma"])
+@pytest.mark.parametrize("seasons", [1, 2])
+def test_vectorized_and_incremental_agree(method, seasons):
+    # Two seasons leave a gap of about half a year between them.
+    sessions = synthetic_sessions(seasons)
+    incremental = incremental_weeks(sessions, method)
+    metrics = weekly_metrics(sessions, method)
+    assert len(metrics) == len(incremental)
+    for metric in metrics:
+        acute, chronic = incremental[metric["player_id"], metric["week"]]
+        assert metric["acute"] == round(acute)
+        assert metric["chronic"] == round(chronic)
+        expected = round(acute / chronic, 3) if chronic else 0.0
+        assert metric["acwr"] == pytest.approx(expected, abs=1e-3)
+
+
+def test_current_loads_match_the_incremental_state():
+    sessions = synthetic_sessions()
+    player_ids = list(dict.fromkeys(s["player_id"] for s in sessions))
+    today = date.fromisoformat(max(s["date"] for s in sessions)) - timedelta(weeks=3)
+    frame = current_loads(sessions, player_ids, today).set_index("player_id")
+    for player_id in player_ids:
+        state = PlayerLoadState()
+        for s in sorted(sessions, key=lambda s: s["date"]):
+            if s["player_id"] == player_id and s["date"] <= today.isoformat():
+                state.add(date.fromisoformat(s["date"]), s["rpe"] * s["duration"])
+        state.add(today, 0.0)
+        acute, chronic = state.windows()
+        row = frame.loc[player_id]
+        assert row["last_7_days_load"] == round(acute)
+        assert row["chronic_load"] == round(chronic)
+        assert row["acwr"] == state.acwr()
+
+
+def session(day: date, rpe: int = 5, duration: int = 60) -> dict:
+    return {
+        "player_id": "p1",
+        "date": day.isoformat(),
+        "rpe": rpe,
+        "duration": duration,
+    }
+
+
+def test_zero_chronic_load_gives_zero_acwr():
+    today = date(2024, 5, 31)
+    stale = [session(today - timedelta(days=40))]
+    row = current_loads(stale, ["p1", "p2"], today).to_dict("records")
+    assert [(r["chronic_load"], r["acwr"], r["risk"]) for r in row] == [
+        (0, 0.0, "Green"),
+        (0, 0.0, "Green"),
+    ]
+    state = PlayerLoadState()
+    state.add(today - timedelta(days=40), 300)
+    state.add(today, 0.0)
+    assert state.windows() == (0.0, 0.0)
+    assert state.acwr() == 0.0
+
+
+@pytest.mark.parametrize("gap", [28, 29, 60])
+def test_gaps_longer_than_the_chronic_window(gap):
+    first = date(2024, 3, 4)
+    tracker = LoadTracker()
+    tracker.observe(session(first, rpe=9, duration=120))
+    metric = tracker.observe(session(first + timedelta(days=gap)))
+    # Only the new session is left in either window.
+    assert (metric["acute"], metric["chronic"]) == (300, 75)
+    assert metric["acwr"] == 4.0
+    vectorized = weekly_metrics(
+        [session(first, rpe=9, duration=120), session(first + timedelta(days=gap))]
+    )
+    assert vectorized[-1]["acute"] == 300
+    assert vectorized[-1]["chronic"] == 75
+
+
+@pytest.mark.parametrize(
+    "scores, status",
+    [
+        ({"wellness": 5, "sleep": 5, "mood": 5, "soreness": 5}, "Green"),
+        ({"wellness": 4, "sleep": 5, "mood": 5, "soreness": 5}, "Yellow"),
+        ({"wellness": 5, "sleep": 3, "mood": 5, "soreness": 5}, "Red"),
+        ({"wellness": 5, "sleep": 5, "mood": 5, "soreness": 7}, "Yellow"),
+        ({}, "Green"),
+    ],
+)
+def test_wellness_status(scores, status):
+    assert wellness_status(scores) == status
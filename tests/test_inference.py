@@ -0,0 +1,79 @@
+import asyncio
+import os
+
+import numpy as np
+import pytest
+
+from src.ml.inference import InferenceService, LoadedModel, MicroBatcher
+from src.services.cosmos_local import AsyncLocalCosmosDBClient
+
+
+def test_a_bad_batch_fails_its_requests_not_the_batcher():
+    async def main():
+        batcher = MicroBatcher(max_batch_size=8, max_wait=0.05)
+        model = LoadedModel("m:1", "m", "1", "memory", lambda x: x.sum(axis=1))
+        task = asyncio.create_task(batcher.run(lambda: model))
+        # Rows of different widths cannot be concatenated into one batch.
+        requests = asyncio.gather(
+            batcher.submit(np.ones((1, 2))),
+            batcher.submit(np.ones((1, 3))),
+            return_exceptions=True,
+        )
+        results = await asyncio.wait_for(requests, 5)
+        assert all(isinstance(result, ValueError) for result in results)
+        _, output = await asyncio.wait_for(batcher.submit(np.ones((2, 3))), 5)
+        assert output.tolist() == [3.0, 3.0]
+        task.cancel()
+
+    asyncio.run(main())
+
+
+def registry_entry(version, status="active"):
+    return {
+        "id": f"m:{version}",
+        "model_id": "m",
+        "model_name": "m",
+        "version": version,
+        "status": status,
+        "artifact": f"m-{version}",
+    }
+
+
+def test_a_replaced_model_removes_its_download():
+    def loader(uri, directory):
+        with open(os.path.join(directory, "model.keras"), "w") as f:
+            f.write(uri)
+        return lambda x: x[:, 0]
+
+    async def main():
+        db = AsyncLocalCosmosDBClient()
+        service = InferenceService(db, "m", loader=loader)
+        await db.upsert_item("modelRegistry", registry_entry("1"))
+        assert await service.refresh()
+        first = service.active
+        assert os.listdir(first.workdir.name) == ["model.keras"]
+
+        await db.upsert_item("modelRegistry", registry_entry("1", "archived"))
+        await db.upsert_item("modelRegistry", registry_entry("2"))
+        assert await service.refresh()
+        assert service.active.version == "2"
+        assert not os.path.exists(first.workdir.name)
+        assert os.listdir(service.active.workdir.name) == ["model.keras"]
+
+    asyncio.run(main())
+
+
+def test_a_failed_load_removes_its_directory(tmp_path, monkeypatch):
+    monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+
+    def loader(uri, directory):
+        raise OSError("download failed")
+
+    async def main():
+        db = AsyncLocalCosmosDBClient()
+        await db.upsert_item("modelRegistry", registry_entry("1"))
+        with pytest.raises(OSError):
+            await InferenceService(db, "m", loader=loader).refresh()
+        assert os.listdir(tmp_path) == []
+
+    asyncio.run(main())
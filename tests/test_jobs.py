@@ -0,0 +1,34 @@
+import asyncio
+
+from src.services.cosmos_local import AsyncLocalCosmosDBClient
+from src.services.jobs import JobManager
+
+
+def test_recover_fails_unfinished_jobs():
+    async def main():
+        db = AsyncLocalCosmosDBClient()
+        for job_id, status in [("a", "queued"), ("b", "running"), ("c", "done")]:
+            await db.upsert_item("jobs", {"id": job_id, "status": status})
+        assert await JobManager(db).recover() == 2
+        jobs = {job_id: await db.get_item("jobs", job_id) for job_id in "abc"}
+        assert [jobs[job_id]["status"] for job_id in "abc"] == [
+            "failed",
+            "failed",
+            "done",
+        ]
+        assert jobs["a"]["error"] == "Interrupted"
+
+    asyncio.run(main())
+
+
+def test_a_failed_recovery_does_not_block_startup(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from src.api.main import app
+
+    async def recover(self):
+        raise RuntimeError("jobs container unavailable")
+
+    monkeypatch.setattr(JobManager, "recover", recover)
+    with TestClient(app) as client:
+        assert client.get("/players").status_code == 200
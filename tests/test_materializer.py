@@ -0,0 +1,99 @@
+import asyncio
+from datetime import date, timedelta
+
+import pytest
+
+from src.ml.features import week_start
+from src.services.cosmos_local import AsyncLocalCosmosDBClient
+from src.services.materializer import (
+    ChangeFeedSource,
+    Checkpoint,
+    LeaseLost,
+    MetricsMaterializer,
+    affected_weeks,
+)
+from src.services.serialization import strip_system_fields
+
+TODAY = date.today()
+
+
+def materializer(db, lease_id: str = "metrics") -> MetricsMaterializer:
+    return MetricsMaterializer(db, ChangeFeedSource(db), Checkpoint(db, lease_id))
+
+
+async def drain(metrics: MetricsMaterializer) -> None:
+    while await metrics.poll_once():
+        pass
+
+
+async def seed(db, session_row, weeks: int = 10) -> None:
+    for week in range(weeks):
+        day = week_start(TODAY) - timedelta(weeks=week)
+        row = session_row(day=day.isoformat(), rpe=4 + week % 5)
+        await db.upsert_item("sessions", {**row, "id": f"p1:{week}"})
+
+
+async def stored_metrics(db) -> dict:
+    rows = await db.query_items("metrics", "SELECT * FROM c", partition_key="p1")
+    return {row["id"]: strip_system_fields(row) for row in rows}
+
+
+def test_a_change_recomputes_only_the_weeks_it_affects(session_row):
+    async def main():
+        db = AsyncLocalCosmosDBClient()
+        await seed(db, session_row)
+        metrics = materializer(db)
+        await drain(metrics)
+        _, cursor = await db.read_changes("metrics", start_time="Now")
+
+        day = week_start(TODAY) - timedelta(weeks=6)
+        edited = session_row(day=day.isoformat(), rpe=10)
+        await db.upsert_item("sessions", {**edited, "id": "p1:6"})
+        written = metrics.metrics_written
+        await drain(metrics)
+
+        changed, _ = await db.read_changes("metrics", cursor)
+        weeks = sorted(row["week"] for row in changed)
+        expected = [week.isoformat() for week in affected_weeks(day, TODAY)]
+        assert weeks == expected
+        assert len(weeks) == metrics.metrics_written - written <= 4
+
+    asyncio.run(main())
+
+
+def test_replaying_a_page_changes_nothing(session_row):
+    async def main():
+        db = AsyncLocalCosmosDBClient()
+        await seed(db, session_row)
+        metrics = materializer(db)
+        assert await metrics.checkpoint.acquire()
+        start = metrics.checkpoint.continuation
+        await drain(metrics)
+        first = await stored_metrics(db)
+
+        await metrics.checkpoint.save(start)
+        await drain(metrics)
+        assert await stored_metrics(db) == first
+
+    asyncio.run(main())
+
+
+def test_one_process_holds_the_lease():
+    async def main():
+        db = AsyncLocalCosmosDBClient()
+        first = Checkpoint(db, "metrics", lease_seconds=0.05)
+        second = Checkpoint(db, "metrics", lease_seconds=0.05)
+        assert await first.acquire()
+        assert not await second.acquire()
+        with pytest.raises(LeaseLost):
+            await second.save("1")
+
+        await asyncio.sleep(0.1)
+        assert await second.acquire()
+        await second.save("2")
+        with pytest.raises(LeaseLost):
+            await first.save("3")
+        assert not await first.acquire()
+        assert (await db.get_item("leases", "metrics"))["continuation"] == "2"
+
+    asyncio.run(main())
@@ -0,0 +1,28 @@
+from datetime import date, timedelta
+
+from src.api.players import dashboard_window
+from src.ml.features import week_start
+
+
+def test_dashboard_reads_only_its_window(client, session_row):
+    today = date.today()
+    start = dashboard_window(today).start
+    assert start == week_start(today) - timedelta(weeks=4)
+    for day in (start - timedelta(days=1), start, today):
+        client.post("/sessions", json=session_row(day=day.isoformat()))
+        client.post(
+            "/injuries",
+            json={
+                "player_id": "p1",
+                "date": day.isoformat(),
+                "type": "side strain",
+                "severity": "Low",
+                "description": None,
+            },
+        )
+    data = client.get("/players/p1/dashboard").json()
+    expected = [today.isoformat(), start.isoformat()]
+    assert [row["date"] for row in data["sessions"]] == expected
+    assert [row["date"] for row in data["injuries"]] == expected
+    # The older session is still served by the list route.
+    assert len(client.get("/players/p1/sessions").json()) == 3
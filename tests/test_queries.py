@@ -0,0 +1,74 @@
+from datetime import date
+
+import pytest
+from fastapi import HTTPException
+
+from src.api.queries import DateRange, build_query
+
+
+def test_unknown_field_is_rejected():
+    with pytest.raises(HTTPException) as info:
+        build_query("sessions", ["rpe", "c.id FROM c --"])
+    assert info.value.status_code == 400
+    assert "c.id FROM c --" in info.value.detail
+
+
+def test_projection_always_selects_etag():
+    query, _ = build_query("sessions", ["date", "rpe"])
+    assert query == "SELECT c.date, c.rpe, c._etag FROM c"
+
+
+@pytest.mark.parametrize(
+    "dates, condition, names",
+    [
+        (
+            DateRange(date(2024, 5, 1), date(2024, 6, 30)),
+            "c.date BETWEEN @from AND @to",
+            ["@from", "@to"],
+        ),
+        (DateRange(date(2024, 5, 1), None), "c.date >= @from", ["@from"]),
+        (DateRange(None, date(2024, 6, 30)), "c.date <= @to", ["@to"]),
+    ],
+)
+def test_dates_are_parameters(dates, condition, names):
+    query, parameters = build_query(
+        "sessions",
+        dates=dates,
+        where=["c.player_id = @player_id"],
+        parameters=[{"name": "@player_id", "value": "p1"}],
+    )
+    assert query == f"SELECT * FROM c WHERE c.player_id = @player_id AND {condition}"
+    assert "2024" not in query
+    assert [p["name"] for p in parameters] == ["@player_id", *names]
+    values = {p["name"]: p["value"] for p in parameters}
+    for name, value in (("@from", dates.start), ("@to", dates.end)):
+        if value is not None:
+            assert values[name] == value.isoformat()
+
+
+def test_order_uses_the_date_field():
+    query, parameters = build_query(
+        "cycleLogs", dates=DateRange(None, None, order="desc")
+    )
+    assert query == "SELECT * FROM c ORDER BY c.period_start DESC"
+    assert parameters == []
+
+
+def test_list_route_rejects_unknown_field(client):
+    response = client.get("/players/p1/sessions", params={"fields": "date,secret"})
+    assert response.status_code == 400
+    assert "secret" in response.json()["detail"]
+
+
+def test_list_route_filters_and_projects(client, session_row):
+    for day in ("2024-04-30", "2024-05-01", "2024-06-30", "2024-07-01"):
+        assert client.post("/sessions", json=session_row(day=day)).status_code == 200
+    response = client.get(
+        "/players/p1/sessions",
+        params={"fields": "date,rpe", "from": "2024-05-01", "to": "2024-06-30"},
+    )
+    assert response.status_code == 200
+    assert response.json() == [
+        {"date": "2024-06-30", "rpe": 6},
+        {"date": "2024-05-01", "rpe": 6},
+    ]
@@ -0,0 +1,52 @@
+from src.services.cosmos_local import LocalCosmosDBClient
+from src.services.snapshots import UNASSIGNED_TEAM, SnapshotExporter, SnapshotStore
+
+
+def test_new_players_are_filed_under_their_team(tmp_path, session_row):
+    db = LocalCosmosDBClient()
+    db.upsert_item("players", {"id": "t1:a", "team_id": "t1", "name": "A"})
+    exporter = SnapshotExporter(db, SnapshotStore(str(tmp_path)))
+    exporter.run_once()
+
+    db.upsert_item("players", {"id": "t2:b", "team_id": "t2", "name": "B"})
+    for player_id in ("t1:a", "t2:b", "ghost"):
+        db.upsert_item("sessions", {**session_row(player_id), "id": f"{player_id}:1"})
+    exporter.export_container("sessions")
+
+    assert exporter.store.teams("sessions") == sorted([UNASSIGNED_TEAM, "t1", "t2"])
+    table = exporter.store.read_table("sessions", team_ids=["t2"])
+    assert table["player_id"].to_pylist() == ["t2:b"]
+    # Unknown players are looked up again, in case they are created later.
+    assert "ghost" not in exporter.manifest["teams"]
+
+
+def test_a_player_who_changes_team_takes_their_rows(tmp_path, session_row):
+    db = LocalCosmosDBClient()
+    for player_id in ("a", "b"):
+        db.upsert_item("players", {"id": player_id, "team_id": "t1", "name": "A"})
+        for day in ("2024-05-01", "2024-05-08"):
+            db.upsert_item(
+                "sessions",
+                {**session_row(player_id, day), "id": f"{player_id}:{day}"},
+            )
+    exporter = SnapshotExporter(db, SnapshotStore(str(tmp_path)))
+    exporter.run_once()
+
+    db.upsert_item("players", {"id": "a", "team_id": "t2", "name": "A"})
+    db.upsert_item("players", {"id": "b", "team_id": "t3", "name": "B"})
+    db.upsert_item("players", {"id": "b", "team_id": "t1", "name": "B"})
+    exporter.run_once()
+
+    store = exporter.store
+    assert store.teams("sessions") == ["t1", "t2"]
+    moved = store.read_table("sessions", team_ids=["t2"])
+    assert moved["player_id"].to_pylist() == ["a", "a"]
+    assert len(store.weeks("sessions", "t2")) == 2
+    stayed = store.read_table("sessions", team_ids=["t1"])
+    assert stayed["player_id"].to_pylist() == ["b", "b"]
+
+    # The last player out leaves no empty team directory behind.
+    db.upsert_item("players", {"id": "b", "team_id": "t2", "name": "B"})
+    exporter.run_once()
+    assert store.teams("sessions") == ["t2"]
+    assert store.read_table("sessions").num_rows == 4